@@ -0,0 +1,60 @@
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
+
+CURSOR_VAR = 'cursor'
+
+
+class CursorChangeList(ChangeList):
+    """Список объектов админки с постраничным выводом по ключу.
+
+    При сортировке по умолчанию (-pk) следующая страница выбирается
+    условием pk < последнего pk, без COUNT(*) и OFFSET. При сортировке
+    по колонке работает обычный постраничный вывод.
+    """
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR)
+        self.next_cursor = None
+        if self.cursor is not None:
+            request.GET = request.GET.copy()
+            del request.GET[CURSOR_VAR]
+        super().__init__(request, *args, **kwargs)
+
+    @property
+    def keyset(self):
+        return ORDER_VAR not in self.params and not self.show_all
+
+    def get_results(self, request):
+        if not self.keyset:
+            return super().get_results(request)
+        queryset = self.queryset
+        if self.cursor and self.cursor.isdigit():
+            queryset = queryset.filter(pk__lt=int(self.cursor))
+        # Срез остаётся QuerySet: по нему строится формсет list_editable.
+        # Полная страница считается непоследней, поэтому в конце списка
+        # может оказаться одна пустая страница — зато без лишнего запроса.
+        self.result_list = queryset[:self.list_per_page]
+        self.result_count = len(self.result_list)
+        if self.result_count == self.list_per_page:
+            self.next_cursor = self.result_list[self.result_count - 1].pk
+        self.full_result_count = None
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.multi_page = bool(self.cursor or self.next_cursor)
+        self.paginator = None
+
+    def next_page_url(self):
+        return self.get_query_string({CURSOR_VAR: self.next_cursor})
+
+    def first_page_url(self):
+        return self.get_query_string(remove=[CURSOR_VAR])
+
+
+class CursorPaginationMixin:
+    """Быстрый список объектов для больших таблиц."""
+    change_list_template = 'admin/cursor_change_list.html'
+    show_full_result_count = False
+    ordering = ('-pk',)
+
+    def get_changelist(self, request, **kwargs):
+        return CursorChangeList
@@ -1,5 +1,33 @@
 from django.apps import AppConfig
+from django.contrib.admin.apps import SimpleAdminConfig
+from django.core import checks
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from . import auth  # noqa: F401
+
+
+def check_admin(app_configs, **kwargs):
+    from django.contrib import admin
+    from django.contrib.admin.checks import check_admin_app
+
+    admin.autodiscover()
+    return check_admin_app(app_configs, **kwargs)
+
+
+class LazyAdminConfig(SimpleAdminConfig):
+    """Админка без autodiscover при запуске.
+
+    Модули admin.py приложений импортируются в yatube.urls, то есть
+    к первому запросу, или проверками админки. Команды manage.py,
+    которым не нужны ни адреса, ни проверки, их не загружают.
+    """
+
+    def ready(self):
+        from django.contrib.admin.checks import check_dependencies
+
+        checks.register(check_dependencies, checks.Tags.admin)
+        checks.register(check_admin, checks.Tags.admin)
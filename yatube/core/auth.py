@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject
+
+User = auth.get_user_model()
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def get_user(request):
+    """Пользователь сессии без SELECT к таблице User при попадании в кэш.
+
+    Анонимный запрос не обращается ни к кэшу, ни к базе, если сессии нет.
+    """
+    user_id = request.session.get(SESSION_KEY)
+    if user_id is None:
+        return AnonymousUser()
+    cache = caches[settings.AUTH_USER_CACHE]
+    key = user_cache_key(user_id)
+    session_hash = request.session.get(HASH_SESSION_KEY)
+    cached = cache.get(key)
+    if cached is not None and session_hash and cached[0] == session_hash:
+        return cached[1]
+    user = auth.get_user(request)
+    if user.is_authenticated:
+        cache.set(
+            key,
+            (user.get_session_auth_hash(), user),
+            settings.AUTH_USER_CACHE_TIMEOUT,
+        )
+    return user
+
+
+def _get_cached_user(request):
+    if not hasattr(request, '_cached_user'):
+        request._cached_user = get_user(request)
+    return request._cached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    def process_request(self, request):
+        request.user = SimpleLazyObject(lambda: _get_cached_user(request))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, **kwargs):
+    caches[settings.AUTH_USER_CACHE].delete(user_cache_key(instance.pk))
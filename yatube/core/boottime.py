@@ -0,0 +1,121 @@
+import importlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$')
+
+
+def parse_importtime(output):
+    """Строки python -X importtime: модуль, собственное и полное время."""
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            own, cumulative, indent, module = match.groups()
+            imports.append({
+                'module': module,
+                'self': int(own) / 1e6,
+                'cumulative': int(cumulative) / 1e6,
+                'depth': len(indent) // 2,
+            })
+    return imports
+
+
+def measure(path='/', settings_module=None, cwd=None,
+            application='yatube.wsgi.application'):
+    """Запускает свежий процесс и замеряет его загрузку.
+
+    Возвращает время до конца django.setup(), время первого запроса
+    к path, полное время процесса и стоимость импорта каждого модуля
+    с этапом, на котором он импортирован: 'setup' или 'request'.
+    Процесс загружает приложение так же, как сервер: импортом модуля
+    WSGI_APPLICATION.
+    """
+    env = dict(os.environ)
+    if settings_module:
+        env['DJANGO_SETTINGS_MODULE'] = settings_module
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', __name__,
+         application, path],
+        cwd=cwd, env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if process.returncode:
+        raise RuntimeError(process.stderr[-2000:])
+    result = json.loads(process.stdout.splitlines()[-1])
+    phases = {
+        module: phase
+        for phase in ('setup', 'request')
+        for module in result.pop(f'{phase}_modules')
+    }
+    result['process'] = elapsed
+    result['imports'] = [
+        dict(item, phase=phases.get(item['module'], 'interpreter'))
+        for item in parse_importtime(process.stderr)
+    ]
+    return result
+
+
+def wsgi_get(application, path, headers=None):
+    """GET к WSGI-приложению без сервера; возвращает код ответа.
+
+    headers — дополнительные ключи environ, например HTTP_X_...
+    """
+    from django.conf import settings
+
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != '*']
+    host = hosts[0].lstrip('.') if hosts else 'localhost'
+    path, _, query = path.partition('?')
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': host,
+        'SERVER_PORT': '80',
+        'HTTP_HOST': host,
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+        **(headers or {}),
+    }
+    statuses = []
+    response = application(
+        environ, lambda status, *args: statuses.append(status)
+    )
+    try:
+        b''.join(response)
+    finally:
+        response.close()
+    return int(statuses[0].split()[0])
+
+
+def main(application, path):
+    started = time.perf_counter()
+    before = set(sys.modules)
+    module, _, name = application.rpartition('.')
+    application = getattr(importlib.import_module(module), name)
+    booted = time.perf_counter()
+    after_setup = set(sys.modules)
+    status = wsgi_get(application, path)
+    finished = time.perf_counter()
+    print(json.dumps({
+        'setup': booted - started,
+        'first_request': finished - booted,
+        'status': status,
+        'setup_modules': sorted(after_setup - before),
+        'request_modules': sorted(set(sys.modules) - after_setup),
+    }))
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
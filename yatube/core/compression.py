@@ -0,0 +1,131 @@
+import gzip
+import hashlib
+import io
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import FileResponse
+from django.utils.cache import get_max_age, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .staticfiles import accepted_encodings, brotli, gzip_bytes
+
+MIN_LENGTH = 200
+# Уже сжатые форматы: повторное сжатие только тратит процессор.
+COMPRESSED_TYPES = (
+    'image/', 'video/', 'audio/', 'font/woff', 'application/zip',
+    'application/gzip', 'application/x-gzip', 'application/pdf',
+)
+
+
+def compress(encoding, data):
+    if encoding == 'br':
+        return brotli.compress(data)
+    return gzip_bytes(data)
+
+
+def compress_brotli_sequence(sequence):
+    compressor = brotli.Compressor()
+    for item in sequence:
+        yield compressor.process(item) + compressor.flush()
+    yield compressor.finish()
+
+
+def compress_gzip_sequence(sequence):
+    """gzip потока с Z_SYNC_FLUSH после каждой части.
+
+    compress_sequence из Django не сбрасывает буфер, и клиент получает
+    страницу только целиком — вместе с запросами к ленте.
+    """
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as zfile:
+        for item in sequence:
+            zfile.write(item)
+            zfile.flush(zlib.Z_SYNC_FLUSH)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def compress_stream(encoding, sequence):
+    if encoding == 'br':
+        return compress_brotli_sequence(sequence)
+    return compress_gzip_sequence(sequence)
+
+
+def choose_encoding(request):
+    encodings = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING'))
+    if brotli is not None and 'br' in encodings:
+        return 'br'
+    if 'gzip' in encodings:
+        return 'gzip'
+    return None
+
+
+def is_shared_cacheable(response):
+    """Ответ из cache_page: его сжатую версию можно хранить в кэше."""
+    max_age = get_max_age(response)
+    return (
+        bool(max_age)
+        and 'private' not in response.get('Cache-Control', '')
+        and not response.cookies
+    )
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Сжатие ответов в br или gzip по Accept-Encoding.
+
+    Файлы (FileResponse), куски файлов по Range и уже сжатые форматы
+    не трогает. Сжатые тела
+    ответов, которые и так кэшируются через cache_page, кладутся в кэш
+    по хэшу содержимого, чтобы не сжимать их заново на каждом попадании.
+    """
+
+    def process_response(self, request, response):
+        if (isinstance(response, FileResponse)
+                or response.status_code == 206
+                or response.has_header('Content-Range')
+                or response.has_header('Accept-Ranges')
+                or response.has_header('Content-Encoding')
+                or response.get('Content-Type', '').startswith(
+                    COMPRESSED_TYPES)):
+            return response
+        if not response.streaming and len(response.content) < MIN_LENGTH:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                encoding, response.streaming_content
+            )
+            del response['Content-Length']
+        else:
+            compressed = self.compress_content(encoding, response)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    def compress_content(self, encoding, response):
+        if not is_shared_cacheable(response):
+            return compress(encoding, response.content)
+        cache = caches[settings.COMPRESSION_CACHE]
+        digest = hashlib.md5(response.content).hexdigest()
+        key = f'compressed:{encoding}:{digest}'
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress(encoding, response.content)
+            cache.set(key, compressed, get_max_age(response))
+        return compressed
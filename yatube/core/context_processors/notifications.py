@@ -0,0 +1,15 @@
+from django.utils.functional import SimpleLazyObject
+
+from posts.notifications import unread_count
+
+
+def unread_notifications(request):
+    """Число непрочитанных уведомлений для шапки сайта.
+
+    Считается, только если шаблон его выводит.
+    """
+    def count():
+        user = request.user
+        return unread_count(user.pk) if user.is_authenticated else 0
+
+    return {'unread_notifications': SimpleLazyObject(count)}
@@ -0,0 +1,217 @@
+import base64
+import multiprocessing
+import random
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+import requests
+
+Sample = namedtuple('Sample', 'time scenario status latency')
+
+# Картинка для сценария загрузки: GIF 1x1.
+IMAGE = base64.b64decode(
+    'R0lGODlhAQABAIAAAP///wAAACH5BAEAAAAALAAAAAABAAEAAAICRAEAOw=='
+)
+
+DEFAULT_MIX = {
+    'index': 40,
+    'post': 20,
+    'profile': 10,
+    'group': 10,
+    'trending': 5,
+    'follow': 5,
+    'comment': 8,
+    'upload': 1,
+    'login': 1,
+}
+
+# Сценарии, которым нужен вход на сайт.
+AUTHORIZED = {'login', 'follow', 'comment', 'upload'}
+
+
+def percentile(values, q):
+    """Перцентиль по ближайшему рангу; values отсортированы."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, round(q / 100 * len(values)) - 1))
+    return values[rank]
+
+
+def is_error(status):
+    """Ошибка: нет ответа или 4xx/5xx, кроме 429.
+
+    429 считается отдельно; 403 от CSRF и 404 тоже значат, что сценарий
+    не удался.
+    """
+    return not status or (status >= 400 and status != 429)
+
+
+def summarize(samples, duration):
+    latencies = sorted(sample.latency for sample in samples)
+    errors = sum(1 for sample in samples if is_error(sample.status))
+    throttled = sum(1 for sample in samples if sample.status == 429)
+    return {
+        'requests': len(samples),
+        'throughput': len(samples) / duration if duration else 0.0,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+        'errors': errors,
+        'throttled': throttled,
+        'error_rate': errors / len(samples) if samples else 0.0,
+    }
+
+
+def timeline(samples, start, interval):
+    """Сводка по интервалам времени от начала этапа."""
+    buckets = defaultdict(list)
+    for sample in samples:
+        buckets[int((sample.time - start) // interval)].append(sample)
+    return [
+        ((number + 1) * interval, summarize(buckets[number], interval))
+        for number in range(max(buckets) + 1 if buckets else 0)
+    ]
+
+
+def find_knee(points, sensitivity=0.1):
+    """Точка насыщения на кривой «пользователи — пропускная способность».
+
+    Kneedle: обе оси приводятся к [0, 1], колено — точка, максимально
+    удалённая вверх от прямой между крайними точками. Если кривая
+    почти прямая (отрыв меньше sensitivity), насыщение не достигнуто
+    и возвращается None.
+    """
+    if len(points) < 3:
+        return None
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    x_span = (max(xs) - min(xs)) or 1
+    y_span = (max(ys) - min(ys)) or 1
+    differences = [
+        (y - ys[0]) / y_span - (x - xs[0]) / x_span for x, y in points
+    ]
+    best = max(range(len(points)), key=differences.__getitem__)
+    if differences[best] < sensitivity or best == len(points) - 1:
+        return None
+    return xs[best]
+
+
+class VirtualUser:
+    """Пользователь замкнутого цикла: следующий запрос — после ответа."""
+
+    def __init__(self, config, number, samples):
+        self.config = config
+        self.samples = samples
+        self.random = random.Random(config['seed'] + number)
+        accounts = config['accounts']
+        self.account = accounts[number % len(accounts)] if accounts else None
+        self.session = requests.Session()
+        self.logged_in = False
+        mix = {
+            name: weight for name, weight in config['mix'].items()
+            if weight and (self.account or name not in AUTHORIZED)
+        }
+        self.scenarios = list(mix)
+        self.weights = list(mix.values())
+
+    def request(self, scenario, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, self.config['url'] + path,
+                timeout=self.config['timeout'], allow_redirects=False,
+                **kwargs
+            )
+            status = response.status_code
+        except requests.RequestException:
+            response, status = None, 0
+        self.samples.append(Sample(
+            time.time(), scenario, status, time.perf_counter() - started
+        ))
+        return response
+
+    def pick(self, name):
+        return self.random.choice(self.config['paths'][name])
+
+    def csrf(self, path, scenario):
+        self.request(scenario, 'GET', path)
+        return {
+            'csrfmiddlewaretoken': self.session.cookies.get('csrftoken', ''),
+        }
+
+    def login(self):
+        self.session.cookies.clear()
+        path = self.config['paths']['login']
+        username, password = self.account
+        data = self.csrf(path, 'login')
+        data.update(username=username, password=password)
+        response = self.request('login', 'POST', path, data=data)
+        self.logged_in = response is not None and response.status_code == 302
+
+    def run_scenario(self, name):
+        if name in AUTHORIZED and not self.logged_in:
+            self.login()
+            if name == 'login':
+                return
+        if name == 'login':
+            self.login()
+        elif name == 'follow':
+            self.request(name, 'GET', self.pick('profile_follow'))
+        elif name == 'comment':
+            post, comment = self.pick('comment')
+            data = self.csrf(post, name)
+            data['text'] = f'Комментарий нагрузочного теста {time.time()}'
+            self.request(name, 'POST', comment, data=data)
+        elif name == 'upload':
+            path = self.config['paths']['post_create']
+            data = self.csrf(path, name)
+            data['text'] = 'Пост нагрузочного теста'
+            self.request(name, 'POST', path, data=data, files={
+                'image': ('loadtest.gif', IMAGE, 'image/gif'),
+            })
+        else:
+            self.request(name, 'GET', self.pick(name))
+
+    def run(self, deadline):
+        while time.time() < deadline:
+            name = self.random.choices(self.scenarios, self.weights)[0]
+            self.run_scenario(name)
+            if self.config['think']:
+                time.sleep(self.config['think'])
+
+
+def run_users(config, numbers, deadline):
+    """Пользователи одного процесса, каждый в своём потоке."""
+    samples = []
+    threads = [
+        threading.Thread(
+            target=VirtualUser(config, number, samples).run,
+            args=(deadline,), daemon=True,
+        )
+        for number in numbers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def run_stage(config, users, duration, processes=1):
+    """Этап нагрузки: users пользователей в течение duration секунд.
+
+    Пользователи делятся между процессами: в одном процессе клиентов
+    ограничивает GIL.
+    """
+    start = time.time()
+    deadline = start + duration
+    processes = max(1, min(processes, users))
+    shares = [list(range(users))[i::processes] for i in range(processes)]
+    if processes == 1:
+        return start, run_users(config, shares[0], deadline)
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.starmap(
+            run_users, [(config, share, deadline) for share in shares]
+        )
+    return start, [sample for result in results for sample in result]
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SNAPSHOT_ALIAS = 'schema_snapshot'
+# Кроме схемы в снимок попадают только служебные данные, которые создаёт
+# migrate: история миграций, типы содержимого и права.
+SNAPSHOT_DATA_TABLES = (
+    'django_migrations', 'django_content_type', 'auth_permission',
+)
+
+
+def dump_schema(path):
+    """SQL-снимок схемы SQLite-базы вместе со служебными данными.
+
+    Данные идут после всех CREATE: иначе вставка в auth_permission
+    ссылалась бы на ещё не созданную таблицу типов содержимого.
+    Виртуальные таблицы (полнотекстовые индексы) вместе с их служебными
+    таблицами и триггерами в снимок не попадают: их создают обработчики
+    post_migrate после загрузки.
+    """
+    prefixes = tuple(
+        f'INSERT INTO "{table}"' for table in SNAPSHOT_DATA_TABLES
+    )
+    schema, data = [], []
+    with sqlite3.connect(path) as db:
+        virtual = [name for name, in db.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE sql LIKE 'CREATE VIRTUAL TABLE%'"
+        )]
+        for line in db.iterdump():
+            if line in ('BEGIN TRANSACTION;', 'COMMIT;'):
+                continue
+            if 'sqlite_sequence' in line or 'writable_schema' in line:
+                continue
+            if any(name in line for name in virtual):
+                continue
+            if not line.startswith('INSERT'):
+                schema.append(line)
+            elif line.startswith(prefixes):
+                data.append(line)
+    return '\n'.join(
+        ['BEGIN TRANSACTION;', *schema, *data, 'COMMIT;']
+    ) + '\n'
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт схему пустой базы из SQL-снимка вместо прогона миграций. '
+        'С --generate пересобирает снимок.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='База, в которую загружается снимок.',
+        )
+        parser.add_argument(
+            '--snapshot', default=settings.SCHEMA_SNAPSHOT,
+            help='Путь к файлу снимка.',
+        )
+        parser.add_argument(
+            '--generate', action='store_true',
+            help='Прогнать миграции на временной базе и сохранить снимок.',
+        )
+
+    def handle(self, *args, **options):
+        if options['generate']:
+            self.generate(options['snapshot'])
+        else:
+            self.load(options['database'], options['snapshot'])
+
+    def generate(self, snapshot):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'db.sqlite3')
+            connections.databases[SNAPSHOT_ALIAS] = {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': path,
+            }
+            try:
+                call_command(
+                    'migrate', database=SNAPSHOT_ALIAS, verbosity=0,
+                    interactive=False,
+                )
+            finally:
+                connections[SNAPSHOT_ALIAS].close()
+                del connections[SNAPSHOT_ALIAS]
+                del connections.databases[SNAPSHOT_ALIAS]
+            sql = dump_schema(path)
+        with open(snapshot, 'w', encoding='utf-8') as fh:
+            fh.write(sql)
+        self.stdout.write(f'Снимок схемы сохранён в {snapshot}')
+
+    def load(self, database, snapshot):
+        connection = connections[database]
+        if connection.vendor != 'sqlite':
+            raise CommandError('Снимок схемы поддерживается только для SQLite')
+        if connection.introspection.table_names():
+            self.stdout.write('База не пустая, применяются миграции')
+        else:
+            if not os.path.exists(snapshot):
+                raise CommandError(
+                    f'Нет снимка {snapshot}, '
+                    'создайте его через bootstrap_schema --generate'
+                )
+            with open(snapshot, encoding='utf-8') as fh:
+                sql = fh.read()
+            connection.ensure_connection()
+            connection.connection.executescript(sql)
+            self.stdout.write(f'Схема загружена из {snapshot}')
+        # Миграции новее снимка, если они есть.
+        call_command(
+            'migrate', database=database, verbosity=0, interactive=False
+        )
@@ -0,0 +1,77 @@
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core import boottime
+
+PROJECT_APPS = ('core', 'posts', 'users', 'about', 'yatube')
+
+
+class Command(BaseCommand):
+    help = (
+        'Время загрузки: запуск процесса, django.setup(), первый запрос '
+        'и стоимость импорта модулей (как python -X importtime).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default='/', help='Адрес первого запроса.'
+        )
+        parser.add_argument(
+            '--runs', type=int, default=3,
+            help='Сколько раз запустить; время — медиана.',
+        )
+        parser.add_argument('--limit', type=int, default=25)
+        parser.add_argument(
+            '--sort', choices=('cumulative', 'self'), default='cumulative',
+        )
+        parser.add_argument(
+            '--project', action='store_true',
+            help='Только модули проекта.',
+        )
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('--runs: хотя бы один запуск.')
+        runs = [
+            boottime.measure(
+                options['path'], settings.SETTINGS_MODULE, settings.BASE_DIR,
+                settings.WSGI_APPLICATION,
+            )
+            for _ in range(options['runs'])
+        ]
+        runs.sort(key=lambda run: run['setup'] + run['first_request'])
+        median = runs[len(runs) // 2]
+        self.stdout.write(
+            f"Процесс целиком: "
+            f"{self.ms(statistics.median(r['process'] for r in runs))}"
+        )
+        self.stdout.write(
+            f"django.setup(): "
+            f"{self.ms(statistics.median(r['setup'] for r in runs))}"
+        )
+        self.stdout.write(
+            f"Первый запрос GET {options['path']}: "
+            f"{self.ms(statistics.median(r['first_request'] for r in runs))}"
+            f", статус {median['status']}"
+        )
+        imports = median['imports']
+        if options['project']:
+            imports = [
+                item for item in imports
+                if item['module'].split('.')[0] in PROJECT_APPS
+            ]
+        imports.sort(key=lambda item: item[options['sort']], reverse=True)
+        self.stdout.write(
+            f"\n{'своё':>9} {'всего':>9}  {'этап':<11} модуль"
+        )
+        for item in imports[:options['limit']]:
+            self.stdout.write(
+                f"{self.ms(item['self']):>9} "
+                f"{self.ms(item['cumulative']):>9}  "
+                f"{item['phase']:<11} {item['module']}"
+            )
+
+    def ms(self, seconds):
+        return f'{seconds * 1000:.1f} ms'
@@ -0,0 +1,197 @@
+from operator import attrgetter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from core import loadtest
+from posts import sharding
+from posts.models import Group, Post
+
+User = get_user_model()
+
+ACCOUNT_PREFIX = 'loadtest'
+# Сценарий -> список адресов, из которого он выбирает.
+PATHS = {'follow': 'profile_follow'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест запущенного сервера: этапы с растущим числом '
+        'виртуальных пользователей, пропускная способность, задержки, '
+        'ошибки и точка насыщения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', default='http://127.0.0.1:8000',
+            help='Адрес сервера.',
+        )
+        parser.add_argument(
+            '--users', default='1,2,4,8,16,32',
+            help='Число пользователей на этапах, через запятую.',
+        )
+        parser.add_argument(
+            '--duration', type=float, default=10,
+            help='Длительность этапа, секунд.',
+        )
+        parser.add_argument(
+            '--processes', type=int, default=1,
+            help='Процессов-клиентов, между которыми делятся пользователи.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help='Шаг сводки по времени внутри этапа, секунд.',
+        )
+        parser.add_argument(
+            '--think', type=float, default=0,
+            help='Пауза пользователя между сценариями, секунд.',
+        )
+        parser.add_argument('--timeout', type=float, default=10)
+        parser.add_argument(
+            '--mix', default='',
+            help='Веса сценариев, например index=40,comment=8. Сценарии: '
+                 + ', '.join(loadtest.DEFAULT_MIX),
+        )
+        parser.add_argument(
+            '--accounts', type=int, default=10,
+            help=f'Сколько учётных записей {ACCOUNT_PREFIX}N создать '
+                 'и использовать для входа.',
+        )
+        parser.add_argument('--password', default='loadtest-password')
+        parser.add_argument(
+            '--sample', type=int, default=200,
+            help='Сколько последних постов, авторов и сообществ обходить.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            stages = [int(users) for users in options['users'].split(',')]
+        except ValueError:
+            raise CommandError('--users: числа через запятую.')
+        config = {
+            'url': options['url'].rstrip('/'),
+            'paths': self.paths(options['sample']),
+            'accounts': self.accounts(
+                options['accounts'], options['password']
+            ),
+            'mix': self.mix(options['mix']),
+            'think': options['think'],
+            'timeout': options['timeout'],
+            'seed': options['seed'],
+        }
+        # Без постов, авторов или сообществ их сценарии не из чего строить.
+        config['mix'] = {
+            name: weight for name, weight in config['mix'].items()
+            if config['paths'].get(PATHS.get(name, name), True)
+        }
+        points = []
+        for users in stages:
+            start, samples = loadtest.run_stage(
+                config, users, options['duration'], options['processes']
+            )
+            summary = loadtest.summarize(samples, options['duration'])
+            points.append((users, summary['throughput']))
+            self.report_stage(users, start, samples, summary, options)
+        self.report_knee(points)
+
+    def mix(self, value):
+        mix = dict(loadtest.DEFAULT_MIX)
+        for item in filter(None, value.split(',')):
+            name, _, weight = item.partition('=')
+            if name not in mix or not weight.isdigit():
+                raise CommandError(f'--mix: неизвестный сценарий {item}.')
+            mix[name] = int(weight)
+        return mix
+
+    def accounts(self, count, password):
+        names = [f'{ACCOUNT_PREFIX}{i}' for i in range(count)]
+        existing = set(
+            User.objects.filter(username__in=names)
+            .values_list('username', flat=True)
+        )
+        hashed = make_password(password)
+        User.objects.bulk_create(
+            User(username=name, password=hashed)
+            for name in names if name not in existing
+        )
+        # bulk_create не шлёт post_save: копии в шардах постов создаются
+        # здесь.
+        sharding.replicate_missing(
+            User,
+            User.objects.filter(username__in=names)
+            .values_list('pk', flat=True),
+        )
+        return [(name, password) for name in names]
+
+    def paths(self, sample):
+        """Адреса сценариев по именам маршрутов posts.urls и users.urls."""
+        # Последние посты всех шардов: id поста растёт внутри шарда.
+        posts = list(sharding.feed(
+            Post.objects.select_related('author').order_by('-pk'),
+            order=('-pk',), key=attrgetter('pk'),
+        )[:sample])
+        authors = sorted({post.author.username for post in posts})
+        slugs = Group.objects.values_list('slug', flat=True)[:sample]
+        post_urls = [
+            reverse('posts:post_detail', args=(post.pk,)) for post in posts
+        ]
+        return {
+            'index': [reverse('posts:index')],
+            'trending': [reverse('posts:trending')],
+            'group': [reverse('posts:group_posts', args=(s,)) for s in slugs],
+            'profile': [
+                reverse('posts:profile', args=(name,)) for name in authors
+            ],
+            'post': post_urls,
+            'profile_follow': [
+                reverse('posts:profile_follow', args=(name,))
+                for name in authors
+            ],
+            'comment': [
+                (url, reverse('posts:add_comment', args=(post.pk,)))
+                for url, post in zip(post_urls, posts)
+            ],
+            'login': reverse('users:login'),
+            'post_create': reverse('posts:post_create'),
+        }
+
+    def report_stage(self, users, start, samples, summary, options):
+        self.stdout.write(f'\nПользователей: {users}')
+        for offset, row in loadtest.timeline(
+            samples, start, options['interval']
+        ):
+            self.stdout.write(f'  +{offset:>5.1f}s  {self.format(row)}')
+        self.stdout.write(f'  итого   {self.format(summary)}')
+        by_scenario = {}
+        for sample in samples:
+            by_scenario.setdefault(sample.scenario, []).append(sample)
+        for name, items in sorted(by_scenario.items()):
+            row = loadtest.summarize(items, options['duration'])
+            self.stdout.write(f'    {name:<10} {self.format(row)}')
+
+    def format(self, row):
+        return (
+            f"{row['throughput']:8.1f} rps  "
+            f"p50 {row['p50'] * 1000:7.1f} ms  "
+            f"p95 {row['p95'] * 1000:7.1f} ms  "
+            f"p99 {row['p99'] * 1000:7.1f} ms  "
+            f"ошибки {row['error_rate']:6.1%}  "
+            f"429: {row['throttled']}"
+        )
+
+    def report_knee(self, points):
+        knee = loadtest.find_knee(points)
+        if knee is None:
+            self.stdout.write(
+                '\nТочка насыщения не найдена: пропускная способность '
+                'растёт вместе с числом пользователей.'
+            )
+            return
+        throughput = dict(points)[knee]
+        self.stdout.write(self.style.WARNING(
+            f'\nТочка насыщения: {knee} пользователей, '
+            f'{throughput:.1f} rps. Дальше растут только задержки.'
+        ))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+
+from core import slowqueries
+
+ORDERS = ('total', 'p95', 'count', 'mean')
+
+
+class Command(BaseCommand):
+    help = (
+        'Худшие запросы к базе по отпечаткам: число, суммарное, среднее '
+        'время и p95, view и шаблон медленного вызова, план.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument(
+            '--order', choices=ORDERS, default='total',
+            help='Сортировка по убыванию.',
+        )
+        parser.add_argument(
+            '--plans', action='store_true',
+            help='Показать план медленного вызова.',
+        )
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Очистить статистику.',
+        )
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            slowqueries.reset()
+            self.stdout.write('Статистика очищена.')
+            return
+        slowqueries.flush(force=True)
+        rows = slowqueries.top(options['order'], options['limit'])
+        if not rows:
+            self.stdout.write('Статистики пока нет.')
+            return
+        self.stdout.write(
+            f"{'отпечаток':<12} {'число':>8} {'всего, мс':>11} "
+            f"{'среднее':>9} {'p95':>9}  запрос"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['fingerprint']:<12} {row['count']:>8} "
+                f"{row['total'] * 1000:>11.1f} {row['mean'] * 1000:>9.2f} "
+                f"{row['p95'] * 1000:>9.2f}  {row['sql'][:200]}"
+            )
+            if row['view'] or row['template']:
+                self.stdout.write(
+                    f"{'':<12} view {row['view'] or '-'}, "
+                    f"шаблон {row['template'] or '-'}"
+                )
+            if options['plans'] and row['plan']:
+                for line in row['plan'].splitlines():
+                    self.stdout.write(f"{'':<12} {line}")
@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+from core import warmup
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогрев кэша: первые страницы самых посещаемых лент и их '
+        'миниатюры. LocMem-кэш у каждого процесса свой: команда греет '
+        'общий кэш и миниатюры, кэш воркеров — WARMUP_ON_BOOT.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--feeds', type=int, default=settings.WARMUP_FEEDS,
+            help='Сколько горячих лент прогреть.',
+        )
+        parser.add_argument(
+            '--pages', type=int, default=settings.WARMUP_PAGES,
+            help='Сколько первых страниц каждой ленты.',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.WARMUP_CONCURRENCY,
+        )
+        parser.add_argument(
+            '--budget', type=float, default=settings.WARMUP_TIME_BUDGET,
+            help='Бюджет времени, секунд.',
+        )
+        parser.add_argument(
+            '--path', action='append', default=[],
+            help='Дополнительная лента; можно несколько раз.',
+        )
+
+    def handle(self, *args, **options):
+        warmup.flush(force=True)
+        feeds = options['path'] + [
+            feed for feed in warmup.hot_feeds(options['feeds'])
+            if feed not in options['path']
+        ]
+        paths = warmup.warm_paths(feeds, options['pages'])
+        started = time.monotonic()
+        results = warmup.warm(
+            WSGIHandler(), paths, options['concurrency'], options['budget']
+        )
+        elapsed = time.monotonic() - started
+        for path, status, seconds in results:
+            self.stdout.write(
+                f"{status or 'ошибка':>6} {seconds * 1000:8.1f} ms  {path}"
+            )
+        failed = sum(1 for _, status, _ in results if status != 200)
+        message = (
+            f'Прогрето {len(results) - failed} из {len(paths)} страниц '
+            f'за {elapsed:.1f} с.'
+        )
+        if failed:
+            message += f' С ошибкой: {failed}.'
+        if len(results) < len(paths):
+            message += f' Не уложились в бюджет: {len(paths) - len(results)}.'
+        if len(results) - failed < len(paths):
+            message = self.style.WARNING(message)
+        self.stdout.write(message)
@@ -0,0 +1,162 @@
+import mimetypes
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import (FileResponse, Http404, HttpResponse,
+                         StreamingHttpResponse)
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """Разбирает заголовок Range и возвращает (start, end) включительно.
+
+    None означает, что заголовок нужно проигнорировать и отдать файл целиком
+    (в том числе для нескольких диапазонов сразу).
+    """
+    match = RANGE_RE.match(header or '')
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Суффиксный диапазон: последние N байт файла.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def is_immutable(path):
+    """Миниатюры sorl называются по хэшу исходника и не меняются."""
+    return path.startswith(settings.THUMBNAIL_PREFIX)
+
+
+def resolve_path(root, path):
+    path = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = safe_join(root, path)
+    except SuspiciousFileOperation:
+        raise Http404('Файл не найден')
+    if not os.path.isfile(fullpath):
+        raise Http404('Файл не найден')
+    return path, fullpath
+
+
+def file_etag(stat, suffix=''):
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{suffix}"'
+
+
+def _set_validators(response, path, etag, mtime):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(mtime)
+    if is_immutable(path):
+        response['Cache-Control'] = (
+            f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        )
+    else:
+        response['Cache-Control'] = (
+            f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}'
+        )
+    return response
+
+
+def _range_allowed(request, etag, mtime):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    return not if_range or if_range in (etag, http_date(mtime))
+
+
+def _iter_range(fullpath, start, length):
+    with open(fullpath, 'rb') as fh:
+        fh.seek(start)
+        while length > 0:
+            chunk = fh.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def _offload(path, fullpath, content_type):
+    """Отдаёт файл силами фронтового веб-сервера."""
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_SENDFILE == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = (
+            settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+        )
+    else:
+        response['X-Sendfile'] = fullpath
+    return response
+
+
+@require_safe
+def serve(request, path):
+    """Отдача медиафайлов с поддержкой Range и условных запросов."""
+    path, fullpath = resolve_path(settings.MEDIA_ROOT, path)
+    stat = os.stat(fullpath)
+    mtime = int(stat.st_mtime)
+    etag = file_etag(stat)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=mtime
+    )
+    if response is not None:
+        return _set_validators(response, path, etag, mtime)
+
+    content_type = (
+        mimetypes.guess_type(fullpath)[0] or 'application/octet-stream'
+    )
+    if settings.MEDIA_SENDFILE:
+        response = _offload(path, fullpath, content_type)
+        return _set_validators(response, path, etag, mtime)
+
+    byte_range = None
+    if _range_allowed(request, etag, mtime):
+        try:
+            byte_range = parse_range(
+                request.META.get('HTTP_RANGE'), stat.st_size
+            )
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+
+    if byte_range is None:
+        # FileResponse отдаёт файл через wsgi.file_wrapper (sendfile),
+        # без копирования содержимого в память воркера.
+        response = FileResponse(
+            open(fullpath, 'rb'), content_type=content_type
+        )
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_range(fullpath, start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response['Content-Length'] = length
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    response['Accept-Ranges'] = 'bytes'
+    return _set_validators(response, path, etag, mtime)
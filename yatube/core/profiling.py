@@ -0,0 +1,192 @@
+import datetime as dt
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core import signing
+
+HEADER = 'HTTP_X_PROFILE'
+SALT = 'core.profiling'
+SUFFIXES = {'sample': '.collapsed', 'cprofile': '.prof'}
+
+
+def make_token():
+    """Подписанное значение заголовка X-Profile."""
+    return signing.TimestampSigner(salt=SALT).sign('profile')
+
+
+def check_token(token):
+    try:
+        signing.TimestampSigner(salt=SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def should_profile(request):
+    token = request.META.get(HEADER)
+    if token:
+        return check_token(token)
+    rate = settings.PROFILING_SAMPLE_RATE
+    return bool(rate) and random.random() < rate
+
+
+def frame_name(frame):
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', '?')
+    return f'{module}.{code.co_name}'
+
+
+class StackSampler:
+    """Снимает стек потока запроса раз в PROFILING_INTERVAL секунд.
+
+    Сам поток запроса не замедляется: стеки читает отдельный поток,
+    результат — счётчики свёрнутых стеков (формат collapsed, его
+    открывают speedscope и flamegraph.pl).
+    """
+    suffix = SUFFIXES['sample']
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self.thread_id = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread_id = threading.get_ident()
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                names.append(frame_name(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[';'.join(reversed(names))] += 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f'{stack} {count}\n')
+
+
+class DeterministicProfiler:
+    """cProfile: точные вызовы для разработки, файл для pstats/snakeviz."""
+    suffix = SUFFIXES['cprofile']
+
+    def __init__(self):
+        import cProfile
+
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        self.profile.disable()
+
+    def write(self, path):
+        self.profile.dump_stats(path)
+
+
+def make_profiler():
+    if settings.PROFILING_MODE == 'cprofile':
+        return DeterministicProfiler()
+    return StackSampler(settings.PROFILING_INTERVAL)
+
+
+def view_directory(view_name):
+    return os.path.join(
+        settings.PROFILING_ROOT, view_name.replace(':', '.') or 'unresolved'
+    )
+
+
+def save(view_name, profiler, duration):
+    """Пишет профиль в каталог view и удаляет лишние старые."""
+    directory = view_directory(view_name)
+    os.makedirs(directory, exist_ok=True)
+    name = (
+        f"{time.strftime('%Y%m%d-%H%M%S')}-{round(duration * 1000)}ms-"
+        f'{uuid.uuid4().hex[:6]}{profiler.suffix}'
+    )
+    profiler.write(os.path.join(directory, name))
+    prune(directory)
+    return name
+
+
+def prune(directory):
+    names = sorted(
+        os.listdir(directory),
+        key=lambda name: os.path.getmtime(os.path.join(directory, name)),
+        reverse=True,
+    )
+    for name in names[settings.PROFILING_KEEP:]:
+        os.remove(os.path.join(directory, name))
+
+
+def captured():
+    """Сохранённые профили, новые сначала."""
+    root = settings.PROFILING_ROOT
+    if not os.path.isdir(root):
+        return []
+    profiles = []
+    for view in os.listdir(root):
+        directory = os.path.join(root, view)
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            stat = os.stat(path)
+            profiles.append({
+                'view': view,
+                'name': name,
+                'duration': name.split('-')[2],
+                'size': stat.st_size,
+                'created': dt.datetime.fromtimestamp(
+                    stat.st_mtime, tz=dt.timezone.utc
+                ),
+            })
+    profiles.sort(key=lambda profile: profile['created'], reverse=True)
+    return profiles
+
+
+class ProfilingMiddleware:
+    """Профилирует запрос по подписанному заголовку X-Profile или доле
+    PROFILING_SAMPLE_RATE случайных запросов.
+
+    В разработке — cProfile, в бою — выборка стеков. Имя файла профиля
+    возвращается в заголовке ответа X-Profile-File.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not should_profile(request):
+            return self.get_response(request)
+        profiler = make_profiler()
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+        match = getattr(request, 'resolver_match', None)
+        name = save(
+            match.view_name if match else '', profiler,
+            time.perf_counter() - started,
+        )
+        response['X-Profile-File'] = name
+        return response
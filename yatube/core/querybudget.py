@@ -0,0 +1,164 @@
+import logging
+import os
+import sys
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.urls import resolve
+
+logger = logging.getLogger(__name__)
+
+STACK_DEPTH = 3
+TEMPLATE_BASE = os.path.join('django', 'template', 'base.py')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(count):
+    """Декоратор: не больше count запросов к базе на запрос к view.
+
+    Бюджет из settings.QUERY_BUDGETS для того же имени маршрута
+    важнее декоратора.
+    """
+    def decorator(view):
+        view.query_budget = count
+        return view
+    return decorator
+
+
+def budget_for(match):
+    budgets = getattr(settings, 'QUERY_BUDGETS', {})
+    if match.view_name in budgets:
+        return budgets[match.view_name]
+    return getattr(match.func, 'query_budget', None)
+
+
+def is_project_file(filename):
+    return (
+        filename.startswith(settings.BASE_DIR)
+        and 'site-packages' not in filename
+        and filename != __file__
+    )
+
+
+def is_ignored(frame):
+    """Запрос из модуля или функции QUERY_BUDGET_IGNORE не считается."""
+    ignored = tuple(getattr(settings, 'QUERY_BUDGET_IGNORE', ()))
+    while ignored and frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if f'{module}.{frame.f_code.co_name}'.startswith(ignored):
+            return True
+        frame = frame.f_back
+    return False
+
+
+def template_line(frame):
+    """Шаблон и строка узла шаблона, который сейчас рендерится, если есть."""
+    if (frame.f_code.co_name != 'render_annotated'
+            or not frame.f_code.co_filename.endswith(TEMPLATE_BASE)):
+        return None
+    node = frame.f_locals.get('self')
+    origin = getattr(node, 'origin', None)
+    token = getattr(node, 'token', None)
+    if origin is None or token is None:
+        return None
+    return f'{origin.template_name}:{token.lineno}'
+
+
+def call_site(frame):
+    """Место запроса: ближайшие кадры проекта и строка шаблона.
+
+    Возвращает строку места и строку шаблона (или None).
+    """
+    sites = []
+    template = None
+    while frame is not None:
+        code = frame.f_code
+        line = template is None and template_line(frame)
+        if line:
+            template = line
+        elif len(sites) < STACK_DEPTH and is_project_file(code.co_filename):
+            path = os.path.relpath(code.co_filename, settings.BASE_DIR)
+            sites.append(f'{path}:{frame.f_lineno} {code.co_name}')
+        frame = frame.f_back
+    site = ' <- '.join(sites) or 'вне кода проекта'
+    if template:
+        site = f'шаблон {template} <- {site}'
+    return site, template
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        frame = sys._getframe(1)
+        if not is_ignored(frame):
+            self.queries.append((sql, call_site(frame)[0]))
+        return execute(sql, params, many, context)
+
+    def report(self, name, budget):
+        sites = Counter(site for _, site in self.queries)
+        examples = {}
+        for sql, site in self.queries:
+            examples.setdefault(site, sql)
+        lines = [
+            f'{name}: {len(self.queries)} запросов при бюджете {budget}'
+        ]
+        for site, count in sites.most_common():
+            lines.append(f'  {count} x {site}')
+            lines.append(f'      {examples[site][:300]}')
+        return '\n'.join(lines)
+
+
+class QueryBudgetMiddleware:
+    """Проверяет число запросов к базе на запрос к view.
+
+    Режим QUERY_BUDGET_MODE: 'raise' — исключение (тесты), 'log' —
+    предупреждение в лог (разработка), None — проверки нет. В отчёте
+    запросы сгруппированы по месту вызова.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.QUERY_BUDGET_MODE
+        if not mode:
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        budget = budget_for(match) if match else None
+        if budget is not None and len(recorder.queries) > budget:
+            report = recorder.report(match.view_name, budget)
+            if mode == 'raise':
+                raise QueryBudgetExceeded(report)
+            logger.warning(report)
+        return response
+
+
+def check_query_budget(client, url, **extra):
+    """Запрос клиента с проверкой бюджета; для pytest и TestCase.
+
+    Маршрут без бюджета — тоже ошибка: бюджет должен быть у каждого
+    проверяемого адреса.
+    """
+    # django.test тяжёлый: сайту он нужен только в тестах.
+    from django.test.utils import override_settings
+
+    match = resolve(url.split('?')[0])
+    if budget_for(match) is None:
+        raise AssertionError(f'У {match.view_name} ({url}) нет бюджета')
+    with override_settings(QUERY_BUDGET_MODE='raise'):
+        try:
+            return client.get(url, **extra)
+        except QueryBudgetExceeded as error:
+            raise AssertionError(str(error)) from None
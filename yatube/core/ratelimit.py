@@ -0,0 +1,126 @@
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import caches
+from django.http import HttpResponse
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60)."""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def get_client_keys(request):
+    """Ключи лимита: IP клиента и id пользователя из сессии.
+
+    Считаются оба, поэтому несколько аккаунтов с одного IP делят его
+    лимит. Пользователь берётся прямо из сессии, без запроса к таблице
+    User.
+    """
+    keys = [f'ip:{request.META.get(settings.RATELIMIT_IP_META_KEY, "")}']
+    user_id = request.session.get(SESSION_KEY)
+    if user_id is not None:
+        keys.append(f'user:{user_id}')
+    return keys
+
+
+def is_allowed(keys, rate):
+    """Скользящее окно: взвешенная сумма счётчиков текущего и прошлого окна.
+
+    Запрос проходит, если лимит не исчерпан ни по одному ключу; тогда
+    растут счётчики всех ключей.
+    """
+    limit, period = parse_rate(rate)
+    cache = caches[settings.RATELIMIT_CACHE]
+    now = time.time()
+    window = int(now // period)
+    windows = [
+        (f'ratelimit:{key}:{window}', f'ratelimit:{key}:{window - 1}')
+        for key in keys
+    ]
+    counts = cache.get_many([key for pair in windows for key in pair])
+    elapsed = (now % period) / period
+    for current_key, previous_key in windows:
+        estimated = (
+            counts.get(previous_key, 0) * (1 - elapsed)
+            + counts.get(current_key, 0)
+        )
+        if estimated >= limit:
+            return False
+    for current_key, _ in windows:
+        if not cache.add(current_key, 1, period * 2):
+            try:
+                cache.incr(current_key)
+            except ValueError:
+                cache.set(current_key, 1, period * 2)
+    return True
+
+
+def too_many_requests(rate):
+    response = HttpResponse(
+        'Слишком много запросов, попробуйте позже.',
+        content_type='text/plain; charset=utf-8',
+        status=429,
+    )
+    response['Retry-After'] = parse_rate(rate)[1]
+    return response
+
+
+def check(request, name, rate):
+    if request.method in SAFE_METHODS:
+        return None
+    keys = [f'{name}:{key}' for key in get_client_keys(request)]
+    if is_allowed(keys, rate):
+        return None
+    return too_many_requests(rate)
+
+
+def ratelimit(rate=None, name=None):
+    """Декоратор лимита для view поверх check().
+
+    Без rate лимит берётся из settings.RATELIMITS по имени маршрута.
+    RateLimitMiddleware такие view пропускает, чтобы не считать запрос
+    дважды.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            view_name = name or request.resolver_match.view_name
+            view_rate = rate or settings.RATELIMITS.get(view_name)
+            if view_rate:
+                response = check(request, view_name, view_rate)
+                if response is not None:
+                    return response
+            return view_func(request, *args, **kwargs)
+        wrapper.ratelimited = True
+        return wrapper
+    return decorator
+
+
+class RateLimitMiddleware:
+    """Лимит записи для маршрутов из settings.RATELIMITS.
+
+    Стоит до CsrfViewMiddleware, поэтому 429 отдаётся до разбора формы
+    и до обращения к пользователю в базе.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(view_func, 'ratelimited', False):
+            return None
+        name = request.resolver_match.view_name
+        rate = settings.RATELIMITS.get(name)
+        if rate is None:
+            return None
+        return check(request, name, rate)
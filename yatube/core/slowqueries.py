@@ -0,0 +1,292 @@
+import hashlib
+import json
+import logging
+import math
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections
+
+from .querybudget import call_site
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS query_stats ('
+    'fingerprint TEXT PRIMARY KEY, sql TEXT NOT NULL, '
+    'count INTEGER NOT NULL, total REAL NOT NULL, '
+    'view TEXT, template TEXT, plan TEXT)',
+    'CREATE TABLE IF NOT EXISTS query_histogram ('
+    'fingerprint TEXT NOT NULL, bucket INTEGER NOT NULL, '
+    'count INTEGER NOT NULL, PRIMARY KEY (fingerprint, bucket))',
+)
+
+# Гистограмма времени: четыре корзины на каждое удвоение микросекунд,
+# то есть перцентиль известен с точностью около 19%.
+BUCKETS_PER_OCTAVE = 4
+
+NORMALIZE = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?(?:e[+-]?\d+)?\b', re.I), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'"s\d+_x\d+"'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+_state = threading.local()
+_local = threading.local()
+_stats_lock = threading.Lock()
+_pending = {'stats': {}, 'buckets': defaultdict(int), 'flushed': 0.0}
+
+
+@lru_cache(maxsize=4096)
+def normalize(sql):
+    """SQL без литералов и параметров: одинаков для всех вызовов запроса."""
+    for pattern, replacement in NORMALIZE:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    normalized = normalize(sql)
+    return hashlib.md5(normalized.encode()).hexdigest()[:12], normalized
+
+
+def bucket(duration):
+    micros = max(duration * 1e6, 1)
+    return int(math.log2(micros) * BUCKETS_PER_OCTAVE)
+
+
+def bucket_upper(number):
+    """Верхняя граница корзины в секундах."""
+    return 2 ** ((number + 1) / BUCKETS_PER_OCTAVE) / 1e6
+
+
+def percentile(histogram, q):
+    """Перцентиль по гистограмме {корзина: число}."""
+    total = sum(histogram.values())
+    if not total:
+        return 0.0
+    seen = 0
+    for number in sorted(histogram):
+        seen += histogram[number]
+        if seen >= total * q / 100:
+            return bucket_upper(number)
+    return bucket_upper(max(histogram))
+
+
+def connect():
+    """Файл статистики, общий для всех процессов сайта."""
+    path = settings.SLOW_QUERY_STATS_PATH
+    if getattr(_local, 'path', None) != path:
+        connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        for statement in SCHEMA:
+            connection.execute(statement)
+        _local.connection, _local.path = connection, path
+    return _local.connection
+
+
+def record(sql, duration, tags=None):
+    key, normalized = fingerprint(sql)
+    with _stats_lock:
+        stats = _pending['stats'].setdefault(
+            key, {'sql': normalized, 'count': 0, 'total': 0.0}
+        )
+        stats['count'] += 1
+        stats['total'] += duration
+        if tags:
+            stats.update(tags)
+        _pending['buckets'][key, bucket(duration)] += 1
+
+
+def flush(force=False):
+    """Переносит накопленную статистику процесса в общий файл.
+
+    Не чаще раза в SLOW_QUERY_FLUSH_INTERVAL секунд, если не force.
+    """
+    now = time.monotonic()
+    with _stats_lock:
+        if not force and (
+            now - _pending['flushed'] < settings.SLOW_QUERY_FLUSH_INTERVAL
+        ):
+            return
+        stats, buckets = _pending['stats'], _pending['buckets']
+        _pending.update(stats={}, buckets=defaultdict(int), flushed=now)
+    if not stats:
+        return
+    connection = connect()
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        connection.executemany(
+            'INSERT INTO query_stats '
+            '(fingerprint, sql, count, total, view, template, plan) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT (fingerprint) DO UPDATE SET '
+            'count = count + excluded.count, '
+            'total = total + excluded.total, '
+            'view = coalesce(excluded.view, view), '
+            'template = coalesce(excluded.template, template), '
+            'plan = coalesce(excluded.plan, plan)',
+            [
+                (key, item['sql'], item['count'], item['total'],
+                 item.get('view'), item.get('template'), item.get('plan'))
+                for key, item in stats.items()
+            ],
+        )
+        connection.executemany(
+            'INSERT INTO query_histogram (fingerprint, bucket, count) '
+            'VALUES (?, ?, ?) ON CONFLICT (fingerprint, bucket) '
+            'DO UPDATE SET count = count + excluded.count',
+            [(key, number, count) for (key, number), count in buckets.items()],
+        )
+        connection.execute('COMMIT')
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+
+
+def explain(connection, sql, params):
+    """План медленного запроса; только для SELECT."""
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    prefix = (
+        'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    )
+    _state.explaining = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql, params)
+            return '\n'.join(
+                ' '.join(str(value) for value in row)
+                for row in cursor.fetchall()
+            )
+    except Exception:
+        return None
+    finally:
+        _state.explaining = False
+
+
+def current_view():
+    request = getattr(_state, 'request', None)
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else None
+
+
+class QueryTimer:
+    """Обёртка выполнения запросов одного соединения."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_state, 'explaining', False):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = time.perf_counter() - started
+        tags = None
+        if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD and not many:
+            tags = self.slow(sql, params, duration, sys._getframe(1))
+        record(sql, duration, tags)
+        return result
+
+    def slow(self, sql, params, duration, frame):
+        site, template = call_site(frame)
+        key, normalized = fingerprint(sql)
+        tags = {
+            'view': current_view(),
+            'template': template,
+            'plan': explain(self.connection, sql, params),
+        }
+        logger.warning(json.dumps({
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'fingerprint': key,
+            'ms': round(duration * 1000, 2),
+            'site': site,
+            'sql': sql,
+            'fingerprint_sql': normalized,
+            **tags,
+        }, ensure_ascii=False))
+        return tags
+
+
+def should_measure():
+    if not settings.SLOW_QUERIES:
+        return False
+    rate = settings.SLOW_QUERY_SAMPLE_RATE
+    return rate >= 1 or random.random() < rate
+
+
+class SlowQueryMiddleware:
+    """Замеряет все запросы к базе за время запроса к сайту.
+
+    Время каждого запроса попадает в статистику по отпечатку,
+    запросы дольше SLOW_QUERY_THRESHOLD мс — в журнал вместе с планом,
+    view и шаблоном. Замеряется доля SLOW_QUERY_SAMPLE_RATE запросов
+    к сайту: счётчики в статистике — по замеренным запросам.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not should_measure():
+            return self.get_response(request)
+        _state.request = request
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(QueryTimer(connection))
+                    )
+                return self.get_response(request)
+        finally:
+            _state.request = None
+            flush()
+
+
+def top(order='total', limit=20):
+    """Худшие отпечатки из общего файла статистики."""
+    connection = connect()
+    rows = connection.execute(
+        'SELECT fingerprint, sql, count, total, view, template, plan '
+        'FROM query_stats'
+    ).fetchall()
+    histograms = defaultdict(dict)
+    for key, number, count in connection.execute(
+        'SELECT fingerprint, bucket, count FROM query_histogram'
+    ):
+        histograms[key][number] = count
+    result = [
+        {
+            'fingerprint': key,
+            'sql': sql,
+            'count': count,
+            'total': total,
+            'mean': total / count,
+            'p95': percentile(histograms[key], 95),
+            'view': view,
+            'template': template,
+            'plan': plan,
+        }
+        for key, sql, count, total, view, template, plan in rows
+    ]
+    result.sort(key=lambda item: item[order], reverse=True)
+    return result[:limit]
+
+
+def reset():
+    connection = connect()
+    connection.execute('DELETE FROM query_stats')
+    connection.execute('DELETE FROM query_histogram')
@@ -0,0 +1,129 @@
+import gzip
+import io
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+from .media import IMMUTABLE_MAX_AGE, file_etag, resolve_path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.\w+$')
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.svg', '.html', '.txt', '.json', '.xml', '.ico',
+)
+# Порядок важен: br сжимает лучше, поэтому отдаётся первым.
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых (q=0)."""
+    encodings = set()
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            encodings.add(name.strip().lower())
+    return encodings
+
+
+def gzip_bytes(data):
+    buffer = io.BytesIO()
+    # mtime=0 делает архив воспроизводимым между сборками.
+    with gzip.GzipFile(fileobj=buffer, mode='wb', mtime=0) as fh:
+        fh.write(data)
+    return buffer.getvalue()
+
+
+def compress_file(path):
+    """Кладёт рядом с файлом .gz и .br, если они меньше оригинала."""
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    variants = [('.gz', gzip_bytes(data))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as fh:
+                fh.write(compressed)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хэшами в именах и сжатые копии файлов после collectstatic.
+
+    Пока collectstatic не запускался (разработка, тесты), отдаёт
+    исходные имена файлов.
+    """
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                compress_file(self.path(name))
+
+
+def _choose_variant(request, fullpath):
+    encodings = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING'))
+    for encoding, suffix in PRECOMPRESSED:
+        if encoding in encodings and os.path.isfile(fullpath + suffix):
+            return encoding, fullpath + suffix
+    return None, fullpath
+
+
+@require_safe
+def serve(request, path):
+    """Отдача собранной статики для развёртывания на одном сервере."""
+    path, fullpath = resolve_path(settings.STATIC_ROOT, path)
+    encoding, variant = _choose_variant(request, fullpath)
+    stat = os.stat(variant)
+    etag = file_etag(stat, f'-{encoding}' if encoding else '')
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        response = FileResponse(
+            open(variant, 'rb'),
+            content_type=(
+                mimetypes.guess_type(fullpath)[0]
+                or 'application/octet-stream'
+            ),
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(int(stat.st_mtime))
+    if HASHED_NAME_RE.search(path):
+        response['Cache-Control'] = (
+            f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        )
+    else:
+        response['Cache-Control'] = (
+            f'public, max-age={settings.STATIC_CACHE_MAX_AGE}'
+        )
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
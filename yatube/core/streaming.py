@@ -0,0 +1,70 @@
+from django.http import StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.template.context import make_context
+from django.template.loader import get_template
+from django.template.loader_tags import (BLOCK_CONTEXT_KEY, BlockContext,
+                                         BlockNode, ExtendsNode)
+from django.utils.cache import patch_vary_headers
+
+# Перед этим блоком накопленный HTML (включая <head>) уходит клиенту.
+FLUSH_BEFORE_BLOCK = 'content'
+
+
+def _root_template(template, context):
+    """Корневой шаблон цепочки extends с заполненным контекстом блоков.
+
+    Повторяет то, что делает ExtendsNode.render, но не рендерит родителя
+    целиком, а отдаёт его узлы по одному.
+    """
+    while True:
+        extends = [n for n in template.nodelist if isinstance(n, ExtendsNode)]
+        if not extends:
+            return template
+        if BLOCK_CONTEXT_KEY not in context.render_context:
+            context.render_context[BLOCK_CONTEXT_KEY] = BlockContext()
+        block_context = context.render_context[BLOCK_CONTEXT_KEY]
+        block_context.add_blocks(extends[0].blocks)
+        template = extends[0].get_parent(context)
+        if not any(isinstance(n, ExtendsNode) for n in template.nodelist):
+            block_context.add_blocks({
+                block.name: block
+                for block in template.nodelist.get_nodes_by_type(BlockNode)
+            })
+
+
+def iter_template(template_name, context=None, request=None):
+    """Рендерит шаблон частями: всё до блока content, затем остальное."""
+    template = get_template(template_name).template
+    context = make_context(
+        context, request, autoescape=template.engine.autoescape
+    )
+    with context.render_context.push_state(template):
+        with context.bind_template(template):
+            context.template_name = template.name
+            root = _root_template(template, context)
+            with context.render_context.push_state(
+                    root, isolated_context=False):
+                buffer = []
+                for node in root.nodelist:
+                    if (isinstance(node, BlockNode)
+                            and node.name == FLUSH_BEFORE_BLOCK):
+                        yield ''.join(buffer)
+                        buffer = []
+                    buffer.append(str(node.render_annotated(context)))
+                yield ''.join(buffer)
+
+
+def stream_render(request, template_name, context=None):
+    """Потоковый ответ с шаблоном, который рендерится при отдаче.
+
+    К этому времени SessionMiddleware и CsrfViewMiddleware уже отработали,
+    поэтому CSRF-токен создаётся, а Vary: Cookie ставится заранее:
+    страница зависит от пользователя из сессии.
+    """
+    get_token(request)
+    response = StreamingHttpResponse(
+        iter_template(template_name, context, request),
+        content_type='text/html; charset=utf-8',
+    )
+    patch_vary_headers(response, ('Cookie',))
+    return response
@@ -0,0 +1,23 @@
+from functools import lru_cache
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@lru_cache(maxsize=None)
+def read_static(path):
+    """Содержимое статического файла, прочитанное один раз на процесс."""
+    fullpath = finders.find(path)
+    if fullpath is None:
+        fullpath = staticfiles_storage.path(path)
+    with open(fullpath, encoding='utf-8') as fh:
+        return fh.read()
+
+
+@register.simple_tag
+def inline_static(path):
+    return mark_safe(read_static(path))
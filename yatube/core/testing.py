@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.test import runner
+from django.test.utils import override_settings
+
+from .querybudget import check_query_budget
+
+
+def _init_worker(counter):
+    """Воркер manage.py test --parallel получает свой MEDIA_ROOT.
+
+    Там же лежит его очередь уведомлений.
+
+    База и LocMem-кэш у воркера и так свои: процесс создаётся через fork.
+    Но кэш общий для всех тестов воркера: тесты, которые зависят от
+    закэшированных страниц и версий лент, очищают его в setUp. Ошибки
+    из воркеров передаются в основной процесс через tblib.
+    """
+    runner._init_worker(counter)
+    media_root = tempfile.mkdtemp(
+        prefix=f'worker-{runner._worker_id}-', dir=settings.MEDIA_ROOT
+    )
+    override_settings(
+        MEDIA_ROOT=media_root,
+        NOTIFICATIONS_QUEUE_PATH=os.path.join(
+            media_root, 'notifications.sqlite3'
+        ),
+    ).enable()
+
+
+class IsolatedParallelTestSuite(runner.ParallelTestSuite):
+    init_worker = _init_worker
+
+
+class TestRunner(runner.DiscoverRunner):
+    parallel_test_suite = IsolatedParallelTestSuite
+
+
+class QueryBudgetMixin:
+    """Проверка бюджетов запросов core.querybudget в TestCase."""
+
+    def assertQueryBudget(self, url, client=None, **extra):
+        try:
+            return check_query_budget(client or self.client, url, **extra)
+        except AssertionError as error:
+            self.fail(str(error))
@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+class HotPathQueryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='reader')
+        Post.objects.create(author=cls.user, text='Пост')
+        cls.INDEX_URL = reverse('posts:index')
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_anonymous_cached_index_without_queries(self):
+        """Аноним получает закэшированную главную без запросов к базе."""
+        self.client.get(self.INDEX_URL)
+        with self.assertNumQueries(0):
+            self.client.get(self.INDEX_URL)
+
+    def test_authorized_session_and_user_cached(self):
+        """Сессия и пользователь читаются из кэша, а не из базы."""
+        self.authorized_client.get(self.INDEX_URL)
+        with self.assertNumQueries(0):
+            response = self.authorized_client.get(self.INDEX_URL)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_user_cache_invalidated_on_save(self):
+        self.authorized_client.get(self.INDEX_URL)
+        self.user.first_name = 'Новое имя'
+        self.user.save()
+        response = self.authorized_client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            response.wsgi_request.user.first_name, 'Новое имя'
+        )
@@ -0,0 +1,60 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test import SimpleTestCase
+
+TEMP_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+ALIAS = 'bootstrap_test'
+
+
+class BootstrapSchemaTests(SimpleTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.path = os.path.join(TEMP_DIR, 'db.sqlite3')
+        connections.databases[ALIAS] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': self.path,
+        }
+
+    def tearDown(self):
+        connections[ALIAS].close()
+        del connections[ALIAS]
+        del connections.databases[ALIAS]
+        os.remove(self.path)
+
+    def test_snapshot_matches_models(self):
+        """Снимок содержит все таблицы моделей и историю миграций."""
+        call_command(
+            'bootstrap_schema', database=ALIAS, stdout=StringIO()
+        )
+        with sqlite3.connect(self.path) as db:
+            tables = {
+                row[0] for row in db.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            applied = db.execute(
+                "SELECT COUNT(*) FROM django_migrations WHERE app = 'posts'"
+            ).fetchone()[0]
+        expected = set(connection.introspection.django_table_names())
+        self.assertLessEqual(expected, tables)
+        self.assertGreater(applied, 0)
+
+    def test_non_empty_database_untouched(self):
+        """Повторный запуск не загружает снимок поверх готовой схемы."""
+        call_command(
+            'bootstrap_schema', database=ALIAS, stdout=StringIO()
+        )
+        out = StringIO()
+        call_command('bootstrap_schema', database=ALIAS, stdout=out)
+        self.assertIn('не пустая', out.getvalue())
@@ -0,0 +1,71 @@
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from core import boottime
+
+# Запас в несколько раз к обычным ~0,3 с: тест ловит заметный регресс,
+# а не шум машины.
+SETUP_BUDGET = 1.5
+# Модули, которые не должны импортироваться при запуске процесса.
+DEFERRED = (
+    'django.test',
+    'setuptools.dist',
+    'posts.admin',
+    'posts.jobs',
+    'core.loadtest',
+    'requests',
+    'cProfile',
+    'PIL',
+)
+
+
+class BootTimeTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.result = boottime.measure(
+            '/about/author/', settings.SETTINGS_MODULE, settings.BASE_DIR,
+            settings.WSGI_APPLICATION,
+        )
+
+    def test_parse_importtime(self):
+        imports = boottime.parse_importtime(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |   posts.forms\n'
+            'import time:      1500 |       2000 | posts.views\n'
+        )
+        self.assertEqual(imports[1], {
+            'module': 'posts.views', 'self': 0.0015, 'cumulative': 0.002,
+            'depth': 0,
+        })
+
+    def test_first_request(self):
+        self.assertEqual(self.result['status'], 200)
+        phases = {
+            item['module']: item['phase'] for item in self.result['imports']
+        }
+        self.assertEqual(phases['about.views'], 'request')
+
+    def test_heavy_imports_deferred(self):
+        loaded = {
+            item['module'] for item in self.result['imports']
+            if item['phase'] == 'setup'
+        }
+        self.assertEqual(
+            [module for module in DEFERRED if module in loaded], []
+        )
+
+    def test_setup_budget(self):
+        self.assertLess(self.result['setup'], SETUP_BUDGET)
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            'boottime', '--runs', '1', '--path', '/about/author/',
+            '--project', '--limit', '100', stdout=out,
+        )
+        self.assertIn('статус 200', out.getvalue())
+        self.assertIn('about.views', out.getvalue())
@@ -0,0 +1,125 @@
+import gzip
+import zlib
+from unittest import mock
+
+import brotli
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+from ..compression import compress
+
+User = get_user_model()
+
+
+class CompressionTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='Описание'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Пост {i}', group=cls.group)
+            for i in range(5)
+        )
+        cls.INDEX_URL = reverse('posts:index')
+        cls.GROUP_LIST_URL = reverse(
+            'posts:group_posts', kwargs={'slug': cls.group.slug}
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_gzip_negotiated(self):
+        """Ответ сжимается gzip, если клиент его принимает."""
+        response = self.client.get(
+            self.INDEX_URL, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn('Пост 1', gzip.decompress(response.content).decode())
+
+    def test_brotli_preferred(self):
+        """br выбирается раньше gzip, если клиент принимает оба."""
+        response = self.client.get(
+            self.INDEX_URL, HTTP_ACCEPT_ENCODING='gzip, deflate, br'
+        )
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Пост 1', brotli.decompress(response.content).decode())
+
+    def test_identity_without_accept_encoding(self):
+        response = self.client.get(self.INDEX_URL)
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_cached_page_compressed_once(self):
+        """Сжатое тело страницы из cache_page берётся из кэша."""
+        with mock.patch(
+                'core.compression.compress', wraps=compress) as compressor:
+            for _ in range(3):
+                response = self.client.get(
+                    self.INDEX_URL, HTTP_ACCEPT_ENCODING='gzip'
+                )
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(compressor.call_count, 1)
+
+    @override_settings(FEED_STREAMING=True)
+    def test_streaming_feed_flushes_head_first(self):
+        """<head> уходит клиенту до запроса постов ленты."""
+        response = self.client.get(self.GROUP_LIST_URL)
+        chunks = iter(response.streaming_content)
+        with CaptureQueriesContext(connection) as ctx:
+            head = next(chunks).decode()
+        self.assertIn('</head>', head)
+        self.assertEqual(ctx.captured_queries, [])
+        body = b''.join(chunks).decode()
+        self.assertIn('Пост 1', body)
+
+    @override_settings(FEED_STREAMING=True)
+    def test_streaming_feed_headers(self):
+        """Потоковая лента ставит Vary: Cookie и cookie CSRF заранее."""
+        self.client.force_login(self.user)
+        response = self.client.get(self.GROUP_LIST_URL)
+        self.assertTrue(response.streaming)
+        self.assertIn('Cookie', response['Vary'])
+        self.assertIn(settings.CSRF_COOKIE_NAME, response.cookies)
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn(self.user.username, body)
+
+    @override_settings(FEED_STREAMING=True)
+    def test_streaming_gzip_flushes_head_first(self):
+        """В gzip-потоке <head> тоже уходит до запроса постов."""
+        response = self.client.get(
+            self.GROUP_LIST_URL, HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        chunks = iter(response.streaming_content)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        with CaptureQueriesContext(connection) as ctx:
+            head = decompressor.decompress(next(chunks)).decode()
+        self.assertIn('</head>', head)
+        self.assertEqual(ctx.captured_queries, [])
+        body = decompressor.decompress(b''.join(chunks)).decode()
+        self.assertIn('Пост 1', body)
+
+    @override_settings(FEED_STREAMING=True)
+    def test_streaming_brotli_flushes_head_first(self):
+        """В br-потоке <head> тоже уходит до запроса постов."""
+        response = self.client.get(
+            self.GROUP_LIST_URL, HTTP_ACCEPT_ENCODING='br'
+        )
+        self.assertEqual(response['Content-Encoding'], 'br')
+        chunks = iter(response.streaming_content)
+        decompressor = brotli.Decompressor()
+        with CaptureQueriesContext(connection) as ctx:
+            head = decompressor.process(next(chunks)).decode()
+        self.assertIn('</head>', head)
+        self.assertEqual(ctx.captured_queries, [])
+        body = decompressor.process(b''.join(chunks)).decode()
+        self.assertIn('Пост 1', body)
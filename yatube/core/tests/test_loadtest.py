@@ -0,0 +1,73 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from core import loadtest
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class LoadtestStatsTests(SimpleTestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(loadtest.percentile(values, 50), 50)
+        self.assertEqual(loadtest.percentile(values, 99), 99)
+        self.assertEqual(loadtest.percentile([], 95), 0.0)
+
+    def test_knee(self):
+        """Колено — там, где рост пропускной способности прекратился."""
+        saturated = [(1, 100), (2, 195), (4, 380), (8, 410), (16, 415),
+                     (32, 412)]
+        self.assertEqual(loadtest.find_knee(saturated), 4)
+
+    def test_no_knee_while_linear(self):
+        linear = [(1, 100), (2, 200), (4, 400), (8, 790)]
+        self.assertIsNone(loadtest.find_knee(linear))
+        self.assertIsNone(loadtest.find_knee([(1, 100), (2, 150)]))
+
+    def test_summary_counts_errors(self):
+        samples = [
+            loadtest.Sample(0, 'index', 200, 0.01),
+            loadtest.Sample(0, 'index', 500, 0.02),
+            loadtest.Sample(0, 'comment', 429, 0.01),
+            loadtest.Sample(0, 'comment', 0, 0.5),
+        ]
+        summary = loadtest.summarize(samples, 2)
+        self.assertEqual(summary['throughput'], 2)
+        self.assertEqual(summary['errors'], 2)
+        self.assertEqual(summary['throttled'], 1)
+
+    def test_client_errors_counted(self):
+        """403 (CSRF) и 404 — ошибки, 429 и перенаправления — нет."""
+        samples = [
+            loadtest.Sample(0, 'comment', 403, 0.01),
+            loadtest.Sample(0, 'post', 404, 0.01),
+            loadtest.Sample(0, 'login', 302, 0.01),
+            loadtest.Sample(0, 'comment', 429, 0.01),
+        ]
+        summary = loadtest.summarize(samples, 1)
+        self.assertEqual(summary['errors'], 2)
+        self.assertEqual(summary['throttled'], 1)
+        self.assertEqual(summary['error_rate'], 0.5)
+
+
+class LoadtestCommandTests(LiveServerTestCase):
+    def test_drives_running_server(self):
+        author = User.objects.create_user(username='Abramow_test')
+        group = Group.objects.create(title='Группа', slug='test-slug')
+        Post.objects.create(author=author, text='Пост', group=group)
+        out = StringIO()
+        call_command(
+            'loadtest', url=self.live_server_url, users='1,2',
+            duration=0.5, accounts=2, mix='comment=100,upload=0', stdout=out,
+        )
+        report = out.getvalue()
+        self.assertIn('Пользователей: 2', report)
+        self.assertIn('index', report)
+        self.assertNotIn('upload', report)
+        self.assertTrue(User.objects.filter(username='loadtest1').exists())
+        self.assertIn('login', report)
+        self.assertTrue(Comment.objects.exists())
@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+from http import HTTPStatus
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CONTENT = b'0123456789' * 10
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class MediaServeTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(TEMP_MEDIA_ROOT, 'posts'))
+        os.makedirs(os.path.join(TEMP_MEDIA_ROOT, 'cache', 'ab'))
+        for name in ('posts/small.txt', 'cache/ab/thumb.txt'):
+            with open(os.path.join(TEMP_MEDIA_ROOT, name), 'wb') as fh:
+                fh.write(CONTENT)
+        cls.URL = f'{settings.MEDIA_URL}posts/small.txt'
+        cls.THUMB_URL = f'{settings.MEDIA_URL}cache/ab/thumb.txt'
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_full_file(self):
+        """Файл отдаётся целиком через FileResponse."""
+        response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('ETag', response)
+
+    def test_range(self):
+        """Запрос с Range получает 206 и нужный кусок файла."""
+        cases = {
+            'bytes=0-9': (CONTENT[:10], 'bytes 0-9/100'),
+            'bytes=95-': (CONTENT[95:], 'bytes 95-99/100'),
+            'bytes=-5': (CONTENT[-5:], 'bytes 95-99/100'),
+        }
+        for header, (body, content_range) in cases.items():
+            with self.subTest(header=header):
+                response = self.client.get(self.URL, HTTP_RANGE=header)
+                self.assertEqual(
+                    response.status_code, HTTPStatus.PARTIAL_CONTENT
+                )
+                self.assertEqual(b''.join(response.streaming_content), body)
+                self.assertEqual(response['Content-Range'], content_range)
+
+    def test_range_not_compressed(self):
+        """Кусок файла по Range не сжимается: Content-Range о байтах."""
+        response = self.client.get(
+            self.URL, HTTP_RANGE='bytes=0-49', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.PARTIAL_CONTENT)
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[:50])
+        self.assertEqual(response['Content-Range'], 'bytes 0-49/100')
+
+    def test_range_not_satisfiable(self):
+        response = self.client.get(self.URL, HTTP_RANGE='bytes=500-')
+        self.assertEqual(
+            response.status_code, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+
+    def test_not_modified(self):
+        """Повторный запрос с валидаторами получает 304."""
+        etag = self.client.get(self.URL)['ETag']
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_thumbnail_immutable(self):
+        response = self.client.get(self.THUMB_URL)
+        self.assertIn('immutable', response['Cache-Control'])
+        response = self.client.get(self.URL)
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_path_traversal(self):
+        response = self.client.get(f'{settings.MEDIA_URL}../manage.py')
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    @override_settings(MEDIA_SENDFILE='x-accel-redirect')
+    def test_accel_redirect(self):
+        response = self.client.get(self.URL)
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            f'{settings.MEDIA_ACCEL_REDIRECT_PREFIX}posts/small.txt',
+        )
+        self.assertEqual(response.content, b'')
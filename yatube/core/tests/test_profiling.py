@@ -0,0 +1,97 @@
+import os
+import pstats
+import shutil
+import tempfile
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core import profiling
+from posts.models import Post, User
+
+
+def slow_function():
+    time.sleep(0.05)
+
+
+class StackSamplerTests(SimpleTestCase):
+    def test_collapsed_stacks(self):
+        sampler = profiling.StackSampler(0.002)
+        sampler.start()
+        slow_function()
+        sampler.stop()
+        path = os.path.join(tempfile.mkdtemp(), 'profile.collapsed')
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        sampler.write(path)
+        with open(path, encoding='utf-8') as collapsed:
+            lines = collapsed.read().splitlines()
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertTrue(stack.endswith(f'{__name__}.slow_function'))
+        self.assertGreater(int(count), 5)
+
+
+class ProfilingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Abramow_test')
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+        cls.URL = reverse('posts:post_detail', args=(cls.post.pk,))
+
+    def setUp(self):
+        cache.clear()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings = override_settings(
+            PROFILING_ROOT=root, PROFILING_MODE='cprofile', PROFILING_KEEP=2
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.directory = profiling.view_directory('posts:post_detail')
+
+    def profile(self, token=None):
+        return self.client.get(
+            self.URL, HTTP_X_PROFILE=token or profiling.make_token()
+        )
+
+    def test_signed_header(self):
+        response = self.profile()
+        name = response['X-Profile-File']
+        stats = pstats.Stats(os.path.join(self.directory, name))
+        self.assertTrue(any(
+            function == 'post_detail' for _, _, function in stats.stats
+        ))
+
+    def test_bad_signature_ignored(self):
+        response = self.profile('profile:forged:token')
+        self.assertNotIn('X-Profile-File', response)
+        self.assertFalse(os.path.exists(self.directory))
+
+    def test_sample_rate(self):
+        with override_settings(PROFILING_SAMPLE_RATE=1):
+            self.assertIn('X-Profile-File', self.client.get(self.URL))
+        self.assertNotIn('X-Profile-File', self.client.get(self.URL))
+
+    def test_retention(self):
+        names = [self.profile()['X-Profile-File'] for _ in range(3)]
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        self.assertIn(names[-1], os.listdir(self.directory))
+
+    def test_admin_page(self):
+        name = self.profile()['X-Profile-File']
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin_profiles'))
+        self.assertContains(response, name)
+        self.assertContains(response, 'posts.post_detail')
+        response = self.client.get(
+            reverse('admin_profile_file', args=('posts.post_detail', name))
+        )
+        self.assertEqual(response.status_code, 200)
+        self.client.force_login(self.author)
+        response = self.client.get(reverse('admin_profiles'))
+        self.assertEqual(response.status_code, 302)
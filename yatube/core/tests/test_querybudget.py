@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import resolve
+
+from core.querybudget import (
+    QueryBudgetExceeded, budget_for, check_query_budget,
+)
+from posts.models import Group, Post, User
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Abramow_test')
+        cls.group = Group.objects.create(title='Группа', slug='test-slug')
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Пост {i}', group=cls.group)
+            for i in range(3)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_decorator_and_settings(self):
+        """Бюджет из настроек важнее декоратора у view."""
+        self.assertEqual(budget_for(resolve('/')), 5)
+        with override_settings(QUERY_BUDGETS={'posts:index': 1}):
+            self.assertEqual(budget_for(resolve('/')), 1)
+
+    @override_settings(QUERY_BUDGETS={'posts:index': 1})
+    def test_exceeded_grouped_by_call_site(self):
+        with self.assertRaises(QueryBudgetExceeded) as context:
+            self.client.get('/')
+        report = str(context.exception)
+        self.assertIn('posts:index: 2 запросов при бюджете 1', report)
+        self.assertIn('posts/paginator.py', report)
+        self.assertIn('COUNT(*)', report)
+
+    def test_template_line_in_report(self):
+        """Запрос из шаблона показан со строкой шаблона."""
+        with override_settings(QUERY_BUDGETS={'posts:profile': 0}):
+            with self.assertRaises(QueryBudgetExceeded) as context:
+                self.client.get('/profile/Abramow_test/')
+        self.assertIn('шаблон posts/profile.html:', str(context.exception))
+
+    @override_settings(
+        QUERY_BUDGET_MODE='log', QUERY_BUDGETS={'posts:index': 0}
+    )
+    def test_log_mode(self):
+        with self.assertLogs('core.querybudget', 'WARNING') as logs:
+            response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('posts:index', logs.output[0])
+
+    def test_url_without_budget(self):
+        with self.assertRaisesMessage(AssertionError, 'нет бюджета'):
+            check_query_budget(self.client, '/about/author/')
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Post
+from ..ratelimit import parse_rate, ratelimit
+
+User = get_user_model()
+
+
+@override_settings(RATELIMITS={'posts:add_comment': '2/m'})
+class RateLimitTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='spammer')
+        cls.post = Post.objects.create(author=cls.user, text='Пост')
+        cls.COMMENT_URL = reverse(
+            'posts:add_comment', kwargs={'post_id': cls.post.id}
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('10/m'), (10, 60))
+        self.assertEqual(parse_rate('5/hour'), (5, 3600))
+
+    def test_comment_limit(self):
+        """После исчерпания лимита отдаётся 429 без записи в базу."""
+        for _ in range(2):
+            response = self.authorized_client.post(
+                self.COMMENT_URL, {'text': 'Комментарий'}
+            )
+            self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        with self.assertNumQueries(0):
+            response = self.authorized_client.post(
+                self.COMMENT_URL, {'text': 'Комментарий'}
+            )
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(Comment.objects.count(), 2)
+
+    def test_accounts_share_ip_limit(self):
+        """Смена аккаунта не обходит лимит IP."""
+        for username in ('first', 'second', 'third'):
+            client = Client()
+            client.force_login(User.objects.create_user(username=username))
+            response = client.post(self.COMMENT_URL, {'text': 'Комментарий'})
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertEqual(Comment.objects.count(), 2)
+
+    def test_user_limit_across_ips(self):
+        """Лимит пользователя действует и с разных IP."""
+        for address in ('10.0.0.1', '10.0.0.2', '10.0.0.3'):
+            response = self.authorized_client.post(
+                self.COMMENT_URL, {'text': 'Комментарий'},
+                REMOTE_ADDR=address,
+            )
+        self.assertEqual(response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+
+    def test_get_not_limited(self):
+        for _ in range(3):
+            response = self.client.get(self.COMMENT_URL)
+            self.assertNotEqual(
+                response.status_code, HTTPStatus.TOO_MANY_REQUESTS
+            )
+
+    def test_decorator(self):
+        """Декоратор отдаёт 429 сверх лимита и не вызывает view."""
+        calls = []
+
+        @ratelimit('2/m', name='test:view')
+        def view(request):
+            calls.append(request)
+            return HttpResponse()
+
+        factory = RequestFactory()
+        statuses = []
+        for _ in range(3):
+            request = factory.post('/')
+            request.session = {}
+            statuses.append(view(request).status_code)
+        self.assertEqual(
+            statuses,
+            [HTTPStatus.OK, HTTPStatus.OK, HTTPStatus.TOO_MANY_REQUESTS],
+        )
+        self.assertEqual(len(calls), 2)
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import slowqueries
+from posts.models import Group, Post, User
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_literals_stripped(self):
+        first = slowqueries.fingerprint(
+            "SELECT * FROM posts_post WHERE id = 5 AND text = 'a''b'"
+        )
+        second = slowqueries.fingerprint(
+            "SELECT *  FROM posts_post\nWHERE id = %s AND text = 'x'"
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(
+            first[1], 'SELECT * FROM posts_post WHERE id = ? AND text = ?'
+        )
+
+    def test_in_lists_collapsed(self):
+        self.assertEqual(
+            slowqueries.normalize('SELECT 1 FROM t WHERE id IN (1, 2, 3)'),
+            slowqueries.normalize('SELECT 1 FROM t WHERE id IN (%s, %s)'),
+        )
+
+    def test_percentile(self):
+        histogram = {}
+        for duration in [0.001] * 94 + [0.1] * 6:
+            number = slowqueries.bucket(duration)
+            histogram[number] = histogram.get(number, 0) + 1
+        self.assertAlmostEqual(
+            slowqueries.percentile(histogram, 50), 0.001, delta=0.0002
+        )
+        self.assertAlmostEqual(
+            slowqueries.percentile(histogram, 95), 0.1, delta=0.02
+        )
+
+
+class SlowQueryMiddlewareTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Abramow_test')
+        cls.group = Group.objects.create(title='Группа', slug='test-slug')
+        Post.objects.create(author=cls.user, text='Пост', group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.mkdtemp()
+        self.settings = override_settings(
+            SLOW_QUERIES=True,
+            SLOW_QUERY_SAMPLE_RATE=1,
+            SLOW_QUERY_THRESHOLD=0,
+            SLOW_QUERY_STATS_PATH=os.path.join(directory, 'stats.sqlite3'),
+        )
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+        slowqueries.flush(force=True)
+        slowqueries.reset()
+
+    def test_slow_query_logged_with_plan_view_and_template(self):
+        self.client.force_login(self.user)
+        with self.assertLogs('core.slowqueries', 'WARNING') as logs:
+            self.client.get('/')
+        entries = [json.loads(line.split(':', 2)[2]) for line in logs.output]
+        selects = [
+            entry for entry in entries
+            if 'FROM "posts_post"' in entry['sql'] and entry['plan']
+        ]
+        self.assertTrue(selects)
+        self.assertTrue(all(e['view'] == 'posts:index' for e in entries))
+        # Счётчик уведомлений в шапке читается из шаблона.
+        self.assertIn('includes/header.html', [
+            (entry['template'] or '').split(':')[0] for entry in entries
+        ])
+        self.assertIn('posts_post', selects[0]['plan'])
+
+    def test_sampled_out_requests_not_measured(self):
+        with override_settings(SLOW_QUERY_SAMPLE_RATE=0), mock.patch.object(
+            slowqueries, 'flush'
+        ) as flush:
+            self.client.get('/')
+        flush.assert_not_called()
+        slowqueries.flush(force=True)
+        self.assertEqual(slowqueries.top(), [])
+
+    def test_command_lists_top_fingerprints(self):
+        with self.assertLogs('core.slowqueries', 'WARNING'):
+            for _ in range(3):
+                cache.clear()
+                self.client.get('/group/test-slug/')
+        slowqueries.flush(force=True)
+        rows = slowqueries.top(order='count', limit=100)
+        self.assertTrue(rows)
+        self.assertGreaterEqual(rows[0]['count'], 3)
+        out = StringIO()
+        call_command('slowqueries', '--order', 'count', '--plans', stdout=out)
+        self.assertIn(rows[0]['fingerprint'], out.getvalue())
+        self.assertIn('posts:group_posts', out.getvalue())
+        call_command('slowqueries', '--reset', stdout=StringIO())
+        self.assertEqual(slowqueries.top(), [])
@@ -0,0 +1,97 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+
+import brotli
+from django.conf import settings
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from ..staticfiles import accepted_encodings, serve
+
+TEMP_STATIC_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+TEMP_STATIC_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CSS = b'body { color: #212529; }\n' * 50
+
+
+@override_settings(
+    STATICFILES_DIRS=[TEMP_STATIC_DIR], STATIC_ROOT=TEMP_STATIC_ROOT
+)
+class StaticPipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(TEMP_STATIC_DIR, 'css'))
+        path = os.path.join(TEMP_STATIC_DIR, 'css', 'site.css')
+        with open(path, 'wb') as fh:
+            fh.write(CSS)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(TEMP_STATIC_DIR, ignore_errors=True)
+        shutil.rmtree(TEMP_STATIC_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with open(os.path.join(TEMP_STATIC_ROOT, 'staticfiles.json')) as fh:
+            self.hashed = json.load(fh)['paths']['css/site.css']
+
+    def test_collectstatic_hashes_and_compresses(self):
+        """collectstatic кладёт хэшированный файл и его .gz и .br копии."""
+        path = os.path.join(TEMP_STATIC_ROOT, self.hashed)
+        self.assertRegex(self.hashed, r'^css/site\.[0-9a-f]{12}\.css$')
+        with gzip.open(f'{path}.gz') as fh:
+            self.assertEqual(fh.read(), CSS)
+        with open(f'{path}.br', 'rb') as fh:
+            self.assertEqual(brotli.decompress(fh.read()), CSS)
+
+    def test_serve_precompressed_immutable(self):
+        """Хэшированный файл отдаётся сжатым и кэшируется навсегда."""
+        request = RequestFactory().get(
+            '/static/', HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        response = serve(request, self.hashed)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        body = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), CSS)
+
+    def test_serve_brotli_first(self):
+        """Если клиент принимает br, отдаётся .br копия."""
+        request = RequestFactory().get(
+            '/static/', HTTP_ACCEPT_ENCODING='gzip, br'
+        )
+        response = serve(request, self.hashed)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        body = b''.join(response.streaming_content)
+        self.assertEqual(brotli.decompress(body), CSS)
+
+    def test_serve_identity(self):
+        request = RequestFactory().get('/static/')
+        response = serve(request, 'css/site.css')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertEqual(b''.join(response.streaming_content), CSS)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(
+            accepted_encodings('gzip;q=1.0, br;q=0, identity'),
+            {'gzip', 'identity'},
+        )
+
+
+class CriticalCssTests(TestCase):
+    def test_critical_css_inlined(self):
+        """Критический CSS встроен в страницу."""
+        response = self.client.get(reverse('about:author'))
+        self.assertContains(response, '<style>*,::after')
+
+    def test_charset_in_first_kilobyte(self):
+        """Браузер ищет кодировку в первых 1024 байтах страницы."""
+        response = self.client.get(reverse('about:author'))
+        self.assertIn(b'<meta charset="utf-8">', response.content[:1024])
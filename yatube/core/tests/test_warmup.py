@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core import warmup
+from core.loadtest import IMAGE
+from posts.models import Group, Post, User
+
+
+class WarmupTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.settings = override_settings(
+            MEDIA_ROOT=cls.media_root,
+            WARMUP_STATS_PATH=os.path.join(cls.media_root, 'stats.sqlite3'),
+            WARMUP_HOST='testserver',
+        )
+        cls.settings.enable()
+        cls.author = User.objects.create_user(username='Abramow_test')
+        cls.group = Group.objects.create(title='Группа', slug='test-slug')
+        cls.post = Post.objects.create(
+            author=cls.author, text='Пост', group=cls.group,
+            image=SimpleUploadedFile('small.gif', IMAGE, 'image/gif'),
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        warmup.flush(force=True)
+        warmup.connect().execute('DELETE FROM feed_hits')
+
+    def test_hot_feeds_from_access_stats(self):
+        for _ in range(3):
+            self.client.get('/group/test-slug/')
+        self.client.get('/profile/Abramow_test/')
+        self.client.get('/group/missing/')
+        self.client.get(f'/posts/{self.post.pk}/')
+        self.client.get('/group/test-slug/', HTTP_X_CACHE_WARMUP='1')
+        warmup.flush(force=True)
+        self.assertEqual(
+            warmup.hot_feeds(10),
+            ['/group/test-slug/', '/profile/Abramow_test/'],
+        )
+
+    def test_paths_by_page(self):
+        self.assertEqual(warmup.warm_paths(['/group/a/'], 2), [
+            '/', '/group/a/', '/?page=2', '/group/a/?page=2',
+        ])
+
+    def test_warm_fills_cache_and_thumbnails(self):
+        results = warmup.warm(WSGIHandler(), ['/', '/group/test-slug/'])
+        self.assertEqual([status for _, status, _ in results], [200, 200])
+        self.assertTrue(os.listdir(os.path.join(self.media_root, 'cache')))
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get('/'), 'Пост')
+
+    def test_budget(self):
+        self.assertEqual(warmup.warm(WSGIHandler(), ['/'], budget=0), [])
+
+    def test_command(self):
+        self.client.get('/profile/Abramow_test/')
+        out = StringIO()
+        # Потоки открыли бы свои соединения мимо транзакции теста.
+        call_command(
+            'warm_cache', '--pages', '1', '--concurrency', '1', stdout=out
+        )
+        self.assertIn('/profile/Abramow_test/', out.getvalue())
+        self.assertIn('Прогрето 2 из 2 страниц', out.getvalue())
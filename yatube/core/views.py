@@ -1,4 +1,13 @@
+import os
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404
 from django.shortcuts import render
+from django.utils._os import safe_join
+
+from . import profiling
 
 
 def page_not_found(request, exception):
@@ -12,4 +21,23 @@ def csrf_failure(request, reason=''):
 
 
 def internal_server_error(request):
-    return render(request, 'core/403.html', status=500)
+    return render(request, 'core/500.html', status=500)
+
+
+@staff_member_required
+def profiles(request):
+    """Список профилей запросов в админке."""
+    return render(request, 'admin/profiles.html', {
+        **admin.site.each_context(request),
+        'title': 'Профили запросов',
+        'profiles': profiling.captured(),
+        'token': profiling.make_token(),
+    })
+
+
+@staff_member_required
+def profile_file(request, view, name):
+    path = safe_join(settings.PROFILING_ROOT, view, name)
+    if not os.path.isfile(path):
+        raise Http404
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
@@ -0,0 +1,191 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS feed_hits ('
+    'path TEXT NOT NULL, hour INTEGER NOT NULL, count INTEGER NOT NULL, '
+    'PRIMARY KEY (path, hour))'
+)
+# Запросы прогрева не считаются посещениями.
+HEADER = 'HTTP_X_CACHE_WARMUP'
+
+_local = threading.local()
+_hits_lock = threading.Lock()
+_pending = {'hits': Counter(), 'flushed': 0.0}
+
+
+def connect():
+    """Файл статистики посещений, общий для всех процессов сайта."""
+    path = settings.WARMUP_STATS_PATH
+    if getattr(_local, 'path', None) != path:
+        connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute(SCHEMA)
+        _local.connection, _local.path = connection, path
+    return _local.connection
+
+
+def current_hour():
+    return int(time.time() // 3600)
+
+
+def touch(path):
+    with _hits_lock:
+        _pending['hits'][path] += 1
+
+
+def flush(force=False):
+    """Переносит посещения процесса в общий файл и удаляет старые часы.
+
+    Не чаще раза в WARMUP_FLUSH_INTERVAL секунд, если не force.
+    """
+    now = time.monotonic()
+    with _hits_lock:
+        if not force and (
+            now - _pending['flushed'] < settings.WARMUP_FLUSH_INTERVAL
+        ):
+            return
+        hits = _pending['hits']
+        _pending.update(hits=Counter(), flushed=now)
+    if not hits:
+        return
+    hour = current_hour()
+    connection = connect()
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        connection.executemany(
+            'INSERT INTO feed_hits (path, hour, count) VALUES (?, ?, ?) '
+            'ON CONFLICT (path, hour) DO UPDATE SET '
+            'count = count + excluded.count',
+            [(path, hour, count) for path, count in hits.items()],
+        )
+        connection.execute(
+            'DELETE FROM feed_hits WHERE hour <= ?',
+            (hour - settings.WARMUP_WINDOW,),
+        )
+        connection.execute('COMMIT')
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+
+
+def hot_feeds(limit):
+    """Самые посещаемые ленты за последние WARMUP_WINDOW часов."""
+    rows = connect().execute(
+        'SELECT path FROM feed_hits WHERE hour > ? '
+        'GROUP BY path ORDER BY SUM(count) DESC, path LIMIT ?',
+        (current_hour() - settings.WARMUP_WINDOW, limit),
+    )
+    return [path for path, in rows]
+
+
+def warm_paths(feeds, pages):
+    """Адреса прогрева: первые страницы всех лент, затем вторые и т. д.
+
+    Если бюджет времени кончится, прогретыми окажутся самые ценные.
+    Главная лента прогревается всегда, даже без статистики.
+    """
+    index = reverse('posts:index')
+    feeds = [index] + [feed for feed in feeds if feed != index]
+    return [
+        feed if page == 1 else f'{feed}?page={page}'
+        for page in range(1, pages + 1)
+        for feed in feeds
+    ]
+
+
+def warm(application, paths, concurrency=1, budget=None):
+    """Рендерит paths через WSGI-приложение, как анонимный посетитель.
+
+    Вместе со страницей заполняются кэши лент и фрагментов, а sorl
+    создаёт миниатюры. Новые адреса не берутся после budget секунд.
+    Возвращает список (адрес, код ответа или 0, секунды).
+    """
+    from .boottime import wsgi_get
+
+    deadline = time.monotonic() + budget if budget is not None else None
+    # Ключи cache_page содержат адрес сайта целиком, вместе с хостом.
+    headers = {HEADER: '1', 'HTTP_HOST': settings.WARMUP_HOST}
+    pending = iter(paths)
+    lock = threading.Lock()
+    results = []
+
+    def worker():
+        while deadline is None or time.monotonic() < deadline:
+            with lock:
+                path = next(pending, None)
+            if path is None:
+                return
+            started = time.monotonic()
+            try:
+                status = wsgi_get(application, path, headers)
+            except Exception:
+                logger.exception('Прогрев %s', path)
+                status = 0
+            results.append((path, status, time.monotonic() - started))
+
+    if concurrency <= 1:
+        worker()
+        return results
+    threads = [
+        threading.Thread(target=worker, daemon=True)
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def warm_hot(application, feeds=None, pages=None, concurrency=None,
+             budget=None):
+    """Прогрев горячих лент с параметрами из настроек WARMUP_*."""
+    paths = warm_paths(
+        hot_feeds(feeds or settings.WARMUP_FEEDS),
+        pages or settings.WARMUP_PAGES,
+    )
+    return warm(
+        application, paths,
+        concurrency or settings.WARMUP_CONCURRENCY,
+        settings.WARMUP_TIME_BUDGET if budget is None else budget,
+    )
+
+
+def warm_on_boot(application):
+    """Хук запуска воркера (yatube/wsgi.py): прогрев в фоновом потоке.
+
+    Воркер сразу принимает запросы; LocMem-кэш у каждого процесса свой,
+    поэтому греет его только сам процесс.
+    """
+    if settings.WARMUP_ON_BOOT:
+        threading.Thread(
+            target=warm_hot, args=(application,), daemon=True
+        ).start()
+    return application
+
+
+class AccessStatsMiddleware:
+    """Считает успешные GET к лентам WARMUP_VIEWS для выбора горячих."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        if (match and match.view_name in settings.WARMUP_VIEWS
+                and request.method == 'GET'
+                and response.status_code == 200
+                and HEADER not in request.META):
+            touch(request.path)
+            flush()
+        return response
@@ -1,9 +1,164 @@
-from django.contrib import admin
+import os
 
-from .models import Comment, Follow, Group, Post
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db.models import Q
+from django.http import FileResponse
+from django.shortcuts import get_object_or_404
+from django.urls import path, reverse
+from django.utils.html import format_html
 
+from core.admin import CursorPaginationMixin
 
-class PostAdmin(admin.ModelAdmin):
+from . import groups, jobs, search, sharding
+from .models import BulkJob, Comment, Follow, Group, Post
+
+
+def freeze_choices(formset, field_name):
+    """Варианты выбора поля для всех строк списка одним запросом.
+
+    Иначе каждая строка list_editable заново выбирает всю таблицу.
+    """
+    # iter(): list() спросил бы у ModelChoiceIterator len() — это COUNT(*).
+    choices = list(iter(formset.form.base_fields[field_name].choices))
+
+    class FrozenChoicesFormSet(formset):
+        def _construct_form(self, i, **kwargs):
+            form = super()._construct_form(i, **kwargs)
+            field = form.fields[field_name]
+            field.choices = choices
+            # Виджет обёрнут в RelatedFieldWidgetWrapper.
+            getattr(field.widget, 'widget', field.widget).choices = choices
+            return form
+
+    return FrozenChoicesFormSet
+
+
+class IndexedSearchMixin:
+    """Поиск по полнотекстовому индексу и точному имени пользователя.
+
+    LIKE '%...%' по текстам не использует индексы и на больших таблицах
+    просматривает их целиком.
+    """
+    text_index = None
+    username_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        by_text = self.text_index.filter(queryset, search_term)
+        if by_text is None:
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        by_username = Q()
+        for field in self.username_fields:
+            by_username |= Q(**{f'{field}__username': search_term})
+        if not by_username:
+            return by_text, False
+        by_username = queryset.filter(by_username)
+        return by_text | by_username, False
+
+
+class ShardListFilter(admin.SimpleListFilter):
+    """Шард постов (posts.sharding), из которого показывается список.
+
+    Список, поиск и массовые операции работают в одной базе: без
+    выбора — в первом шарде. Без шардирования фильтра нет.
+    """
+    title = 'База'
+    parameter_name = 'shard'
+
+    def lookups(self, request, model_admin):
+        return [(alias, alias) for alias in sharding.shards()]
+
+    def selected(self):
+        value = self.value()
+        return value if value in sharding.shards() else sharding.shards()[0]
+
+    def queryset(self, request, queryset):
+        return queryset.using(self.selected())
+
+    def choices(self, changelist):
+        selected = self.selected()
+        for alias, title in self.lookup_choices:
+            yield {
+                'selected': alias == selected,
+                'query_string': changelist.get_query_string(
+                    {self.parameter_name: alias}
+                ),
+                'display': title,
+            }
+
+
+class ShardedAdminMixin:
+    """Объект для формы изменения ищется во всех шардах."""
+
+    def get_object(self, request, object_id, from_field=None):
+        queryset = self.get_queryset(request)
+        field = (
+            queryset.model._meta.pk if from_field is None
+            else queryset.model._meta.get_field(from_field)
+        )
+        try:
+            object_id = field.to_python(object_id)
+        except (ValidationError, ValueError):
+            return None
+        for alias in sharding.aliases():
+            obj = queryset.using(alias).filter(
+                **{field.name: object_id}
+            ).first()
+            if obj is not None:
+                return obj
+        return None
+
+
+class BulkActionForm(ActionForm):
+    group = forms.ModelChoiceField(
+        Group.objects.all(), required=False, label='Сообщество'
+    )
+
+
+class BulkActionsMixin:
+    """Массовые операции фоновыми задачами вместо одного долгого запроса.
+
+    Стандартное удаление выбранных объектов заменено фоновым.
+    """
+    actions = ('bulk_delete', 'bulk_export')
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+    def enqueue(self, request, action, queryset, group=None):
+        job = jobs.enqueue(action, queryset, user=request.user, group=group)
+        self.message_user(request, format_html(
+            'Задача <a href="{}">{}</a> поставлена в очередь, объектов: {}',
+            reverse('admin:posts_bulkjob_change', args=(job.pk,)),
+            job,
+            job.total,
+        ))
+
+    def bulk_delete(self, request, queryset):
+        self.enqueue(request, BulkJob.DELETE, queryset)
+    bulk_delete.short_description = 'Удалить выбранные (в фоне)'
+    bulk_delete.allowed_permissions = ('delete',)
+
+    def bulk_export(self, request, queryset):
+        self.enqueue(request, BulkJob.EXPORT, queryset)
+    bulk_export.short_description = 'Выгрузить выбранные в CSV (в фоне)'
+    bulk_export.allowed_permissions = ('view',)
+
+
+class PostAdmin(
+    BulkActionsMixin, CursorPaginationMixin, IndexedSearchMixin,
+    ShardedAdminMixin, admin.ModelAdmin,
+):
     list_display = (
         'pk',
         'text',
@@ -12,33 +167,144 @@ class PostAdmin(admin.ModelAdmin):
         'group',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    autocomplete_fields = ('author',)
     search_fields = ('text',)
-    list_filter = ('pub_date',)
+    text_index = search.POST_TEXT
+    username_fields = ('author',)
+    list_filter = (ShardListFilter, 'pub_date')
     empty_value_display = '-пусто-'
+    action_form = BulkActionForm
+    actions = ('bulk_reassign_group', *BulkActionsMixin.actions)
+
+    def get_changelist_formset(self, request, **kwargs):
+        formset = super().get_changelist_formset(request, **kwargs)
+        return freeze_choices(formset, 'group')
+
+    def bulk_reassign_group(self, request, queryset):
+        group_id = request.POST.get('group', '')
+        group = Group.objects.filter(pk=group_id).first() if (
+            group_id.isdigit()
+        ) else None
+        if group is None:
+            self.message_user(
+                request, 'Выберите сообщество для переноса.', messages.ERROR
+            )
+            return
+        self.enqueue(request, BulkJob.REASSIGN, queryset, group=group)
+    bulk_reassign_group.short_description = (
+        'Перенести выбранные в сообщество (в фоне)'
+    )
+    bulk_reassign_group.allowed_permissions = ('change',)
+
+
+class GroupChangeList(ChangeList):
+    def get_results(self, request):
+        super().get_results(request)
+        counts = groups.post_counts(self.result_list)
+        for group in self.result_list:
+            group.post_count = counts[group.pk]
 
 
 class GroupAdmin(admin.ModelAdmin):
-    list_display = ('pk', 'title', 'slug', 'description')
+    list_display = ('pk', 'title', 'slug', 'description', 'post_count')
     search_fields = ('title',)
     list_filter = ('slug',)
     empty_value_display = '-пусто-'
 
+    def get_changelist(self, request, **kwargs):
+        return GroupChangeList
 
-class CommentAdmin(admin.ModelAdmin):
+    def post_count(self, obj):
+        """Число постов из кэша счётчиков лент, без COUNT на строку."""
+        return obj.post_count
+    post_count.short_description = 'Постов'
+
+
+class CommentAdmin(
+    BulkActionsMixin, CursorPaginationMixin, IndexedSearchMixin,
+    ShardedAdminMixin, admin.ModelAdmin,
+):
     list_display = ('pk', 'text', 'author', 'created')
-    search_fields = ('text', 'author')
-    list_filter = ('created',)
+    list_select_related = ('author',)
+    autocomplete_fields = ('post', 'author')
+    search_fields = ('text',)
+    text_index = search.COMMENT_TEXT
+    username_fields = ('author',)
+    list_filter = (ShardListFilter, 'created')
     empty_value_display = '-пусто-'
 
 
-class FollowAdmin(admin.ModelAdmin):
+class FollowAdmin(CursorPaginationMixin, admin.ModelAdmin):
     list_display = ('pk', 'user', 'author')
-    search_fields = ('user', 'author')
-    list_filter = ('user',)
+    list_select_related = ('user', 'author')
+    autocomplete_fields = ('user', 'author')
+    # Точное совпадение по уникальному имени идёт по индексу.
+    search_fields = ('user__username__exact', 'author__username__exact')
     empty_value_display = '-пусто-'
 
 
+class BulkJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'action',
+        'content_type',
+        'status',
+        'progress',
+        'created_by',
+        'created',
+        'finished',
+        'download_link',
+    )
+    list_filter = ('status', 'action')
+    list_select_related = ('content_type', 'created_by')
+    exclude = ('object_ids',)
+    readonly_fields = ('progress', 'download_link')
+    empty_value_display = '-пусто-'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def progress(self, obj):
+        percent = obj.processed * 100 // obj.total if obj.total else 100
+        return f'{obj.processed} из {obj.total} ({percent}%)'
+    progress.short_description = 'Прогресс'
+
+    def download_link(self, obj):
+        if not obj.result:
+            return None
+        return format_html(
+            '<a href="{}">Скачать</a>',
+            reverse('admin:posts_bulkjob_download', args=(obj.pk,)),
+        )
+    download_link.short_description = 'Выгрузка'
+
+    def get_urls(self):
+        return [
+            path(
+                '<int:pk>/download/',
+                self.admin_site.admin_view(self.download),
+                name='posts_bulkjob_download',
+            ),
+            *super().get_urls(),
+        ]
+
+    def download(self, request, pk):
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        job = get_object_or_404(BulkJob.objects.exclude(result=''), pk=pk)
+        return FileResponse(
+            jobs.export_storage.open(job.result, 'rb'),
+            as_attachment=True,
+            filename=os.path.basename(job.result),
+        )
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Follow, FollowAdmin)
+admin.site.register(BulkJob, BulkJobAdmin)
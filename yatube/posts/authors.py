@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+
+from .models import User
+from .paginator import feed_version
+
+
+def profile_author_key(username):
+    return f'profile_author:{username}'
+
+
+def get_author_or_404(username):
+    """Автор профиля и версия его ленты.
+
+    Автор хранится в кэше вместе с версией ленты, при которой он был
+    прочитан. Изменение профиля или постов меняет версию, и автор
+    перечитывается из базы — в том числе после смены имени, когда старый
+    ключ по имени уже никто не сбросит.
+    """
+    key = profile_author_key(username)
+    cached = cache.get(key)
+    if cached is not None:
+        author, version = cached
+        if version == feed_version(f'author:{author.pk}'):
+            return author, version
+    author = get_object_or_404(User, username=username)
+    version = feed_version(f'author:{author.pk}')
+    cache.set(key, (author, version), settings.FEED_PAGE_CACHE_TIMEOUT)
+    return author, version
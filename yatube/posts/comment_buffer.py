@@ -0,0 +1,184 @@
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import notifications, sharding, trending
+from .local_queue import LocalQueue
+from .models import Comment, Notification, User
+
+queue = LocalQueue(
+    'comment-buffer',
+    'pending_comment',
+    (
+        'post_id INTEGER NOT NULL',
+        'author_id INTEGER NOT NULL',
+        'text TEXT NOT NULL',
+        'created TEXT NOT NULL',
+    ),
+    'COMMENT_BUFFER_PATH',
+    'COMMENT_BUFFER_FLUSH_INTERVAL',
+    'COMMENT_BUFFER_BATCH_SIZE',
+)
+
+
+def overlay_key(session_key):
+    return f'pending_comments:{session_key}'
+
+
+def enqueue(request, post_id, text):
+    """Кладёт комментарий в локальную очередь вместо INSERT в базу.
+
+    Очередь — отдельный файл SQLite, поэтому запись в неё не ждёт
+    блокировки основной базы. Комментарий также попадает в список
+    ожидающих сессии: автор видит его до записи в базу.
+    """
+    created = timezone.now()
+    pending_id = queue.put(
+        post_id, request.user.pk, text, created.isoformat()
+    )
+    key = overlay_key(request.session.session_key)
+    entries = cache.get(key, [])
+    entries.append({
+        'id': pending_id,
+        'post_id': post_id,
+        'text': text,
+        'created': created,
+    })
+    cache.set(key, entries, settings.COMMENT_BUFFER_OVERLAY_TIMEOUT)
+    queue.start(save)
+    return pending_id
+
+
+def pending_comments(request, post_id):
+    """Ещё не записанные в базу комментарии этой сессии к посту.
+
+    Уже записанные убираются из списка. Результат запоминается
+    на время запроса.
+    """
+    cached = getattr(request, '_pending_comments', None)
+    if cached is not None:
+        return cached
+    comments = []
+    session_key = request.session.session_key
+    entries = cache.get(overlay_key(session_key)) if session_key else None
+    if entries:
+        queued = queue.present([entry['id'] for entry in entries])
+        alive = [entry for entry in entries if entry['id'] in queued]
+        if len(alive) != len(entries):
+            cache.set(
+                overlay_key(session_key), alive,
+                settings.COMMENT_BUFFER_OVERLAY_TIMEOUT,
+            )
+        for entry in reversed(alive):
+            if entry['post_id'] != post_id:
+                continue
+            comment = Comment(
+                post_id=post_id,
+                author=request.user,
+                text=entry['text'],
+                created=entry['created'],
+            )
+            comment.pending_id = entry['id']
+            comments.append(comment)
+    request._pending_comments = comments
+    return comments
+
+
+def flush(limit=None):
+    """Переносит пачку комментариев из очереди в базу."""
+    return queue.flush(save, limit)
+
+
+def insert_comments(alias, comments):
+    """bulk_create, сохраняющий created — время отправки из очереди.
+
+    auto_now_add заменяет created временем записи пачки, поэтому после
+    вставки оно возвращается одним update на пачку.
+    """
+    created = [comment.created for comment in comments]
+    rows = Comment.objects.using(alias)
+    rows.bulk_create(comments)
+    if comments[0].pk is None:
+        # SQLite не возвращает id из bulk_create. Транзакция держит
+        # блокировку записи с первой вставки, поэтому строки пачки —
+        # последние по id и идут в порядке вставки.
+        pks = rows.order_by('-pk').values_list('pk', flat=True)
+        for comment, pk in zip(comments, reversed(list(pks[:len(comments)]))):
+            comment.pk = pk
+    # Три параметра на строку: pk в WHEN, время и pk в IN.
+    size = connections[alias].ops.bulk_batch_size(
+        ['pk', 'created', 'pk'], comments
+    ) or len(comments)
+    for start in range(0, len(comments), size):
+        batch = list(zip(comments, created))[start:start + size]
+        rows.filter(pk__in=[comment.pk for comment, _ in batch]).update(
+            created=Case(
+                *(When(pk=comment.pk, then=Value(time))
+                  for comment, time in batch),
+                output_field=DateTimeField(),
+            )
+        )
+    for comment, time in zip(comments, created):
+        comment.created = time
+
+
+def save(rows):
+    author_ids = {row[2] for row in rows}
+    # Пост или автор могли быть удалены, пока комментарий ждал в очереди.
+    post_authors = dict(
+        sharding.post_rows({row[1] for row in rows}, 'pk', 'author_id')
+    )
+    author_ids &= set(
+        User.objects.filter(pk__in=author_ids).values_list('pk', flat=True)
+    )
+    per_post = defaultdict(list)
+    comments = []
+    for _, post_id, author_id, text, created in rows:
+        if post_id in post_authors and author_id in author_ids:
+            created = parse_datetime(created)
+            comments.append(Comment(
+                post_id=post_id, author_id=author_id, text=text,
+                created=created,
+            ))
+            per_post[post_id].append(created)
+    per_shard = defaultdict(list)
+    for comment in comments:
+        per_shard[sharding.shard_for_post(comment.post_id)].append(comment)
+    # Ошибка записи в любом шарде откатывает пачку во всех: очередь
+    # повторит её по строке, не задваивая уже записанное.
+    with ExitStack() as stack:
+        for alias in per_shard:
+            stack.enter_context(transaction.atomic(using=alias))
+        for alias, shard_comments in per_shard.items():
+            # bulk_create не шлёт pre_save: авторов копирует сам.
+            if alias in sharding.shards():
+                sharding.ensure_replicas(
+                    alias, User,
+                    {comment.author_id for comment in shard_comments},
+                )
+            insert_comments(alias, shard_comments)
+            # bulk_create не шлёт post_save: рейтинг поднимается одним
+            # событием на пост с суммарным весом.
+            for post_id in {comment.post_id for comment in shard_comments}:
+                times = per_post[post_id]
+                trending.bump(
+                    post_id,
+                    settings.TRENDING_COMMENT_WEIGHT * len(times),
+                    max(times),
+                )
+    # Уведомления — после коммита, чтобы откат не оставил лишних.
+    for comment in comments:
+        notifications.notify(
+            post_authors[comment.post_id], Notification.COMMENT,
+            comment.author_id, comment.post_id, comment.created,
+        )
+
+
+def drain():
+    return queue.drain(save)
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Follow
+from .paginator import feed_count_key, keyset_page
+
+FOLLOWERS = 'followers'
+FOLLOWING = 'following'
+
+# Список -> (поле автора списка, поле показываемого пользователя).
+LISTS = {
+    FOLLOWERS: ('author', 'user'),
+    FOLLOWING: ('user', 'author'),
+}
+
+
+def follow_count(kind, user_id):
+    """Число подписчиков или подписок из кэша.
+
+    Счётчик сбрасывает сигнал при создании и удалении подписки.
+    """
+    key = feed_count_key(f'{kind}:{user_id}')
+    count = cache.get(key)
+    if count is None:
+        owner, _ = LISTS[kind]
+        count = Follow.objects.filter(**{owner: user_id}).count()
+        cache.set(key, count, settings.FEED_COUNT_TIMEOUT)
+    return count
+
+
+def follow_page(kind, user_id, cursor=None, per_page=None):
+    """Страница списка подписок по индексу (владелец, id).
+
+    Запрос один, пользователи списка берутся через JOIN.
+    """
+    owner, shown = LISTS[kind]
+    rows, next_cursor = keyset_page(
+        Follow.objects.filter(**{owner: user_id}).select_related(shown),
+        cursor,
+        per_page or settings.FOLLOW_LIST_PER_PAGE,
+    )
+    return [getattr(row, shown) for row in rows], next_cursor
@@ -0,0 +1,83 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.http import Http404
+
+from . import sharding
+from .models import Group, Post
+from .paginator import feed_count_key
+
+GROUPS_VERSION_KEY = 'groups_version'
+
+# Таблица сообществ в памяти процесса и версия, с которой она прочитана.
+_groups = {'version': None, 'by_slug': {}}
+
+
+def groups_version():
+    version = cache.get(GROUPS_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(GROUPS_VERSION_KEY, version, None):
+            version = cache.get(GROUPS_VERSION_KEY, version)
+    return version
+
+
+def get_groups():
+    """Все сообщества по slug.
+
+    Таблица читается заново, только если версия в общем кэше сменилась,
+    то есть сообщества кто-то изменил, в том числе в другом процессе.
+    """
+    version = groups_version()
+    if _groups['version'] != version:
+        by_slug = {group.slug: group for group in Group.objects.all()}
+        _groups.update(version=version, by_slug=by_slug)
+    return _groups['by_slug']
+
+
+def get_group_or_404(slug):
+    group = get_groups().get(slug)
+    if group is None:
+        raise Http404('Сообщество не найдено')
+    return group
+
+
+def invalidate_groups():
+    _groups['version'] = None
+    cache.delete(GROUPS_VERSION_KEY)
+
+
+def on_group_change():
+    # Второй сброс после коммита: иначе параллельный запрос мог бы
+    # успеть перечитать таблицу до коммита и закэшировать старые данные.
+    invalidate_groups()
+    transaction.on_commit(invalidate_groups)
+
+
+def post_counts(groups):
+    """Число постов в сообществах из кэша счётчиков лент.
+
+    Промахи досчитываются одним запросом на все сообщества сразу.
+    """
+    keys = {feed_count_key(f'group:{group.pk}'): group.pk for group in groups}
+    cached = cache.get_many(keys)
+    counts = {keys[key]: count for key, count in cached.items()}
+    missing = [pk for pk in keys.values() if pk not in counts]
+    if missing:
+        found = dict.fromkeys(missing, 0)
+        for rows in sharding.each(
+            Post.objects.filter(group__in=missing)
+            .values_list('group').annotate(count=Count('pk'))
+            .order_by()
+        ):
+            for pk, count in rows:
+                found[pk] += count
+        cache.set_many({
+            feed_count_key(f'group:{pk}'): count
+            for pk, count in found.items()
+        }, settings.FEED_COUNT_TIMEOUT)
+        counts.update(found)
+    return counts
@@ -0,0 +1,176 @@
+import csv
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import FileSystemStorage
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import BulkJob, Comment, Post
+from .paginator import deferred_invalidation, invalidate_feeds
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = {
+    Post: ('pk', 'author__username', 'group__slug', 'pub_date', 'text'),
+    Comment: ('pk', 'post_id', 'author__username', 'created', 'text'),
+}
+
+
+class ExportStorage(FileSystemStorage):
+    """Закрытое хранилище выгрузок: файлы отдаются только через админку."""
+
+    @cached_property
+    def base_location(self):
+        return self._value_or_setting(
+            self._location, settings.BULK_EXPORT_ROOT
+        )
+
+
+export_storage = ExportStorage()
+
+
+def enqueue(action, queryset, user=None, group=None):
+    """Ставит в очередь операцию над объектами queryset."""
+    job = BulkJob(
+        action=action,
+        content_type=ContentType.objects.get_for_model(queryset.model),
+        database=queryset.db,
+        group=group,
+        created_by=user,
+    )
+    job.set_ids(list(queryset.order_by('pk').values_list('pk', flat=True)))
+    job.save()
+    if settings.BULK_JOBS_THREAD:
+        transaction.on_commit(lambda: start(job.pk))
+    return job
+
+
+def start(pk):
+    """Выполняет задачу в фоновом потоке веб-процесса."""
+    thread = threading.Thread(
+        target=run_in_thread, args=(pk,), name=f'bulk-job-{pk}', daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def run_in_thread(pk):
+    try:
+        run(pk)
+    finally:
+        # У потока своё соединение с базой, его нужно закрыть.
+        close_old_connections()
+
+
+def chunks(ids, size):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def objects(job, model, pks):
+    """Объекты задачи в её базе: шарде постов или default."""
+    return model.objects.using(job.database).filter(pk__in=pks)
+
+
+def reassign(job, model, pks):
+    posts = objects(job, model, pks)
+    # update() не шлёт сигналов и не трогает auto_now: ленты и время
+    # изменения обновляются здесь.
+    rows = set(posts.values_list('group_id', 'author_id').distinct())
+    group_ids = {group_id for group_id, _ in rows} | {job.group_id}
+    # Профиль автора показывает сообщество поста: его лента тоже меняется.
+    author_ids = {author_id for _, author_id in rows}
+    posts.update(group=job.group, updated_at=timezone.now())
+    invalidate_feeds(
+        *(f'group:{pk}' for pk in group_ids if pk),
+        *(f'author:{pk}' for pk in author_ids),
+    )
+
+
+def delete(job, model, pks):
+    objects(job, model, pks).delete()
+
+
+def process(job, handler):
+    """Изменяет данные пачками, каждая пачка — отдельная транзакция."""
+    model = job.content_type.model_class()
+    # Уже обработанные пачки пропускаются: задачу можно перезапустить.
+    ids = job.get_ids()[job.processed:]
+    for pks in chunks(ids, settings.BULK_JOB_CHUNK_SIZE):
+        # Задача и её объекты могут лежать в разных базах.
+        with transaction.atomic(), transaction.atomic(using=job.database):
+            handler(job, model, pks)
+            BulkJob.objects.filter(pk=job.pk).update(
+                processed=F('processed') + len(pks)
+            )
+
+
+def export(job):
+    """Выгрузка в CSV; имя файла сохраняется в задаче после записи."""
+    model = job.content_type.model_class()
+    columns = EXPORT_COLUMNS[model]
+    name = export_storage.get_available_name(
+        f'{model._meta.model_name}-{job.pk}.csv'
+    )
+    path = export_storage.path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(columns)
+        for pks in chunks(job.get_ids(), settings.BULK_JOB_CHUNK_SIZE):
+            rows = objects(job, model, pks).order_by('pk')
+            writer.writerows(rows.values_list(*columns))
+            BulkJob.objects.filter(pk=job.pk).update(
+                processed=F('processed') + len(pks)
+            )
+    BulkJob.objects.filter(pk=job.pk).update(result=name)
+
+
+HANDLERS = {
+    BulkJob.REASSIGN: lambda job: process(job, reassign),
+    BulkJob.DELETE: lambda job: process(job, delete),
+    BulkJob.EXPORT: export,
+}
+
+
+def claim(pk):
+    """Переводит задачу в работу; False, если её уже взял другой воркер."""
+    return bool(BulkJob.objects.filter(
+        pk=pk, status=BulkJob.PENDING
+    ).update(status=BulkJob.RUNNING))
+
+
+def run(pk):
+    if not claim(pk):
+        return None
+    job = BulkJob.objects.select_related('content_type', 'group').get(pk=pk)
+    status, error = BulkJob.DONE, ''
+    try:
+        # Счётчики лент сбрасываются один раз, в том числе после ошибки:
+        # уже закоммиченные пачки остаются в базе.
+        with deferred_invalidation():
+            HANDLERS[job.action](job)
+    except Exception as exc:
+        logger.exception('Массовая операция %s завершилась ошибкой', pk)
+        status, error = BulkJob.FAILED, str(exc)
+    BulkJob.objects.filter(pk=pk).update(
+        status=status, error=error, finished=timezone.now()
+    )
+    job.refresh_from_db()
+    return job
+
+
+def run_pending():
+    """Выполняет задачи из очереди по порядку, возвращает их число."""
+    done = 0
+    pending = BulkJob.objects.filter(status=BulkJob.PENDING).order_by('pk')
+    for pk in pending.values_list('pk', flat=True):
+        if run(pk) is not None:
+            done += 1
+    return done
@@ -0,0 +1,167 @@
+import logging
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class LocalQueue:
+    """Очередь в локальном файле SQLite для отложенной записи в базу.
+
+    Файл отдельный от основной базы: запись в очередь не ждёт её
+    блокировок. Пачки забирает фоновый поток процесса или команда
+    manage.py. Доставка «хотя бы раз»: если процесс упадёт между
+    коммитом в базу и удалением из очереди, пачка будет записана повторно.
+
+    Если пачка не записывается из-за данных (IntegrityError, DataError),
+    строки повторяются по одной, а не записавшиеся переносятся в таблицу
+    {table}_failed с текстом ошибки: одна плохая строка не держит всю
+    очередь. Прочие ошибки (база недоступна) оставляют пачку в очереди.
+    """
+    data_errors = (IntegrityError, DataError)
+
+    def __init__(self, name, table, columns, path_setting,
+                 interval_setting, batch_setting):
+        self.name = name
+        self.table = table
+        self.columns = [column.split()[0] for column in columns]
+        self.failed_table = f'{table}_failed'
+        self.schema = (
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            + ', '.join(columns) + ')'
+        )
+        self.failed_schema = (
+            f'CREATE TABLE IF NOT EXISTS {self.failed_table} ('
+            'id INTEGER PRIMARY KEY, '
+            + ', '.join(columns) + ', error TEXT NOT NULL)'
+        )
+        self.path_setting = path_setting
+        self.interval_setting = interval_setting
+        self.batch_setting = batch_setting
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def connect(self):
+        """Соединение с очередью, своё у каждого потока."""
+        path = getattr(settings, self.path_setting)
+        if getattr(self._local, 'path', None) != path:
+            connection = sqlite3.connect(
+                path, timeout=30, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=FULL')
+            connection.execute(self.schema)
+            connection.execute(self.failed_schema)
+            self._local.connection, self._local.path = connection, path
+        return self._local.connection
+
+    def put(self, *values):
+        placeholders = ', '.join('?' * len(values))
+        cursor = self.connect().execute(
+            f'INSERT INTO {self.table} ({", ".join(self.columns)}) '
+            f'VALUES ({placeholders})',
+            values,
+        )
+        return cursor.lastrowid
+
+    def present(self, ids):
+        """Какие из id ещё ждут в очереди."""
+        if not ids:
+            return set()
+        placeholders = ', '.join('?' * len(ids))
+        rows = self.connect().execute(
+            f'SELECT id FROM {self.table} WHERE id IN ({placeholders})',
+            list(ids),
+        )
+        return {pk for pk, in rows}
+
+    def clear(self):
+        self.connect().execute(f'DELETE FROM {self.table}')
+        self.connect().execute(f'DELETE FROM {self.failed_table}')
+
+    def failed(self):
+        """Строки, которые не удалось записать, с текстом ошибки."""
+        return self.connect().execute(
+            f'SELECT * FROM {self.failed_table} ORDER BY id'
+        ).fetchall()
+
+    def save_each(self, save, rows):
+        """Повтор пачки по строке; не записавшиеся — в {table}_failed."""
+        queue = self.connect()
+        for row in rows:
+            try:
+                save([row])
+            except self.data_errors as exc:
+                logger.exception(
+                    'Строка %s очереди %s не записана', row[0], self.name
+                )
+                placeholders = ', '.join('?' * (len(row) + 1))
+                queue.execute(
+                    f'INSERT OR REPLACE INTO {self.failed_table} '
+                    f'VALUES ({placeholders})',
+                    (*row, str(exc)),
+                )
+
+    def flush(self, save, limit=None):
+        """Передаёт пачку строк в save и удаляет их из очереди.
+
+        Очередь заблокирована на запись, пока работает save: пачку
+        не заберёт другой процесс.
+        """
+        queue = self.connect()
+        queue.execute('BEGIN IMMEDIATE')
+        try:
+            rows = queue.execute(
+                f'SELECT id, {", ".join(self.columns)} FROM {self.table} '
+                'ORDER BY id LIMIT ?',
+                (limit or getattr(settings, self.batch_setting),),
+            ).fetchall()
+            if rows:
+                try:
+                    save(rows)
+                except self.data_errors:
+                    self.save_each(save, rows)
+                queue.execute(
+                    f'DELETE FROM {self.table} WHERE id <= ?', (rows[-1][0],)
+                )
+            queue.execute('COMMIT')
+        except BaseException:
+            queue.execute('ROLLBACK')
+            raise
+        return len(rows)
+
+    def drain(self, save):
+        total = 0
+        while True:
+            done = self.flush(save)
+            if not done:
+                return total
+            total += done
+
+    def run(self, save):
+        while True:
+            time.sleep(getattr(settings, self.interval_setting))
+            try:
+                self.drain(save)
+            except Exception:
+                logger.exception('Не удалось разобрать очередь %s', self.name)
+            finally:
+                close_old_connections()
+
+    def start(self, save):
+        """Запускает фоновый поток записи, один на процесс."""
+        if not getattr(settings, self.interval_setting):
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self.run, args=(save,), name=self.name,
+                    daemon=True,
+                )
+                self._thread.start()
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import recommendations
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рекомендации «кого почитать» по графу подписок.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--count', type=int, default=settings.RECOMMENDATIONS_COUNT,
+            help='Сколько авторов хранить для каждого пользователя.',
+        )
+
+    def handle(self, *args, **options):
+        if recommendations.is_process_local():
+            self.stderr.write(
+                f'Кэш {settings.RECOMMENDATIONS_CACHE} — LocMem, он свой '
+                'у каждого процесса: веб-воркеры не увидят рекомендации. '
+                'Укажите в RECOMMENDATIONS_CACHE общий кэш.'
+            )
+        users = recommendations.compute(options['count'])
+        self.stdout.write(f'Рекомендации посчитаны для {users} пользователей')
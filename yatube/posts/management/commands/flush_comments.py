@@ -0,0 +1,25 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import comment_buffer
+
+
+class Command(BaseCommand):
+    help = 'Записывает в базу комментарии из очереди отложенной записи.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, разбирать очередь постоянно.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            done = comment_buffer.drain()
+            if done:
+                self.stdout.write(f'Записано комментариев: {done}')
+            if not options['loop']:
+                return
+            time.sleep(settings.COMMENT_BUFFER_FLUSH_INTERVAL or 1)
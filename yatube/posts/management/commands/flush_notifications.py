@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import notifications
+
+
+class Command(BaseCommand):
+    help = (
+        'Записывает уведомления из очереди и удаляет уведомления '
+        'старше NOTIFICATIONS_TTL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, разбирать очередь постоянно.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            done = notifications.drain()
+            if done:
+                self.stdout.write(f'Записано событий: {done}')
+            pruned = notifications.prune()
+            if pruned:
+                self.stdout.write(f'Удалено старых уведомлений: {pruned}')
+            if not options['loop']:
+                return
+            time.sleep(settings.NOTIFICATIONS_FLUSH_INTERVAL or 1)
@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from posts import jobs
+
+
+class Command(BaseCommand):
+    help = 'Воркер массовых операций админки: выполняет задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить задачи из очереди и завершиться.',
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            default=settings.BULK_JOBS_POLL_INTERVAL,
+            help='Пауза между проверками очереди, секунд.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            done = jobs.run_pending()
+            if done:
+                self.stdout.write(f'Выполнено задач: {done}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
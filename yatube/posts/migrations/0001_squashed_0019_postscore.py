@@ -0,0 +1,89 @@
+# Generated by Django 2.2.16 on 2026-10-19 07:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    replaces = [('posts', '0001_initial'), ('posts', '0002_auto_20220914_1455'), ('posts', '0003_auto_20220916_0028'), ('posts', '0004_auto_20221008_2331'), ('posts', '0005_auto_20221009_0033'), ('posts', '0006_auto_20221009_0035'), ('posts', '0007_auto_20221009_0038'), ('posts', '0008_auto_20221009_0040'), ('posts', '0009_auto_20221009_0042'), ('posts', '0010_auto_20221009_0046'), ('posts', '0011_auto_20221009_0148'), ('posts', '0012_auto_20221009_1848'), ('posts', '0013_auto_20221010_2022'), ('posts', '0014_auto_20221010_2228'), ('posts', '0015_auto_20221011_1112'), ('posts', '0016_post_image'), ('posts', '0017_comment'), ('posts', '0018_follow'), ('posts', '0019_postscore')]
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Group',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='Название сообщества')),
+                ('slug', models.SlugField(unique=True, verbose_name='Обозначение сообщества')),
+                ('description', models.TextField(verbose_name='описание')),
+            ],
+            options={
+                'ordering': ('title',),
+                'verbose_name': 'Сообщество',
+                'verbose_name_plural': 'Сообщества',
+            },
+        ),
+        migrations.CreateModel(
+            name='Post',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(verbose_name='Текст')),
+                ('pub_date', models.DateTimeField(auto_now_add=True, verbose_name='Дата публикации')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='posts', to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='posts.Group', verbose_name='Сообщество')),
+                ('image', models.ImageField(blank=True, upload_to='posts/', verbose_name='Картинка')),
+            ],
+            options={
+                'ordering': ('-pub_date',),
+                'verbose_name': 'Запись',
+                'verbose_name_plural': 'Записи',
+            },
+        ),
+        migrations.CreateModel(
+            name='Comment',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(help_text='Введите текст комментария', verbose_name='Текст комментария')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата публикации комментария')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='posts.Post', verbose_name='Пост')),
+            ],
+            options={
+                'verbose_name': 'Комментарий',
+                'verbose_name_plural': 'Комментарии',
+                'ordering': ['-created'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following', to=settings.AUTH_USER_MODEL, verbose_name='Автор')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follower', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Подписка',
+                'verbose_name_plural': 'Подписки',
+                'unique_together': {('user', 'author')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PostScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score', serialize=False, to='posts.Post', verbose_name='Пост')),
+                ('score', models.FloatField(db_index=True, verbose_name='Рейтинг')),
+            ],
+            options={
+                'verbose_name': 'Рейтинг поста',
+                'verbose_name_plural': 'Рейтинги постов',
+                'ordering': ('-score',),
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-19 09:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0024_shard_sequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkjob',
+            name='database',
+            field=models.CharField(default='default', max_length=100, verbose_name='База'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
 User = get_user_model()
@@ -53,6 +54,10 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+    )
 
     class Meta:
         verbose_name = 'Запись'
@@ -62,6 +67,15 @@ class Post(models.Model):
     def __str__(self) -> str:
         return self.text[:20]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Группа на момент загрузки: при смене группы сбрасываются обе ленты.
+        instance._loaded_group_id = dict(zip(field_names, values)).get(
+            'group_id'
+        )
+        return instance
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -87,6 +101,12 @@ class Comment(models.Model):
         ordering = ['-created']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        # Время последнего комментария поста читается только из индекса.
+        indexes = [
+            models.Index(
+                fields=['post', 'created'], name='posts_comment_post_created'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:15]
@@ -110,3 +130,182 @@ class Follow(models.Model):
         verbose_name = 'Подписка'
         verbose_name_plural = 'Подписки'
         unique_together = ['user', 'author']
+        indexes = [
+            models.Index(
+                fields=['author', 'id'], name='posts_follow_author_id'
+            ),
+            models.Index(fields=['user', 'id'], name='posts_follow_user_id'),
+        ]
+
+
+class PostScore(models.Model):
+    """Рейтинг поста для ленты популярного.
+
+    Хранится в логарифмической шкале: log2 суммы весов событий,
+    каждый из которых умножен на 2 ** (время события / период полураспада).
+    Так старые события «затухают» без пересчёта всей таблицы.
+    """
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='score',
+        verbose_name='Пост',
+    )
+    score = models.FloatField('Рейтинг', db_index=True)
+
+    class Meta:
+        verbose_name = 'Рейтинг поста'
+        verbose_name_plural = 'Рейтинги постов'
+        ordering = ('-score',)
+
+    def __str__(self):
+        return f'{self.post_id}: {self.score:.2f}'
+
+
+class BulkJob(models.Model):
+    """Массовая операция админки, которую выполняет фоновый воркер.
+
+    Объекты обрабатываются пачками, каждая в своей транзакции;
+    processed увеличивается в той же транзакции, что и изменение данных.
+    """
+    REASSIGN = 'reassign'
+    DELETE = 'delete'
+    EXPORT = 'export'
+    ACTION_CHOICES = (
+        (REASSIGN, 'Перенос в сообщество'),
+        (DELETE, 'Удаление'),
+        (EXPORT, 'Выгрузка в CSV'),
+    )
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Готово'),
+        (FAILED, 'Ошибка'),
+    )
+
+    action = models.CharField(
+        'Операция', max_length=20, choices=ACTION_CHOICES
+    )
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name='Тип объектов',
+    )
+    object_ids = models.TextField('Объекты')
+    # При шардировании (posts.sharding) объекты лежат в одной базе:
+    # id комментариев в разных шардах повторяются.
+    database = models.CharField('База', max_length=100, default='default')
+    group = models.ForeignKey(
+        Group,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        verbose_name='Сообщество',
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        db_index=True,
+    )
+    total = models.PositiveIntegerField('Всего', default=0)
+    processed = models.PositiveIntegerField('Обработано', default=0)
+    result = models.CharField('Файл выгрузки', max_length=255, blank=True)
+    error = models.TextField('Ошибка', blank=True)
+    created_by = models.ForeignKey(
+        User,
+        blank=True,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        verbose_name='Автор',
+    )
+    created = models.DateTimeField('Создана', auto_now_add=True)
+    finished = models.DateTimeField('Завершена', blank=True, null=True)
+
+    class Meta:
+        verbose_name = 'Массовая операция'
+        verbose_name_plural = 'Массовые операции'
+        ordering = ('-pk',)
+
+    def __str__(self):
+        return f'{self.get_action_display()} №{self.pk}'
+
+    def get_ids(self):
+        return [int(pk) for pk in self.object_ids.split(',') if pk]
+
+    def set_ids(self, ids):
+        self.object_ids = ','.join(map(str, ids))
+        self.total = len(ids)
+
+
+class Notification(models.Model):
+    """Уведомление автора о комментариях к посту или новых подписчиках.
+
+    Однотипные непрочитанные события склеиваются в одну строку с числом
+    событий и последним их участником.
+    """
+    COMMENT = 'comment'
+    FOLLOW = 'follow'
+    KIND_CHOICES = (
+        (COMMENT, 'Комментарии к посту'),
+        (FOLLOW, 'Новые подписчики'),
+    )
+
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='Получатель',
+    )
+    kind = models.CharField('Тип', max_length=20, choices=KIND_CHOICES)
+    # Без ограничения в базе: при шардировании (posts.sharding) пост
+    # лежит в шарде автора, а уведомление — в default.
+    post = models.ForeignKey(
+        Post,
+        blank=True,
+        null=True,
+        on_delete=models.CASCADE,
+        db_constraint=False,
+        related_name='+',
+        verbose_name='Пост',
+    )
+    actor = models.ForeignKey(
+        User,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        verbose_name='Последний участник',
+    )
+    count = models.PositiveIntegerField('Событий', default=1)
+    is_read = models.BooleanField('Прочитано', default=False)
+    created = models.DateTimeField('Последнее событие', db_index=True)
+
+    class Meta:
+        verbose_name = 'Уведомление'
+        verbose_name_plural = 'Уведомления'
+        indexes = [
+            models.Index(
+                fields=['recipient', 'id'],
+                name='posts_notification_inbox',
+            ),
+        ]
+
+
+class ShardSequence(models.Model):
+    """Счётчик id постов в базе-шарде (posts.sharding).
+
+    Одна строка на базу: id поста из него несёт номер шарда.
+    """
+    value = models.BigIntegerField('Значение', default=0)
+
+    class Meta:
+        verbose_name = 'Счётчик id постов'
+        verbose_name_plural = 'Счётчики id постов'
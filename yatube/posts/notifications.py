@@ -0,0 +1,175 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import sharding
+from .local_queue import LocalQueue
+from .models import Notification, User
+from .paginator import keyset_page
+
+queue = LocalQueue(
+    'notifications',
+    'notification_event',
+    (
+        'recipient_id INTEGER NOT NULL',
+        'kind TEXT NOT NULL',
+        'post_id INTEGER',
+        'actor_id INTEGER NOT NULL',
+        'created TEXT NOT NULL',
+    ),
+    'NOTIFICATIONS_QUEUE_PATH',
+    'NOTIFICATIONS_FLUSH_INTERVAL',
+    'NOTIFICATIONS_BATCH_SIZE',
+)
+
+
+def unread_key(user_id):
+    return f'notifications_unread:{user_id}'
+
+
+def notify(recipient_id, kind, actor_id, post_id=None, when=None):
+    """Кладёт событие в очередь: строку в базе запишет фоновый поток."""
+    if recipient_id == actor_id:
+        return
+    when = when or timezone.now()
+    queue.put(recipient_id, kind, post_id, actor_id, when.isoformat())
+    queue.start(save)
+
+
+def save(rows):
+    """Записывает пачку событий, склеивая их с непрочитанными.
+
+    Склеенная строка удаляется и вставляется заново с суммой событий:
+    новый id поднимает её в начало списка уведомлений.
+    """
+    events = {}
+    for _, recipient_id, kind, post_id, actor_id, created in rows:
+        key = (recipient_id, kind, post_id)
+        count = events[key][0] if key in events else 0
+        events[key] = (count + 1, actor_id, parse_datetime(created))
+    users = set(
+        User.objects.filter(
+            pk__in={key[0] for key in events}
+            | {event[1] for event in events.values()}
+        ).values_list('pk', flat=True)
+    )
+    posts = {
+        pk for pk, in sharding.post_rows(
+            {key[2] for key in events if key[2]}, 'pk'
+        )
+    }
+    # Получатель или пост могли быть удалены, пока событие ждало в очереди.
+    events = {
+        key: event for key, event in events.items()
+        if key[0] in users and (key[2] is None or key[2] in posts)
+    }
+    delta = defaultdict(int)
+    with transaction.atomic():
+        existing = Notification.objects.filter(
+            recipient_id__in={key[0] for key in events},
+            kind__in={key[1] for key in events},
+            is_read=False,
+        ).values_list('pk', 'recipient_id', 'kind', 'post_id', 'count')
+        merged = []
+        for pk, recipient_id, kind, post_id, count in existing:
+            key = (recipient_id, kind, post_id)
+            if key in events:
+                merged.append(pk)
+                delta[recipient_id] -= 1
+                total, actor_id, created = events[key]
+                events[key] = (total + count, actor_id, created)
+        Notification.objects.filter(pk__in=merged).delete()
+        Notification.objects.bulk_create(
+            Notification(
+                recipient_id=recipient_id,
+                kind=kind,
+                post_id=post_id,
+                actor_id=actor_id if actor_id in users else None,
+                count=count,
+                created=created,
+            )
+            for (recipient_id, kind, post_id), (count, actor_id, created)
+            in sorted(events.items(), key=lambda item: item[1][2])
+        )
+    for recipient_id, _, _ in events:
+        delta[recipient_id] += 1
+    for recipient_id, change in delta.items():
+        adjust_unread(recipient_id, change)
+
+
+def adjust_unread(user_id, change):
+    if not change:
+        return
+    try:
+        if change > 0:
+            cache.incr(unread_key(user_id), change)
+        else:
+            cache.decr(unread_key(user_id), -change)
+    except ValueError:
+        # Счётчика в кэше нет: его посчитает следующий unread_count.
+        pass
+
+
+def unread_count(user_id):
+    """Число непрочитанных уведомлений из счётчика в кэше.
+
+    COUNT выполняется только при промахе кэша; дальше счётчик меняет
+    запись уведомлений.
+    """
+    key = unread_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(
+            recipient_id=user_id, is_read=False
+        ).count()
+        cache.set(key, count, settings.NOTIFICATIONS_COUNT_TIMEOUT)
+    return count
+
+
+def mark_read(user_id):
+    Notification.objects.filter(
+        recipient_id=user_id, is_read=False
+    ).update(is_read=True)
+    cache.set(unread_key(user_id), 0, settings.NOTIFICATIONS_COUNT_TIMEOUT)
+
+
+def inbox_page(user_id, cursor=None):
+    if not sharding.shards():
+        return keyset_page(
+            Notification.objects.filter(recipient_id=user_id)
+            .select_related('actor', 'post'),
+            cursor,
+            settings.NOTIFICATIONS_PER_PAGE,
+        )
+    # Посты лежат в шардах: JOIN с ними из default невозможен.
+    items, next_cursor = keyset_page(
+        Notification.objects.filter(recipient_id=user_id)
+        .select_related('actor'),
+        cursor,
+        settings.NOTIFICATIONS_PER_PAGE,
+    )
+    sharding.attach_posts(items)
+    return items, next_cursor
+
+
+def prune():
+    """Удаляет уведомления старше NOTIFICATIONS_TTL секунд."""
+    old = Notification.objects.filter(
+        created__lt=timezone.now()
+        - timedelta(seconds=settings.NOTIFICATIONS_TTL)
+    )
+    recipients = set(
+        old.filter(is_read=False).values_list('recipient_id', flat=True)
+    )
+    deleted, _ = old.delete()
+    cache.delete_many([unread_key(pk) for pk in recipients])
+    return deleted
+
+
+def drain():
+    return queue.drain(save)
@@ -0,0 +1,124 @@
+import threading
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+def feed_count_key(feed):
+    return f'feed_count:{feed}'
+
+
+def feed_version_key(feed):
+    return f'feed_version:{feed}'
+
+
+def feed_version(feed):
+    """Версия ленты для ключей кэша её страниц.
+
+    Сброс ленты удаляет версию, и следующий запрос получает новую,
+    случайную: страницы старой версии больше никогда не читаются.
+    """
+    key = feed_version_key(feed)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+_deferred = threading.local()
+
+
+def invalidate_feeds(*feeds):
+    """Сбрасывает счётчики и версии лент одним обращением к кэшу."""
+    pending = getattr(_deferred, 'feeds', None)
+    if pending is not None:
+        pending.update(feeds)
+        return
+    cache.delete_many([
+        key
+        for feed in feeds
+        for key in (feed_count_key(feed), feed_version_key(feed))
+    ])
+
+
+@contextmanager
+def deferred_invalidation():
+    """Копит сброс лент и выполняет его один раз на выходе.
+
+    Массовые операции иначе сбрасывали бы кэш на каждой строке.
+    """
+    if getattr(_deferred, 'feeds', None) is not None:
+        yield
+        return
+    _deferred.feeds = set()
+    try:
+        yield
+    finally:
+        feeds, _deferred.feeds = _deferred.feeds, None
+        if feeds:
+            invalidate_feeds(*feeds)
+
+
+def parse_cursor(value):
+    return int(value) if value and value.isdigit() else None
+
+
+def keyset_page(queryset, cursor, per_page):
+    """Страница по ключу вместо номера: строки с id меньше cursor.
+
+    Цена запроса не зависит от того, насколько далеко листают список.
+    Возвращает строки и ключ следующей страницы (None на последней).
+    """
+    if cursor is not None:
+        queryset = queryset.filter(pk__lt=cursor)
+    rows = list(queryset.order_by('-pk')[:per_page + 1])
+    next_cursor = rows[per_page - 1].pk if len(rows) > per_page else None
+    return rows[:per_page], next_cursor
+
+
+class FeedPaginator(Paginator):
+    """Paginator, который берёт число записей ленты из кэша.
+
+    COUNT(*) выполняется только при промахе кэша и при переходе
+    на последнюю страницу, если по её содержимому нельзя понять
+    точное число записей.
+    """
+
+    def __init__(self, object_list, per_page, feed, timeout=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.feed = feed
+        self.timeout = timeout or settings.FEED_COUNT_TIMEOUT
+
+    @cached_property
+    def count(self):
+        count = cache.get(feed_count_key(self.feed))
+        if count is None:
+            count = self.set_count(self.exact_count())
+        return count
+
+    def exact_count(self):
+        return Paginator.count.func(self)
+
+    def set_count(self, count):
+        cache.set(feed_count_key(self.feed), count, self.timeout)
+        self.__dict__['count'] = count
+        self.__dict__.pop('num_pages', None)
+        return count
+
+    def page(self, number):
+        page = super().page(number)
+        rows = len(page.object_list)
+        if rows < self.per_page and (rows or page.number == 1):
+            # Неполная страница — последняя, число записей известно точно.
+            self.set_count((page.number - 1) * self.per_page + rows)
+        elif page.number == self.num_pages:
+            self.set_count(self.exact_count())
+            if page.number > self.num_pages:
+                return super().page(self.num_pages)
+        return page
@@ -0,0 +1,169 @@
+import heapq
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from . import sharding
+from .models import Follow, Post, User
+
+
+def recommendations_key(user_id):
+    return f'recommendations:{user_id}'
+
+
+def store():
+    return caches[settings.RECOMMENDATIONS_CACHE]
+
+
+def is_process_local():
+    """Кэш рекомендаций свой у каждого процесса: веб-воркеры не увидят
+    результат compute_recommendations."""
+    return isinstance(store(), LocMemCache)
+
+
+def get_recommendations(user_id):
+    """Кого почитать: готовый список из кэша, одно обращение по ключу."""
+    return store().get(recommendations_key(user_id), [])
+
+
+class Adjacency:
+    """Граф в формате CSR.
+
+    Соседи вершины i — indices[indptr[i]:indptr[i + 1]]. Два плоских
+    массива целых вместо объектов ORM: граф подписок помещается в память
+    целиком.
+    """
+
+    def __init__(self, size, sources, targets):
+        indptr = array('q', bytes(8 * (size + 1)))
+        for source in sources:
+            indptr[source + 1] += 1
+        for i in range(size):
+            indptr[i + 1] += indptr[i]
+        indices = array('q', bytes(8 * len(targets)))
+        position = array('q', indptr[:-1])
+        for source, target in zip(sources, targets):
+            indices[position[source]] = target
+            position[source] += 1
+        self.indptr, self.indices = indptr, indices
+
+    def __getitem__(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+
+def load_edges(rows, index, other_index=None):
+    other_index = other_index or index
+    sources, targets = array('q'), array('q')
+    for source, target in rows:
+        sources.append(index[source])
+        targets.append(other_index[target])
+    return sources, targets
+
+
+def entry(user, score):
+    pk, username, first_name, last_name = user
+    return {
+        'id': pk,
+        'username': username,
+        'name': f'{first_name} {last_name}'.strip(),
+        'score': score,
+    }
+
+
+def top(scores, count):
+    return heapq.nlargest(
+        count, scores.items(), key=lambda item: (item[1], -item[0])
+    )
+
+
+def compute(count=None):
+    """Пересчитывает рекомендации всех пользователей.
+
+    Кандидаты — авторы, на которых подписаны те, на кого подписан
+    пользователь (друзья друзей), и авторы сообществ, где пишут его
+    авторы и он сам. Каждый путь через подписку и каждое общее
+    сообщество добавляют к оценке свой вес. Возвращает число
+    пользователей.
+    """
+    count = count or settings.RECOMMENDATIONS_COUNT
+    users = list(
+        User.objects.order_by('pk')
+        .values_list('pk', 'username', 'first_name', 'last_name')
+    )
+    index = {user[0]: i for i, user in enumerate(users)}
+    following = Adjacency(len(users), *load_edges(
+        Follow.objects.values_list('user_id', 'author_id').iterator(),
+        index,
+    ))
+    author_groups = [
+        row
+        for posts in sharding.each(Post.objects.filter(group__isnull=False))
+        for row in posts.values_list('author_id', 'group_id').distinct()
+    ]
+    group_ids = sorted({group_id for _, group_id in author_groups})
+    group_index = {pk: i for i, pk in enumerate(group_ids)}
+    sources, targets = load_edges(author_groups, index, group_index)
+    groups_of = Adjacency(len(users), sources, targets)
+    authors_of = Adjacency(len(group_ids), targets, sources)
+
+    fof_weight = settings.RECOMMENDATIONS_FOF_WEIGHT
+    group_weight = settings.RECOMMENDATIONS_GROUP_WEIGHT
+    batch = {}
+    for i, user in enumerate(users):
+        followed = set(following[i])
+        scores = defaultdict(float)
+        interests = set(groups_of[i])
+        for author in followed:
+            interests.update(groups_of[author])
+            for candidate in following[author]:
+                scores[candidate] += fof_weight
+        for group in interests:
+            for candidate in authors_of[group]:
+                scores[candidate] += group_weight
+        scores.pop(i, None)
+        for author in followed:
+            scores.pop(author, None)
+        batch[recommendations_key(user[0])] = [
+            entry(users[candidate], score)
+            for candidate, score in top(scores, count)
+        ]
+        if len(batch) >= settings.RECOMMENDATIONS_BATCH_SIZE:
+            store().set_many(batch, settings.RECOMMENDATIONS_TIMEOUT)
+            batch = {}
+    store().set_many(batch, settings.RECOMMENDATIONS_TIMEOUT)
+    return len(users)
+
+
+def on_follow(user_id, author_id):
+    """Обновляет рекомендации после подписки без полного пересчёта.
+
+    Новый автор уходит из списка, его собственные авторы получают вес
+    пути через подписку. Рекомендации подписчиков пользователя и
+    сообщества нового автора учтёт следующий запуск compute_recommendations.
+    """
+    key = recommendations_key(user_id)
+    scores = {
+        item['id']: item for item in store().get(key, [])
+        if item['id'] != author_id
+    }
+    candidates = (
+        User.objects.filter(following__user_id=author_id)
+        .exclude(following__user_id=user_id)
+        .exclude(pk=user_id)
+        .values_list('pk', 'username', 'first_name', 'last_name')
+    )
+    for user in candidates:
+        score = settings.RECOMMENDATIONS_FOF_WEIGHT
+        if user[0] in scores:
+            score += scores[user[0]]['score']
+        scores[user[0]] = entry(user, score)
+    best = top(
+        {pk: item['score'] for pk, item in scores.items()},
+        settings.RECOMMENDATIONS_COUNT,
+    )
+    store().set(
+        key, [scores[pk] for pk, _ in best], settings.RECOMMENDATIONS_TIMEOUT
+    )
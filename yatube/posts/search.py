@@ -0,0 +1,112 @@
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+
+class RawSubquery(RawSQL):
+    """Подзапрос для pk__in: In сам берёт его в скобки.
+
+    Лишняя пара скобок у RawSQL делает из подзапроса скалярное
+    выражение, и SQLite сравнивает pk только с первой его строкой.
+    """
+
+    def as_sql(self, compiler, connection):
+        return self.sql, self.params
+
+
+class FullTextIndex:
+    """Полнотекстовый индекс SQLite FTS5 по текстовой колонке таблицы.
+
+    Индекс хранит только словарь (external content) и поддерживается
+    триггерами, поэтому bulk_create и update() его тоже обновляют.
+    """
+
+    def __init__(self, table, column):
+        self.table = table
+        self.column = column
+        self.name = f'{table}_fts'
+        self._exists = {}
+
+    def statements(self):
+        table, column, name = self.table, self.column, self.name
+        delete = (
+            f"INSERT INTO {name}({name}, rowid, {column}) "
+            f"VALUES ('delete', old.id, old.{column});"
+        )
+        insert = (
+            f'INSERT INTO {name}(rowid, {column}) '
+            f'VALUES (new.id, new.{column});'
+        )
+        return [
+            f'CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {table} '
+            f'BEGIN {insert} END',
+            f'CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {table} '
+            f'BEGIN {delete} END',
+            f'CREATE TRIGGER IF NOT EXISTS {name}_au '
+            f'AFTER UPDATE OF {column} ON {table} '
+            f'BEGIN {delete} {insert} END',
+        ]
+
+    def ensure(self, using):
+        """Создаёт индекс и триггеры, если их нет.
+
+        Пересоздание таблицы в миграциях SQLite удаляет триггеры,
+        поэтому после каждого migrate индекс перестраивается, если
+        их пришлось создавать заново.
+        """
+        connection = connections[using]
+        if connection.vendor != 'sqlite':
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master "
+                "WHERE type = 'trigger' AND name LIKE %s",
+                [f'{self.name}_a_'],
+            )
+            if cursor.fetchone()[0] == len(self.statements()):
+                return
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.name} '
+                f'USING fts5({self.column}, content={self.table}, '
+                f'content_rowid=id)'
+            )
+            for statement in self.statements():
+                cursor.execute(statement)
+            cursor.execute(
+                f"INSERT INTO {self.name}({self.name}) VALUES ('rebuild')"
+            )
+        self._exists.pop(using, None)
+
+    def exists(self, using):
+        """Есть ли индекс в базе; проверяется один раз на процесс."""
+        if using not in self._exists:
+            connection = connections[using]
+            self._exists[using] = (
+                connection.vendor == 'sqlite'
+                and self.name in connection.introspection.table_names()
+            )
+        return self._exists[using]
+
+    def filter(self, queryset, search_term):
+        """Отбор по индексу или None, если индекса в этой базе нет."""
+        if not self.exists(queryset.db):
+            return None
+        return queryset.filter(pk__in=RawSubquery(
+            f'SELECT rowid FROM {self.name} WHERE {self.name} MATCH %s',
+            [match_expression(search_term)],
+        ))
+
+
+def match_expression(search_term):
+    """Каждое слово — префикс фразы, все слова обязательны."""
+    words = search_term.split()
+    return ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+
+
+POST_TEXT = FullTextIndex('posts_post', 'text')
+COMMENT_TEXT = FullTextIndex('posts_comment', 'text')
+INDEXES = (POST_TEXT, COMMENT_TEXT)
+
+
+def ensure_indexes(using='default', **kwargs):
+    for index in INDEXES:
+        index.ensure(using)
@@ -0,0 +1,243 @@
+import heapq
+from collections import defaultdict
+from itertools import islice
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+
+from .models import Comment, Post, PostScore, ShardSequence, User
+
+# Порядок ленты по умолчанию и ключ слияния, совпадающий с ним.
+FEED_ORDER = ('-pub_date', '-pk')
+FEED_KEY = attrgetter('pub_date', 'pk')
+
+
+def shards():
+    """Базы-шарды постов из POST_SHARDS; пусто — шардирования нет."""
+    return settings.POST_SHARDS
+
+
+def aliases():
+    """Базы, в которых лежат посты: шарды или одна default."""
+    return shards() or [DEFAULT_DB_ALIAS]
+
+
+def shard_for_author(author_id):
+    aliases = shards()
+    if not aliases:
+        return DEFAULT_DB_ALIAS
+    return aliases[author_id % len(aliases)]
+
+
+def shard_for_post(post_id):
+    """Шард поста по id: остаток от деления id — номер шарда."""
+    aliases = shards()
+    if not aliases:
+        return DEFAULT_DB_ALIAS
+    return aliases[post_id % len(aliases)]
+
+
+def allocate_post_id(alias, author_id):
+    """Новый id поста в шарде alias: value * N + номер шарда автора."""
+    count = len(shards())
+    with transaction.atomic(using=alias):
+        sequences = ShardSequence.objects.using(alias)
+        if not sequences.filter(pk=1).update(value=F('value') + 1):
+            sequences.create(pk=1, value=1)
+        value = sequences.values_list('value', flat=True).get(pk=1)
+    return value * count + author_id % count
+
+
+def for_author(queryset, author_id):
+    return queryset.using(shard_for_author(author_id))
+
+
+def for_post(queryset, post_id):
+    return queryset.using(shard_for_post(post_id))
+
+
+def each(queryset):
+    """Тот же запрос к каждому шарду (или один запрос без шардов)."""
+    aliases = shards()
+    if not aliases:
+        return [queryset]
+    return [queryset.using(alias) for alias in aliases]
+
+
+def by_shard(post_ids):
+    """id постов, разложенные по шардам."""
+    groups = defaultdict(set)
+    for post_id in post_ids:
+        groups[shard_for_post(post_id)].add(post_id)
+    return groups
+
+
+def post_rows(post_ids, *fields):
+    """values_list(*fields) постов с этими id со всех их шардов."""
+    rows = []
+    for alias, ids in by_shard(post_ids).items():
+        rows.extend(
+            Post.objects.using(alias).filter(pk__in=ids)
+            .values_list(*fields)
+        )
+    return rows
+
+
+def attach_posts(objects):
+    """Подставляет объектам с post_id их посты из шардов."""
+    found = {}
+    for alias, ids in by_shard(
+        {obj.post_id for obj in objects if obj.post_id}
+    ).items():
+        found.update(Post.objects.using(alias).in_bulk(ids))
+    for obj in objects:
+        if obj.post_id:
+            obj.post = found.get(obj.post_id)
+
+
+class MergedFeed:
+    """Лента из нескольких шардов: слияние k упорядоченных потоков.
+
+    Подходит Paginator как object_list: count() — сумма счётчиков
+    шардов, срез [a:b] берёт из каждого шарда первые b строк в порядке
+    order и сливает их по key в один порядок.
+    """
+    ordered = True
+
+    def __init__(self, querysets, order=FEED_ORDER, key=FEED_KEY):
+        self.querysets = [queryset.order_by(*order) for queryset in querysets]
+        self.key = key
+
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        start, stop = item.start or 0, item.stop
+        streams = [
+            queryset[:stop] if stop is not None else queryset
+            for queryset in self.querysets
+        ]
+        merged = heapq.merge(*streams, key=self.key, reverse=True)
+        return list(islice(merged, start, stop))
+
+
+def feed(queryset, author_ids=None, order=FEED_ORDER, key=FEED_KEY):
+    """Лента по всем шардам или по шардам авторов author_ids.
+
+    Без шардирования возвращает сам queryset.
+    """
+    if not shards():
+        return queryset
+    if author_ids is None:
+        aliases = shards()
+    else:
+        aliases = sorted({shard_for_author(pk) for pk in author_ids})
+    return MergedFeed(
+        [queryset.using(alias) for alias in aliases], order, key
+    )
+
+
+def replica_values(instance):
+    return {
+        field.attname: getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+    }
+
+
+def replicate(instance):
+    """Копия строки пользователя или сообщества в каждом шарде.
+
+    Посты и комментарии ссылаются на них внешними ключами, а ленты
+    соединяют с ними таблицу постов внутри шарда.
+    """
+    model = type(instance)
+    values = replica_values(instance)
+    for alias in shards():
+        rows = model._base_manager.using(alias)
+        if not rows.filter(pk=instance.pk).update(**values):
+            rows.bulk_create([model(**values)])
+
+
+def ensure_replicas(alias, model, pks):
+    """Копирует в шард alias строки model с этими pk, которых там нет.
+
+    post_save не приходит для строк из bulk_create и update(): такие
+    пользователи и сообщества попадают в шард при первой записи поста
+    или комментария.
+    """
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    rows = model._base_manager.using(alias)
+    missing = pks - set(rows.filter(pk__in=pks).values_list('pk', flat=True))
+    if missing:
+        rows.bulk_create(
+            model._base_manager.using(DEFAULT_DB_ALIAS).filter(pk__in=missing)
+        )
+
+
+def replicate_missing(model, pks):
+    """Копии строк, созданных в default через bulk_create, во всех шардах."""
+    for alias in shards():
+        ensure_replicas(alias, model, pks)
+
+
+def unreplicate(instance):
+    """Удаляет копии; каскад удаляет посты и комментарии шарда."""
+    for alias in shards():
+        type(instance)._base_manager.using(alias).filter(
+            pk=instance.pk
+        ).delete()
+
+
+class ShardRouter:
+    """Посты, их комментарии и рейтинги — в шарде автора поста.
+
+    Маршрут известен, если запрос идёт от объекта: свой пост,
+    author.posts, post.comments, comment.post, notification.post.
+    Ленты по нескольким авторам собирает feed(), запросы по id поста —
+    for_post(). Новый пост сохраняется через post.save() или
+    author.posts.create(): Post.objects.create() не знает автора до
+    выбора базы. Остальные модели — в default. Без POST_SHARDS роутер
+    ни во что не вмешивается.
+    """
+    sharded = (Post, Comment, PostScore)
+
+    def route(self, model, instance):
+        if not shards():
+            return None
+        if model not in self.sharded:
+            # Копии пользователей и сообществ в шардах только для чтения
+            # вместе с постами: остальное всегда в default.
+            return DEFAULT_DB_ALIAS
+        if instance is None:
+            return None
+        # Шард определяют ключи объекта, а не _state.db: присваивание
+        # comment.author раньше comment.post привязало бы его к default.
+        if isinstance(instance, Post):
+            if instance.pk is not None:
+                return shard_for_post(instance.pk)
+            return shard_for_author(instance.author_id)
+        if getattr(instance, 'post_id', None):
+            return shard_for_post(instance.post_id)
+        if isinstance(instance, User) and model is Post:
+            return shard_for_author(instance.pk)
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self.route(model, hints.get('instance'))
+
+    def db_for_write(self, model, **hints):
+        return self.route(model, hints.get('instance'))
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Пользователи и сообщества есть в каждой базе, посты ссылаются
+        # на них из шарда, а уведомления из default — на посты.
+        return True if shards() else None
@@ -0,0 +1,139 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import groups, notifications, recommendations, sharding, trending
+from .models import (
+    Comment, Follow, Group, Notification, Post, PostScore, User,
+)
+from .paginator import invalidate_feeds
+
+
+def post_feeds(post):
+    """Ленты, в которые попадает пост."""
+    feeds = ['index', f'author:{post.author_id}']
+    group_ids = {post.group_id, getattr(post, '_loaded_group_id', None)}
+    feeds.extend(f'group:{pk}' for pk in group_ids if pk)
+    return feeds
+
+
+@receiver(pre_save, sender=Post)
+def assign_shard_post_id(sender, instance, using, **kwargs):
+    # id нового поста в шарде несёт номер шарда: по нему находится пост.
+    if instance.pk is None and using in sharding.shards():
+        instance.pk = sharding.allocate_post_id(using, instance.author_id)
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=Comment)
+def ensure_shard_replicas(sender, instance, using, **kwargs):
+    if using not in sharding.shards():
+        return
+    sharding.ensure_replicas(using, User, {instance.author_id})
+    if sender is Post:
+        sharding.ensure_replicas(using, Group, {instance.group_id})
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Group)
+def replicate_to_shards(sender, instance, using, update_fields=None,
+                        **kwargs):
+    # Копии в шардах обновляет только запись в default.
+    if using != DEFAULT_DB_ALIAS or not sharding.shards():
+        return
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    sharding.replicate(instance)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Group)
+def unreplicate_from_shards(sender, instance, using, **kwargs):
+    if using == DEFAULT_DB_ALIAS:
+        sharding.unreplicate(instance)
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_notifications(sender, instance, using, **kwargs):
+    # Каскад из шарда ищет уведомления в самом шарде, а они в default.
+    if using != DEFAULT_DB_ALIAS:
+        Notification.objects.using(DEFAULT_DB_ALIAS).filter(
+            post_id=instance.pk
+        ).delete()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_feeds(sender, instance, **kwargs):
+    invalidate_feeds(*post_feeds(instance))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_feed(sender, instance, update_fields=None, **kwargs):
+    # Вход пользователя обновляет только last_login: профиль тот же.
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    invalidate_feeds(f'author:{instance.pk}')
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_groups(sender, instance, **kwargs):
+    groups.on_group_change()
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow_feed(sender, instance, **kwargs):
+    invalidate_feeds(
+        f'follow:{instance.user_id}',
+        f'followers:{instance.author_id}',
+        f'following:{instance.user_id}',
+    )
+
+
+@receiver(post_save, sender=Comment)
+def score_comment(sender, instance, created, **kwargs):
+    if created:
+        trending.bump(
+            instance.post_id, settings.TRENDING_COMMENT_WEIGHT,
+            instance.created,
+        )
+
+
+@receiver(post_save, sender=Follow)
+def score_follow(sender, instance, created, **kwargs):
+    if created:
+        trending.bump_latest_post(
+            instance.author_id, settings.TRENDING_FOLLOW_WEIGHT
+        )
+
+
+@receiver(post_save, sender=Follow)
+def recommend_on_follow(sender, instance, created, **kwargs):
+    if created:
+        recommendations.on_follow(instance.user_id, instance.author_id)
+
+
+@receiver(post_save, sender=Comment)
+def notify_comment(sender, instance, created, **kwargs):
+    if created:
+        notifications.notify(
+            instance.post.author_id, Notification.COMMENT,
+            instance.author_id, instance.post_id, instance.created,
+        )
+
+
+@receiver(post_save, sender=Follow)
+def notify_follow(sender, instance, created, **kwargs):
+    if created:
+        notifications.notify(
+            instance.author_id, Notification.FOLLOW, instance.user_id
+        )
+
+
+@receiver(post_delete, sender=PostScore)
+def invalidate_trending_feed(sender, instance, **kwargs):
+    invalidate_feeds('trending')
@@ -0,0 +1,145 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .. import search
+from ..models import Comment, Follow, Group, Post, User
+
+ROWS = 100_000
+USERS = 400
+AUTHORS = ROWS // USERS
+
+
+class AdminChangelistTests(TestCase):
+    """Число запросов в списках админки не зависит от размера таблиц."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        User.objects.bulk_create(
+            User(username=f'user{i}') for i in range(USERS)
+        )
+        users = list(User.objects.exclude(pk=cls.admin.pk))
+        cls.author = users[0]
+        groups = Group.objects.bulk_create(
+            Group(title=f'Группа {i}', slug=f'group-{i}', description='-')
+            for i in range(10)
+        )
+        Post.objects.bulk_create(
+            Post(
+                author=users[i % USERS],
+                group=groups[i % len(groups)],
+                text=f'Пост номер {i}',
+            )
+            for i in range(ROWS)
+        )
+        cls.post = Post.objects.latest('pk')
+        Comment.objects.bulk_create(
+            Comment(
+                post=cls.post,
+                author=users[i % USERS],
+                text=f'Комментарий номер {i}',
+            )
+            for i in range(ROWS)
+        )
+        Follow.objects.bulk_create(
+            Follow(user=user, author=author)
+            for user in users
+            for author in users[:AUTHORS]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+        # Сессия и пользователь попадают в кэш первым запросом.
+        self.client.get(reverse('admin:index'))
+        # Наличие индекса проверяется один раз на процесс.
+        for index in search.INDEXES:
+            index.exists(connection.alias)
+
+    def assertChangelistQueries(self, url, num):
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_post_changelist(self):
+        """Авторы и группы берутся одним JOIN.
+
+        Группы выбираются один раз для колонки list_editable
+        и один раз для формы массового переноса.
+        """
+        response = self.assertChangelistQueries(
+            reverse('admin:posts_post_changelist'), 3
+        )
+        cl = response.context['cl']
+        self.assertEqual(len(cl.result_list), cl.list_per_page)
+        self.assertIsNotNone(cl.next_cursor)
+
+    def test_comment_changelist(self):
+        self.assertChangelistQueries(
+            reverse('admin:posts_comment_changelist'), 1
+        )
+
+    def test_follow_changelist(self):
+        self.assertChangelistQueries(
+            reverse('admin:posts_follow_changelist'), 1
+        )
+
+    def test_changelists_without_count(self):
+        """Списки не считают строки таблиц через COUNT(*)."""
+        for model in ('post', 'comment', 'follow'):
+            with self.subTest(model=model):
+                url = reverse(f'admin:posts_{model}_changelist')
+                with CaptureQueriesContext(connection) as ctx:
+                    self.client.get(url)
+                self.assertFalse(
+                    [q for q in ctx.captured_queries if 'COUNT(' in q['sql']]
+                )
+
+    def test_cursor_pagination(self):
+        """Следующая страница выбирается по pk, без OFFSET."""
+        url = reverse('admin:posts_comment_changelist')
+        first = self.client.get(url).context['cl']
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'{url}?cursor={first.next_cursor}')
+        self.assertFalse(
+            [q for q in ctx.captured_queries if 'OFFSET' in q['sql']]
+        )
+        second = response.context['cl']
+        self.assertEqual(
+            second.result_list[0].pk, first.next_cursor - 1
+        )
+
+    def test_post_search(self):
+        """Поиск по тексту идёт через полнотекстовый индекс."""
+        url = reverse('admin:posts_post_changelist')
+        response = self.assertChangelistQueries(f'{url}?q=номер 99999', 3)
+        self.assertEqual(
+            [post.text for post in response.context['cl'].result_list],
+            ['Пост номер 99999'],
+        )
+
+    def test_post_search_all_matches(self):
+        """Находятся все посты, а не только первый из индекса."""
+        url = reverse('admin:posts_post_changelist')
+        response = self.assertChangelistQueries(f'{url}?q=номер 9999', 3)
+        self.assertCountEqual(
+            [post.text for post in response.context['cl'].result_list],
+            ['Пост номер 9999', *(f'Пост номер 9999{i}' for i in range(10))],
+        )
+
+    def test_search_by_username(self):
+        url = reverse('admin:posts_follow_changelist')
+        response = self.assertChangelistQueries(
+            f'{url}?q={self.author.username}', 1
+        )
+        result_list = response.context['cl'].result_list
+        self.assertTrue(result_list)
+        for follow in result_list:
+            self.assertIn(self.author, (follow.user, follow.author))
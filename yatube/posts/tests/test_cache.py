@@ -21,6 +21,8 @@ class PostCacheTest(TestCase):
         Post.objects.bulk_create(objs)
 
     def setUp(self):
+        # Главная могла попасть в кэш в другом тесте того же процесса.
+        cache.clear()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
 
@@ -53,6 +55,9 @@ class PostViewsTest(TestCase):
             author=cls.user,
         )
 
+    def setUp(self):
+        cache.clear()
+
     def test_cache_index(self):
         """Проверка работы кэша на главной странице."""
         INDEX_URL = reverse('posts:index')
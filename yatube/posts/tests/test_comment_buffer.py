@@ -0,0 +1,154 @@
+import datetime as dt
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import comment_buffer
+from ..models import Comment, Post, User
+
+QUEUE_DIR = tempfile.mkdtemp()
+
+
+@override_settings(
+    COMMENT_BUFFER=True,
+    COMMENT_BUFFER_PATH=os.path.join(QUEUE_DIR, 'queue.sqlite3'),
+    COMMENT_BUFFER_FLUSH_INTERVAL=None,
+)
+class CommentBufferTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Abramow_test')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+        cls.POST_URL = reverse(
+            'posts:post_detail', kwargs={'post_id': cls.post.pk}
+        )
+        cls.COMMENT_URL = reverse(
+            'posts:add_comment', kwargs={'post_id': cls.post.pk}
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(QUEUE_DIR, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        comment_buffer.queue.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_comment_queued_not_inserted(self):
+        response = self.reader_client.post(
+            self.COMMENT_URL, {'text': 'Из очереди'}
+        )
+        self.assertRedirects(response, self.POST_URL)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_read_your_writes(self):
+        """Автор видит свой комментарий до записи, другие — после."""
+        self.reader_client.post(self.COMMENT_URL, {'text': 'Из очереди'})
+        response = self.reader_client.get(self.POST_URL)
+        self.assertContains(response, 'Из очереди')
+        self.assertNotContains(self.client.get(self.POST_URL), 'Из очереди')
+        self.assertEqual(comment_buffer.drain(), 1)
+        comment = Comment.objects.get()
+        self.assertEqual(
+            (comment.post, comment.author, comment.text),
+            (self.post, self.reader, 'Из очереди'),
+        )
+        response = self.reader_client.get(self.POST_URL)
+        self.assertContains(response, 'Из очереди', count=1)
+        self.assertContains(self.client.get(self.POST_URL), 'Из очереди')
+
+    def test_pending_comment_changes_etag(self):
+        response = self.reader_client.get(self.POST_URL)
+        self.reader_client.post(self.COMMENT_URL, {'text': 'Из очереди'})
+        fresh = self.reader_client.get(
+            self.POST_URL, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(fresh.status_code, 200)
+
+    @override_settings(COMMENT_BUFFER_BATCH_SIZE=2)
+    def test_flush_in_batches(self):
+        for i in range(5):
+            self.reader_client.post(self.COMMENT_URL, {'text': f'К {i}'})
+        self.assertEqual(comment_buffer.flush(), 2)
+        self.assertEqual(Comment.objects.count(), 2)
+        self.assertEqual(comment_buffer.drain(), 3)
+        self.assertEqual(Comment.objects.count(), 5)
+
+    def test_created_time_kept(self):
+        """Комментарий получает время отправки, а не время записи."""
+        sent = timezone.now() - dt.timedelta(minutes=5)
+        with mock.patch('posts.comment_buffer.timezone.now',
+                        return_value=sent):
+            self.reader_client.post(self.COMMENT_URL, {'text': 'Из очереди'})
+        comment_buffer.drain()
+        self.assertEqual(Comment.objects.get().created, sent)
+
+    def test_invalid_form_not_queued(self):
+        self.reader_client.post(self.COMMENT_URL, {'text': ''})
+        self.assertEqual(comment_buffer.drain(), 0)
+
+    def test_missing_post(self):
+        response = self.reader_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': 0}),
+            {'text': 'Комментарий'},
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_deleted_post_dropped(self):
+        post = Post.objects.create(author=self.author, text='Удалят')
+        self.reader_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': post.pk}),
+            {'text': 'Опоздал'},
+        )
+        self.reader_client.post(self.COMMENT_URL, {'text': 'Успел'})
+        post.delete()
+        self.assertEqual(comment_buffer.drain(), 2)
+        self.assertEqual(
+            list(Comment.objects.values_list('text', flat=True)), ['Успел']
+        )
+
+    def test_bad_row_moved_to_failed(self):
+        """Строка с ошибкой данных не держит пачку: она уходит в _failed."""
+        for text in ('Первый', 'Плохой', 'Третий'):
+            self.reader_client.post(self.COMMENT_URL, {'text': text})
+        insert_comments = comment_buffer.insert_comments
+
+        def insert_or_fail(alias, comments):
+            if any(comment.text == 'Плохой' for comment in comments):
+                raise IntegrityError('FOREIGN KEY constraint failed')
+            insert_comments(alias, comments)
+
+        with mock.patch.object(
+            comment_buffer, 'insert_comments', side_effect=insert_or_fail
+        ), self.assertLogs('posts.local_queue', 'ERROR'):
+            self.assertEqual(comment_buffer.drain(), 3)
+        self.assertCountEqual(
+            Comment.objects.values_list('text', flat=True),
+            ['Первый', 'Третий'],
+        )
+        failed = comment_buffer.queue.failed()
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0][3], 'Плохой')
+        self.assertIn('FOREIGN KEY', failed[0][-1])
+        self.assertEqual(comment_buffer.drain(), 0)
+
+    def test_unavailable_database_keeps_batch(self):
+        self.reader_client.post(self.COMMENT_URL, {'text': 'Подождёт'})
+        with mock.patch.object(
+            comment_buffer, 'insert_comments', side_effect=OSError
+        ), self.assertRaises(OSError):
+            comment_buffer.drain()
+        self.assertEqual(comment_buffer.drain(), 1)
+        self.assertFalse(comment_buffer.queue.failed())
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Post, User
+
+
+class PostDetailConditionalTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Abramow_test')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.post = Post.objects.create(author=cls.author, text='Тестовый пост')
+        Comment.objects.create(
+            post=cls.post, author=cls.reader, text='Комментарий'
+        )
+        cls.POST_URL = reverse(
+            'posts:post_detail', kwargs={'post_id': cls.post.pk}
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def revalidate(self, client, response):
+        return client.get(
+            self.POST_URL,
+            HTTP_IF_NONE_MATCH=response['ETag'],
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+
+    def test_validators(self):
+        response = self.client.get(self.POST_URL)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertIn('Cookie', response['Vary'])
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_not_modified_without_rendering(self):
+        """Неизменённый пост: 304 после одного запроса, без шаблонов."""
+        response = self.reader_client.get(self.POST_URL)
+        with self.assertNumQueries(1):
+            cached = self.revalidate(self.reader_client, response)
+        self.assertEqual(cached.status_code, 304)
+        self.assertFalse(cached.templates)
+
+    def test_new_comment_changes_etag(self):
+        response = self.reader_client.get(self.POST_URL)
+        self.reader_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.pk}),
+            {'text': 'Ещё комментарий'},
+        )
+        fresh = self.revalidate(self.reader_client, response)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertContains(fresh, 'Ещё комментарий')
+
+    def test_post_edit_changes_etag(self):
+        response = self.client.get(self.POST_URL)
+        self.post.text = 'Исправленный пост'
+        self.post.save()
+        fresh = self.revalidate(self.client, response)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertContains(fresh, 'Исправленный пост')
+
+    def test_etag_per_user(self):
+        """Анонимная версия страницы не подходит пользователю."""
+        response = self.client.get(self.POST_URL)
+        other = self.revalidate(self.reader_client, response)
+        self.assertEqual(other.status_code, 200)
+        self.assertNotEqual(other['ETag'], response['ETag'])
+
+    def test_missing_post(self):
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'post_id': 0}),
+            HTTP_IF_NONE_MATCH='*',
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..models import Follow, User
+
+
+@override_settings(FOLLOW_LIST_PER_PAGE=3)
+class FollowListTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='Abramow_test', first_name='Иван'
+        )
+        cls.followers = [
+            User.objects.create_user(username=f'reader{i}') for i in range(7)
+        ]
+        Follow.objects.bulk_create(
+            Follow(user=user, author=cls.author) for user in cls.followers
+        )
+        Follow.objects.create(user=cls.author, author=cls.followers[0])
+        cls.FOLLOWERS_URL = reverse(
+            'posts:followers', kwargs={'username': cls.author.username}
+        )
+        cls.FOLLOWERS_JSON_URL = reverse(
+            'posts:followers_json', kwargs={'username': cls.author.username}
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_keyset_pages(self):
+        """Страницы идут от новых подписчиков к старым без пропусков."""
+        seen = []
+        url = self.FOLLOWERS_JSON_URL
+        while url:
+            data = self.client.get(url).json()
+            self.assertEqual(data['count'], 7)
+            seen.extend(item['username'] for item in data['results'])
+            url = data['next']
+        self.assertEqual(
+            seen, [user.username for user in reversed(self.followers)]
+        )
+
+    def test_single_query_per_page(self):
+        response = self.client.get(self.FOLLOWERS_URL)
+        cursor = response.context['next_cursor']
+        with self.assertNumQueries(1) as queries:
+            response = self.client.get(f'{self.FOLLOWERS_URL}?cursor={cursor}')
+        self.assertEqual(len(response.context['users']), 3)
+        self.assertNotIn('OFFSET', queries.captured_queries[0]['sql'])
+
+    def test_following(self):
+        response = self.client.get(reverse(
+            'posts:following', kwargs={'username': self.author.username}
+        ))
+        self.assertContains(response, 'Всего: 1')
+        self.assertContains(response, self.followers[0].username)
+
+    def test_count_invalidated(self):
+        self.client.get(self.FOLLOWERS_URL)
+        Follow.objects.filter(user=self.followers[0]).delete()
+        response = self.client.get(self.FOLLOWERS_URL)
+        self.assertContains(response, 'Всего: 6')
+
+    def test_unknown_user(self):
+        response = self.client.get(reverse(
+            'posts:followers_json', kwargs={'username': 'missing'}
+        ))
+        self.assertEqual(response.status_code, 404)
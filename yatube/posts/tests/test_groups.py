@@ -0,0 +1,105 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .. import groups
+from ..models import Group, Post, User
+
+
+class GroupCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Abramow_test')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.other = Group.objects.create(
+            title='Другая группа', slug='other-slug', description='-'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Пост {i}', group=cls.group)
+            for i in range(12)
+        )
+        cls.GROUP_URL = reverse(
+            'posts:group_posts', kwargs={'slug': cls.group.slug}
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_page_without_queries(self):
+        """Повторный запрос страницы сообщества не обращается к базе."""
+        first = self.client.get(self.GROUP_URL)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.GROUP_URL)
+        self.assertEqual(first.content, second.content)
+
+    def test_pages_cached_separately(self):
+        self.client.get(self.GROUP_URL)
+        response = self.client.get(f'{self.GROUP_URL}?page=2')
+        self.assertEqual(len(response.context['page_obj']), 2)
+        self.assertContains(response, 'Пост 1<')
+
+    def test_new_post_invalidates_page(self):
+        self.client.get(self.GROUP_URL)
+        Post.objects.create(
+            author=self.author, text='Свежий пост', group=self.group
+        )
+        self.assertContains(self.client.get(self.GROUP_URL), 'Свежий пост')
+
+    def test_moved_post_invalidates_both_groups(self):
+        other_url = reverse(
+            'posts:group_posts', kwargs={'slug': self.other.slug}
+        )
+        self.client.get(self.GROUP_URL)
+        self.client.get(other_url)
+        post = Post.objects.filter(group=self.group).first()
+        post.group = self.other
+        post.save()
+        response = self.client.get(self.GROUP_URL)
+        self.assertNotContains(response, f'{post.text}<')
+        self.assertContains(self.client.get(other_url), f'{post.text}<')
+
+    def test_group_change_reloads_groups(self):
+        self.client.get(self.GROUP_URL)
+        self.group.title = 'Новое название'
+        self.group.save()
+        self.assertContains(self.client.get(self.GROUP_URL), 'Новое название')
+        self.group.slug = 'new-slug'
+        self.group.save()
+        self.assertEqual(self.client.get(self.GROUP_URL).status_code, 404)
+
+    def test_change_in_other_process(self):
+        """Изменение в другом процессе видно по версии в общем кэше."""
+        groups.get_groups()
+        Group.objects.filter(pk=self.group.pk).update(title='Изменено')
+        self.assertEqual(groups.get_group_or_404('test-slug').title,
+                         self.group.title)
+        cache.delete(groups.GROUPS_VERSION_KEY)
+        self.assertEqual(
+            groups.get_group_or_404('test-slug').title, 'Изменено'
+        )
+
+    def test_unknown_slug(self):
+        groups.get_groups()
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse('posts:group_posts', kwargs={'slug': 'missing'})
+            )
+        self.assertEqual(response.status_code, 404)
+
+    def test_post_counts(self):
+        """Число постов считается одним запросом и дальше берётся из кэша."""
+        all_groups = [self.group, self.other]
+        with self.assertNumQueries(1):
+            counts = groups.post_counts(all_groups)
+        self.assertEqual(counts, {self.group.pk: 12, self.other.pk: 0})
+        with self.assertNumQueries(0):
+            groups.post_counts(all_groups)
+        Post.objects.create(author=self.author, text='Ещё', group=self.other)
+        with self.assertNumQueries(1):
+            counts = groups.post_counts(all_groups)
+        self.assertEqual(counts[self.other.pk], 1)
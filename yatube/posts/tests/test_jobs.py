@@ -0,0 +1,162 @@
+import csv
+import io
+from unittest import mock
+
+from django.contrib.admin import ACTION_CHECKBOX_NAME
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .. import jobs
+from ..models import BulkJob, Comment, Group, Post, User
+from ..paginator import feed_count_key, feed_version_key
+
+
+@override_settings(BULK_JOB_CHUNK_SIZE=3)
+class BulkJobTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.author = User.objects.create_user(username='Abramow_test')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='-'
+        )
+        cls.target = Group.objects.create(
+            title='Новая группа', slug='new-slug', description='-'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'Пост {i}')
+            for i in range(7)
+        )
+        cls.post = Post.objects.latest('pk')
+        Comment.objects.bulk_create(
+            Comment(post=cls.post, author=cls.author, text=f'Спам {i}')
+            for i in range(7)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def run_action(self, model, action, queryset, **data):
+        return self.client.post(
+            reverse(f'admin:posts_{model}_changelist'),
+            {
+                'action': action,
+                ACTION_CHECKBOX_NAME: [obj.pk for obj in queryset],
+                **data,
+            },
+            follow=True,
+        )
+
+    def test_action_enqueues_job(self):
+        """Действие админки только ставит задачу в очередь."""
+        response = self.run_action(
+            'comment', 'bulk_delete', Comment.objects.all()
+        )
+        self.assertContains(response, 'поставлена в очередь')
+        self.assertEqual(Comment.objects.count(), 7)
+        job = BulkJob.objects.get()
+        self.assertEqual(job.status, BulkJob.PENDING)
+        self.assertEqual(job.total, 7)
+
+    def test_delete_in_chunks(self):
+        """7 комментариев удаляются тремя пачками: 3 + 3 + 1."""
+        self.run_action('comment', 'bulk_delete', Comment.objects.all())
+        with mock.patch.object(
+            jobs, 'delete', wraps=jobs.delete
+        ) as delete:
+            self.assertEqual(jobs.run_pending(), 1)
+        self.assertEqual(
+            [len(call[0][2]) for call in delete.call_args_list], [3, 3, 1]
+        )
+        job = BulkJob.objects.get()
+        self.assertEqual(job.status, BulkJob.DONE)
+        self.assertEqual(job.processed, 7)
+        self.assertFalse(Comment.objects.exists())
+
+    def test_reassign_invalidates_feeds_once(self):
+        """Счётчики лент сбрасываются одним вызовом в конце задачи."""
+        self.run_action(
+            'post', 'bulk_reassign_group', Post.objects.all(),
+            group=self.target.pk,
+        )
+        with mock.patch.object(cache, 'delete_many') as delete_many:
+            jobs.run_pending()
+        delete_many.assert_called_once()
+        feeds = (
+            f'group:{self.group.pk}', f'group:{self.target.pk}',
+            f'author:{self.author.pk}',
+        )
+        self.assertCountEqual(delete_many.call_args[0][0], [
+            key(feed) for feed in feeds
+            for key in (feed_count_key, feed_version_key)
+        ])
+        self.assertEqual(self.target.posts.count(), 7)
+
+    def test_reassign_updates_profile(self):
+        """После задачи профиль автора показывает новое сообщество."""
+        profile_url = reverse('posts:profile', args=[self.author.username])
+        self.assertContains(self.client.get(profile_url), '#Тестовая группа')
+        self.run_action(
+            'post', 'bulk_reassign_group', Post.objects.all(),
+            group=self.target.pk,
+        )
+        jobs.run_pending()
+        response = self.client.get(profile_url)
+        self.assertContains(response, '#Новая группа')
+        self.assertNotContains(response, '#Тестовая группа')
+
+    def test_group_rename_updates_profile(self):
+        profile_url = reverse('posts:profile', args=[self.author.username])
+        self.client.get(profile_url)
+        self.group.title = 'Другое название'
+        self.group.save()
+        self.assertContains(self.client.get(profile_url), '#Другое название')
+
+    def test_delete_posts_invalidates_feeds_once(self):
+        self.run_action('post', 'bulk_delete', Post.objects.all())
+        with mock.patch.object(cache, 'delete_many') as delete_many:
+            jobs.run_pending()
+        delete_many.assert_called_once()
+        self.assertIn(feed_count_key('index'), delete_many.call_args[0][0])
+        self.assertFalse(Post.objects.exists())
+
+    def test_reassign_requires_group(self):
+        response = self.run_action(
+            'post', 'bulk_reassign_group', Post.objects.all()
+        )
+        self.assertContains(response, 'Выберите сообщество')
+        self.assertFalse(BulkJob.objects.exists())
+
+    def test_export(self):
+        self.run_action('post', 'bulk_export', Post.objects.all())
+        job = jobs.run(BulkJob.objects.get().pk)
+        self.assertEqual(job.status, BulkJob.DONE)
+        response = self.client.get(
+            reverse('admin:posts_bulkjob_download', args=(job.pk,))
+        )
+        self.assertIn('attachment', response['Content-Disposition'])
+        content = b''.join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], list(jobs.EXPORT_COLUMNS[Post]))
+        self.assertEqual(len(rows), 8)
+
+    def test_job_runs_once(self):
+        self.run_action('comment', 'bulk_delete', Comment.objects.all())
+        pk = BulkJob.objects.get().pk
+        self.assertIsNotNone(jobs.run(pk))
+        self.assertIsNone(jobs.run(pk))
+
+    def test_failed_job(self):
+        self.run_action('comment', 'bulk_delete', Comment.objects.all())
+        with mock.patch.object(
+            jobs, 'delete', side_effect=ValueError('x')
+        ), self.assertLogs('posts.jobs', 'ERROR'):
+            job = jobs.run(BulkJob.objects.get().pk)
+        self.assertEqual(job.status, BulkJob.FAILED)
+        self.assertEqual(job.error, 'x')
+        self.assertEqual(job.processed, 0)
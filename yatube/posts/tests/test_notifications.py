@@ -0,0 +1,124 @@
+import datetime as dt
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import notifications
+from ..models import Comment, Follow, Notification, Post, User
+
+
+class NotificationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Abramow_test')
+        cls.readers = [
+            User.objects.create_user(username=f'reader{i}') for i in range(3)
+        ]
+        cls.post = Post.objects.create(author=cls.author, text='Пост')
+        cls.INBOX_URL = reverse('posts:notifications')
+
+    def setUp(self):
+        cache.clear()
+        notifications.queue.clear()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def comment(self, reader, text='Комментарий'):
+        Comment.objects.create(post=self.post, author=reader, text=text)
+
+    def test_written_by_worker(self):
+        """Событие ждёт в очереди, строку пишет разбор очереди."""
+        self.comment(self.readers[0])
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(notifications.drain(), 1)
+        self.assertTrue(Notification.objects.filter(
+            recipient=self.author, kind=Notification.COMMENT
+        ).exists())
+
+    def test_own_actions_ignored(self):
+        self.comment(self.author)
+        self.assertEqual(notifications.drain(), 0)
+
+    def test_coalesced(self):
+        """Непрочитанные однотипные события склеиваются в одну строку."""
+        for reader in self.readers:
+            self.comment(reader)
+        notifications.drain()
+        self.comment(self.readers[0])
+        for reader in self.readers:
+            Follow.objects.create(user=reader, author=self.author)
+        notifications.drain()
+        rows = list(
+            Notification.objects.order_by('-pk')
+            .values_list('kind', 'count', 'actor')
+        )
+        self.assertEqual(rows, [
+            (Notification.FOLLOW, 3, self.readers[2].pk),
+            (Notification.COMMENT, 4, self.readers[0].pk),
+        ])
+
+    def test_read_notification_not_coalesced(self):
+        self.comment(self.readers[0])
+        notifications.drain()
+        self.author_client.get(self.INBOX_URL)
+        self.comment(self.readers[1])
+        notifications.drain()
+        self.assertEqual(
+            Notification.objects.filter(kind=Notification.COMMENT).count(), 2
+        )
+
+    def test_unread_counter_without_count(self):
+        self.assertEqual(notifications.unread_count(self.author.pk), 0)
+        self.comment(self.readers[0])
+        Follow.objects.create(user=self.readers[0], author=self.author)
+        notifications.drain()
+        self.comment(self.readers[1])
+        notifications.drain()
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.unread_count(self.author.pk), 2)
+        response = self.author_client.get(reverse('posts:index'))
+        self.assertContains(response, 'Уведомления (2)')
+        self.author_client.get(self.INBOX_URL)
+        self.assertEqual(notifications.unread_count(self.author.pk), 0)
+
+    @override_settings(NOTIFICATIONS_PER_PAGE=2)
+    def test_inbox_cursor(self):
+        other = Post.objects.create(author=self.author, text='Другой')
+        for post in (self.post, other):
+            Comment.objects.create(
+                post=post, author=self.readers[0], text='Комментарий'
+            )
+        Follow.objects.create(user=self.readers[0], author=self.author)
+        notifications.drain()
+        response = self.author_client.get(self.INBOX_URL)
+        self.assertEqual(len(response.context['notifications']), 2)
+        self.assertContains(response, 'Новых подписчиков: 1')
+        response = self.author_client.get(
+            f"{self.INBOX_URL}?cursor={response.context['next_cursor']}"
+        )
+        self.assertEqual(
+            [item.post for item in response.context['notifications']],
+            [self.post],
+        )
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_prune(self):
+        self.comment(self.readers[0])
+        Follow.objects.create(user=self.readers[0], author=self.author)
+        notifications.drain()
+        self.assertEqual(notifications.unread_count(self.author.pk), 2)
+        Notification.objects.filter(kind=Notification.COMMENT).update(
+            created=timezone.now() - dt.timedelta(days=31)
+        )
+        self.assertEqual(notifications.prune(), 1)
+        self.assertEqual(notifications.unread_count(self.author.pk), 1)
+
+    def test_deleted_post_dropped(self):
+        post = Post.objects.create(author=self.author, text='Удалят')
+        Comment.objects.create(post=post, author=self.readers[0], text='К')
+        post.delete()
+        self.assertEqual(notifications.drain(), 1)
+        self.assertFalse(Notification.objects.exists())
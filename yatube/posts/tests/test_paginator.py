@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Group, Post, User
+from ..paginator import feed_count_key
+
+
+def count_queries(queries):
+    return [q for q in queries if 'COUNT(' in q['sql']]
+
+
+class FeedPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Abramow_test')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Пост {i}', group=cls.group)
+            for i in range(25)
+        )
+        cls.GROUP_LIST_URL = reverse(
+            'posts:group_posts', kwargs={'slug': cls.group.slug}
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_count_cached(self):
+        """COUNT(*) выполняется только при первом обращении к ленте."""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.GROUP_LIST_URL)
+        self.assertEqual(len(count_queries(ctx.captured_queries)), 1)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.GROUP_LIST_URL)
+        self.assertEqual(count_queries(ctx.captured_queries), [])
+        self.assertEqual(response.context['page_obj'].paginator.count, 25)
+
+    def test_count_invalidated_on_write(self):
+        self.client.get(self.GROUP_LIST_URL)
+        Post.objects.create(author=self.author, text='Новый', group=self.group)
+        self.assertIsNone(cache.get(feed_count_key(f'group:{self.group.pk}')))
+        response = self.client.get(self.GROUP_LIST_URL)
+        self.assertEqual(response.context['page_obj'].paginator.count, 26)
+
+    def test_last_page_fixes_stale_count(self):
+        """Последняя страница исправляет устаревший счётчик без COUNT(*)."""
+        cache.set(feed_count_key(f'group:{self.group.pk}'), 40)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'{self.GROUP_LIST_URL}?page=3')
+        self.assertEqual(count_queries(ctx.captured_queries), [])
+        page_obj = response.context['page_obj']
+        self.assertEqual(page_obj.paginator.count, 25)
+        self.assertEqual(page_obj.paginator.num_pages, 3)
+        self.assertFalse(page_obj.has_next())
+
+    def test_full_last_page_counts_exactly(self):
+        cache.set(feed_count_key(f'group:{self.group.pk}'), 20)
+        response = self.client.get(f'{self.GROUP_LIST_URL}?page=2')
+        self.assertEqual(response.context['page_obj'].paginator.count, 25)
@@ -0,0 +1,84 @@
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Post, User
+from ..paginator import feed_version
+
+
+class ProfileCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            username='Abramow_test', first_name='Иван'
+        )
+        cls.follower = User.objects.create_user(username='follower')
+        cls.reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=cls.follower, author=cls.author)
+        Post.objects.bulk_create(
+            Post(author=cls.author, text=f'Пост {i}') for i in range(12)
+        )
+        cls.PROFILE_URL = reverse(
+            'posts:profile', kwargs={'username': cls.author.username}
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.follower_client = Client()
+        self.follower_client.force_login(self.follower)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_cached_profile_without_queries(self):
+        first = self.client.get(self.PROFILE_URL)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.PROFILE_URL)
+        self.assertEqual(first.content, second.content)
+        self.assertContains(second, 'Всего постов: 12')
+
+    def test_follow_button_per_viewer(self):
+        """Страница общая, кнопка подписки — своя у каждого зрителя."""
+        self.follower_client.get(self.PROFILE_URL)
+        # Остаётся только проверка подписки этого зрителя.
+        with self.assertNumQueries(1):
+            response = self.follower_client.get(self.PROFILE_URL)
+        self.assertContains(response, 'Отписаться')
+        response = self.reader_client.get(self.PROFILE_URL)
+        self.assertContains(response, 'Подписаться')
+        self.assertContains(response, 'Пост 11<')
+
+    def test_post_changes_invalidate_profile(self):
+        self.client.get(self.PROFILE_URL)
+        post = Post.objects.create(author=self.author, text='Новый пост')
+        self.assertContains(self.client.get(self.PROFILE_URL), 'Новый пост')
+        post.text = 'Исправленный пост'
+        post.save()
+        response = self.client.get(self.PROFILE_URL)
+        self.assertContains(response, 'Исправленный пост')
+        self.assertContains(response, 'Всего постов: 13')
+        post.delete()
+        response = self.client.get(self.PROFILE_URL)
+        self.assertNotContains(response, 'Исправленный пост')
+        self.assertContains(response, 'Всего постов: 12')
+
+    def test_other_author_post_keeps_cache(self):
+        self.client.get(self.PROFILE_URL)
+        Post.objects.create(author=self.reader, text='Чужой пост')
+        with self.assertNumQueries(0):
+            self.client.get(self.PROFILE_URL)
+
+    def test_profile_change_invalidates(self):
+        self.client.get(self.PROFILE_URL)
+        self.author.first_name = 'Пётр'
+        self.author.save()
+        self.assertContains(self.client.get(self.PROFILE_URL), 'Пётр')
+        self.author.username = 'renamed'
+        self.author.save()
+        self.assertEqual(self.client.get(self.PROFILE_URL).status_code, 404)
+
+    def test_login_keeps_version(self):
+        version = feed_version(f'author:{self.author.pk}')
+        update_last_login(None, self.author)
+        self.assertEqual(feed_version(f'author:{self.author.pk}'), version)
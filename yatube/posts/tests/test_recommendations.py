@@ -0,0 +1,127 @@
+import os
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from .. import recommendations
+from ..models import Follow, Group, Post, User
+
+
+def usernames(items):
+    return [item['username'] for item in items]
+
+
+class RecommendationsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Abramow_test')
+        cls.friend = User.objects.create_user(username='friend')
+        cls.popular = User.objects.create_user(
+            username='popular', first_name='Иван', last_name='Попов'
+        )
+        cls.niche = User.objects.create_user(username='niche')
+        cls.neighbour = User.objects.create_user(username='neighbour')
+        cls.stranger = User.objects.create_user(username='stranger')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test-slug', description='-'
+        )
+        other = User.objects.create_user(username='other')
+        Follow.objects.bulk_create([
+            Follow(user=cls.user, author=cls.friend),
+            Follow(user=cls.friend, author=cls.popular),
+            Follow(user=cls.friend, author=cls.niche),
+            Follow(user=cls.friend, author=cls.user),
+            Follow(user=other, author=cls.popular),
+            Follow(user=cls.user, author=other),
+        ])
+        Post.objects.bulk_create([
+            Post(author=cls.friend, text='Пост', group=cls.group),
+            Post(author=cls.neighbour, text='Пост', group=cls.group),
+            Post(author=cls.stranger, text='Пост'),
+        ])
+
+    def setUp(self):
+        cache.clear()
+        recommendations.store().clear()
+
+    def test_compute(self):
+        """Друзья друзей по числу путей, затем авторы общих сообществ."""
+        call_command('compute_recommendations', stdout=StringIO())
+        result = recommendations.get_recommendations(self.user.pk)
+        self.assertEqual(
+            usernames(result), ['popular', 'niche', 'neighbour']
+        )
+        self.assertEqual(result[0]['name'], 'Иван Попов')
+        self.assertEqual(result[0]['score'], 2)
+
+    def test_command_warns_on_local_cache(self):
+        """Команда предупреждает, что LocMem-кэш не виден воркерам."""
+        err = StringIO()
+        call_command('compute_recommendations', stdout=StringIO(), stderr=err)
+        self.assertIn('LocMem', err.getvalue())
+
+    def test_shared_cache(self):
+        """С общим кэшем результат команды виден другим процессам."""
+        location = os.path.join(settings.MEDIA_ROOT, 'recommendations')
+        shared = {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': location,
+        }
+        with self.settings(CACHES={**settings.CACHES, 'shared': shared},
+                           RECOMMENDATIONS_CACHE='shared'):
+            err = StringIO()
+            call_command(
+                'compute_recommendations', stdout=StringIO(), stderr=err
+            )
+        self.assertEqual(err.getvalue(), '')
+        # Отдельный экземпляр кэша — как у веб-воркера.
+        worker_cache = FileBasedCache(location, {})
+        self.assertEqual(
+            usernames(worker_cache.get(
+                recommendations.recommendations_key(self.user.pk)
+            )),
+            ['popular', 'niche', 'neighbour'],
+        )
+
+    def test_top_k(self):
+        recommendations.compute(count=1)
+        self.assertEqual(
+            usernames(recommendations.get_recommendations(self.user.pk)),
+            ['popular'],
+        )
+
+    def test_single_lookup(self):
+        recommendations.compute()
+        with self.assertNumQueries(0):
+            recommendations.get_recommendations(self.user.pk)
+
+    def test_follow_updates_incrementally(self):
+        recommendations.compute()
+        Follow.objects.create(user=self.user, author=self.niche)
+        self.assertEqual(
+            usernames(recommendations.get_recommendations(self.user.pk)),
+            ['popular', 'neighbour'],
+        )
+        client = Client()
+        client.force_login(self.stranger)
+        client.get(
+            reverse('posts:profile_follow', kwargs={'username': 'friend'})
+        )
+        self.assertEqual(
+            usernames(recommendations.get_recommendations(self.stranger.pk)),
+            ['Abramow_test', 'popular', 'niche'],
+        )
+
+    def test_follow_page(self):
+        recommendations.compute()
+        client = Client()
+        client.force_login(self.user)
+        response = client.get(reverse('posts:follow_index'))
+        self.assertContains(response, 'Кого почитать')
+        self.assertContains(response, 'Иван Попов')
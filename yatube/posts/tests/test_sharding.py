@@ -0,0 +1,338 @@
+from django.contrib.admin import ACTION_CHECKBOX_NAME
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.management.commands.loadtest import Command as LoadTestCommand
+
+from .. import jobs, notifications, sharding
+from ..models import BulkJob, Comment, Follow, Group, Notification, Post
+from ..models import PostScore, User
+from ..trending import bump
+
+SHARDS = ['shard_0', 'shard_1', 'shard_2']
+FEED_KEY = sharding.FEED_KEY
+
+
+@override_settings(POST_SHARDS=SHARDS, QUERY_BUDGET_MODE=None)
+class ShardingTests(TestCase):
+    databases = {DEFAULT_DB_ALIAS, *SHARDS}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.authors = [
+            User.objects.create_user(username=f'author{i}') for i in range(3)
+        ]
+        cls.reader = User.objects.create_user(username='reader')
+        cls.posts = [
+            cls.authors[i % 3].posts.create(
+                text=f'Пост {i}', group=cls.group if i % 2 else None
+            )
+            for i in range(15)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        notifications.queue.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def newest_first(self, posts):
+        return [
+            post.pk for post in sorted(posts, key=FEED_KEY, reverse=True)
+        ]
+
+    def feed_ids(self, url, pages):
+        ids = []
+        for page in range(1, pages + 1):
+            response = self.reader_client.get(url, {'page': page})
+            ids.extend(post.pk for post in response.context['page_obj'])
+        return ids
+
+    def test_posts_placed_by_author(self):
+        """Пост лежит только в шарде автора, номер шарда — в его id."""
+        for post in self.posts:
+            alias = sharding.shard_for_author(post.author_id)
+            with self.subTest(post=post.pk):
+                self.assertEqual(SHARDS[post.pk % len(SHARDS)], alias)
+                self.assertEqual(
+                    [
+                        name for name in [DEFAULT_DB_ALIAS, *SHARDS]
+                        if Post.objects.using(name).filter(
+                            pk=post.pk
+                        ).exists()
+                    ],
+                    [alias],
+                )
+
+    def test_users_and_groups_replicated(self):
+        """Пользователи и сообщества копируются в каждый шард."""
+        self.reader.first_name = 'Читатель'
+        self.reader.save()
+        for alias in SHARDS:
+            with self.subTest(alias=alias):
+                self.assertEqual(
+                    User.objects.using(alias).get(pk=self.reader.pk)
+                    .first_name,
+                    'Читатель',
+                )
+                self.assertTrue(
+                    Group.objects.using(alias).filter(
+                        pk=self.group.pk
+                    ).exists()
+                )
+
+    def test_comment_colocated_with_post(self):
+        """Комментарий и рейтинг поста пишутся в шард поста."""
+        post = self.posts[4]
+        self.reader_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': post.pk}),
+            {'text': 'Комментарий'},
+        )
+        alias = sharding.shard_for_post(post.pk)
+        self.assertTrue(
+            Comment.objects.using(alias).filter(post_id=post.pk).exists()
+        )
+        self.assertTrue(
+            PostScore.objects.using(alias).filter(post_id=post.pk).exists()
+        )
+        self.assertFalse(Comment.objects.exists())
+
+    def test_index_merges_shards(self):
+        """Главная лента — слияние шардов по дате, на всех страницах."""
+        self.assertEqual(
+            self.feed_ids(reverse('posts:index'), 2),
+            self.newest_first(self.posts),
+        )
+
+    def test_group_and_follow_feeds(self):
+        """Ленты сообщества и подписок собираются из нужных шардов."""
+        self.assertEqual(
+            self.feed_ids(reverse('posts:group_posts', args=['group']), 1),
+            self.newest_first(
+                post for post in self.posts if post.group_id
+            ),
+        )
+        for author in self.authors[:2]:
+            Follow.objects.create(user=self.reader, author=author)
+        self.assertEqual(
+            self.feed_ids(reverse('posts:follow_index'), 1),
+            self.newest_first(
+                post for post in self.posts
+                if post.author in self.authors[:2]
+            ),
+        )
+
+    def test_trending_merges_by_score(self):
+        """Популярное сливает шарды по рейтингу."""
+        bump(self.posts[0].pk, 1)
+        bump(self.posts[1].pk, 4)
+        bump(self.posts[2].pk, 2)
+        response = self.reader_client.get(reverse('posts:trending'))
+        self.assertEqual(
+            [post.pk for post in response.context['page_obj']],
+            [self.posts[1].pk, self.posts[2].pk, self.posts[0].pk],
+        )
+
+    def assert_one_shard(self, url, alias):
+        others = [name for name in SHARDS if name != alias]
+        contexts = [
+            CaptureQueriesContext(connections[name]) for name in others
+        ]
+        for context in contexts:
+            context.__enter__()
+        try:
+            response = self.reader_client.get(url)
+        finally:
+            for context in contexts:
+                context.__exit__(None, None, None)
+        self.assertEqual(response.status_code, 200)
+        for name, context in zip(others, contexts):
+            with self.subTest(alias=name):
+                self.assertEqual(len(context), 0)
+        return response
+
+    def test_profile_and_post_detail_read_one_shard(self):
+        """Профиль и страница поста обращаются только к своему шарду."""
+        author = self.authors[1]
+        alias = sharding.shard_for_author(author.pk)
+        response = self.assert_one_shard(
+            reverse('posts:profile', args=[author.username]), alias
+        )
+        self.assertEqual(response.context['page_obj'].paginator.count, 5)
+        post = self.posts[1]
+        response = self.assert_one_shard(
+            reverse('posts:post_detail', kwargs={'post_id': post.pk}), alias
+        )
+        self.assertEqual(response.context['post'], post)
+        self.assertEqual(response.context['post_count'], 5)
+
+    def test_notification_post_from_shard(self):
+        """Уведомление в default показывает пост из шарда."""
+        post = self.posts[2]
+        self.reader_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': post.pk}),
+            {'text': 'Комментарий'},
+        )
+        notifications.drain()
+        self.assertTrue(Notification.objects.filter(post_id=post.pk).exists())
+        author_client = Client()
+        author_client.force_login(post.author)
+        response = author_client.get(reverse('posts:notifications'))
+        self.assertEqual(response.context['notifications'][0].post, post)
+
+    def test_user_delete_cascades_into_shard(self):
+        """Удаление автора удаляет его посты и комментарии в шардах."""
+        author = self.authors[0]
+        alias = sharding.shard_for_author(author.pk)
+        post = self.posts[3]
+        post.comments.create(author=self.reader, text='Комментарий')
+        author.delete()
+        for name in SHARDS:
+            with self.subTest(alias=name):
+                self.assertFalse(
+                    User.objects.using(name).filter(pk=author.pk).exists()
+                )
+        self.assertFalse(
+            Post.objects.using(alias).filter(author_id=author.pk).exists()
+        )
+        self.assertFalse(
+            Comment.objects.using(alias).filter(post_id=post.pk).exists()
+        )
+
+    def test_bulk_created_user_replicated_on_write(self):
+        """Пользователь из bulk_create попадает в шард с первым постом."""
+        User.objects.bulk_create([User(username='bulk')])
+        user = User.objects.get(username='bulk')
+        alias = sharding.shard_for_author(user.pk)
+        self.assertFalse(User.objects.using(alias).filter(pk=user.pk).exists())
+        post = user.posts.create(text='Пост', group=self.group)
+        self.assertTrue(User.objects.using(alias).filter(pk=user.pk).exists())
+        other = self.posts[(user.pk + 1) % len(SHARDS)]
+        client = Client()
+        client.force_login(user)
+        client.post(
+            reverse('posts:add_comment', kwargs={'post_id': other.pk}),
+            {'text': 'Комментарий'},
+        )
+        other_alias = sharding.shard_for_post(other.pk)
+        self.assertNotEqual(other_alias, alias)
+        self.assertTrue(
+            Comment.objects.using(other_alias).filter(author=user).exists()
+        )
+        self.assertTrue(
+            User.objects.using(other_alias).filter(pk=user.pk).exists()
+        )
+        self.assertEqual(sharding.shard_for_post(post.pk), alias)
+
+    def test_loadtest_accounts_replicated(self):
+        """Аккаунты нагрузочного теста копируются во все шарды."""
+        accounts = LoadTestCommand().accounts(2, 'password')
+        names = [name for name, _ in accounts]
+        for alias in SHARDS:
+            with self.subTest(alias=alias):
+                self.assertEqual(
+                    User.objects.using(alias).filter(
+                        username__in=names
+                    ).count(),
+                    2,
+                )
+
+    def admin_client(self):
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        client = Client()
+        client.force_login(admin)
+        return client
+
+    def test_admin_search_and_reassign_in_shard(self):
+        """Поиск и массовый перенос в админке работают в выбранном шарде."""
+        client = self.admin_client()
+        alias = SHARDS[1]
+        url = reverse('admin:posts_post_changelist')
+        expected = [
+            post.pk for post in self.posts
+            if sharding.shard_for_post(post.pk) == alias
+        ]
+        response = client.get(url, {'shard': alias, 'q': 'пост'})
+        self.assertCountEqual(
+            [post.pk for post in response.context['cl'].result_list],
+            expected,
+        )
+        target = Group.objects.create(title='Новая группа', slug='new')
+        client.post(f'{url}?shard={alias}', {
+            'action': 'bulk_reassign_group',
+            ACTION_CHECKBOX_NAME: expected,
+            'group': target.pk,
+        })
+        self.assertEqual(BulkJob.objects.get().database, alias)
+        jobs.run_pending()
+        self.assertCountEqual(
+            Post.objects.using(alias).filter(group=target)
+            .values_list('pk', flat=True),
+            expected,
+        )
+
+    def test_admin_delete_comments_in_shard(self):
+        """id комментариев повторяются в шардах: удаляются только свои."""
+        for post in self.posts[:2]:
+            post.comments.create(author=self.reader, text='Комментарий')
+        first, second = (
+            sharding.shard_for_post(post.pk) for post in self.posts[:2]
+        )
+        pks = list(
+            Comment.objects.using(first).values_list('pk', flat=True)
+        )
+        self.assertEqual(
+            pks, list(Comment.objects.using(second).values_list(
+                'pk', flat=True
+            ))
+        )
+        client = self.admin_client()
+        client.post(
+            reverse('admin:posts_comment_changelist') + f'?shard={first}',
+            {'action': 'bulk_delete', ACTION_CHECKBOX_NAME: pks},
+        )
+        jobs.run_pending()
+        self.assertFalse(Comment.objects.using(first).exists())
+        self.assertTrue(Comment.objects.using(second).exists())
+
+    def test_admin_change_form_finds_post_in_shard(self):
+        post = self.posts[2]
+        response = self.admin_client().get(
+            reverse('admin:posts_post_change', args=(post.pk,))
+        )
+        self.assertEqual(response.context['original'], post)
+
+    def test_post_delete_removes_notifications(self):
+        """Удаление поста в шарде удаляет его уведомления в default."""
+        post = self.posts[5]
+        self.reader_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': post.pk}),
+            {'text': 'Комментарий'},
+        )
+        notifications.drain()
+        self.assertTrue(Notification.objects.filter(post_id=post.pk).exists())
+        Post.objects.using(sharding.shard_for_post(post.pk)).filter(
+            pk=post.pk
+        ).delete()
+        self.assertFalse(
+            Notification.objects.filter(post_id=post.pk).exists()
+        )
+
+    def test_loadtest_paths_from_all_shards(self):
+        """Нагрузочный тест обходит последние посты всех шардов."""
+        paths = LoadTestCommand().paths(6)
+        newest = sorted(self.posts, key=lambda post: post.pk)[-6:]
+        self.assertCountEqual(
+            paths['post'],
+            [
+                reverse('posts:post_detail', args=(post.pk,))
+                for post in newest
+            ],
+        )
@@ -0,0 +1,53 @@
+import datetime as dt
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Comment, Follow, Post, PostScore, User
+from ..trending import bump
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Abramow_test')
+        cls.reader = User.objects.create_user(username='reader')
+        cls.old_post = Post.objects.create(author=cls.author, text='Старый')
+        cls.new_post = Post.objects.create(author=cls.author, text='Новый')
+        cls.quiet_post = Post.objects.create(author=cls.author, text='Тихий')
+        cls.TRENDING_URL = reverse('posts:trending')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_comment_and_follow_update_score(self):
+        """Комментарий и подписка на автора повышают рейтинг поста."""
+        Comment.objects.create(
+            post=self.old_post, author=self.reader, text='Комментарий'
+        )
+        first = PostScore.objects.get(post=self.old_post).score
+        Comment.objects.create(
+            post=self.old_post, author=self.reader, text='Комментарий'
+        )
+        self.assertGreater(
+            PostScore.objects.get(post=self.old_post).score, first
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+        self.assertTrue(
+            PostScore.objects.filter(post=self.quiet_post).exists()
+        )
+
+    def test_old_events_decay(self):
+        """Два старых комментария весят меньше одного свежего."""
+        week_ago = timezone.now() - dt.timedelta(days=7)
+        bump(self.old_post.pk, 1, week_ago)
+        bump(self.old_post.pk, 1, week_ago)
+        bump(self.new_post.pk, 1)
+        response = self.client.get(self.TRENDING_URL)
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.new_post, self.old_post],
+        )
@@ -4,6 +4,8 @@ from django.contrib.auth import get_user_model
 from django.core.cache import cache
 from django.test import Client, TestCase
 
+from core.testing import QueryBudgetMixin
+
 from ..models import Group, Post
 
 User = get_user_model()
@@ -101,3 +103,40 @@ class PostURLTests(TestCase):
         """Страница /unexisting_page/ доступна любому пользователю."""
         response = self.client.get('/unexisting_pages/')
         self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class QueryBudgetURLTests(QueryBudgetMixin, TestCase):
+    """Адреса из тестов выше укладываются в бюджет запросов."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            description='Тестовое описание',
+            slug='slug',
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.user, text=f'Пост {i}', group=cls.group)
+            for i in range(12)
+        )
+        cls.post = Post.objects.first()
+        cls.public_urls = [
+            '/',
+            f'/group/{cls.group.slug}/',
+            f'/profile/{cls.user.username}/',
+            f'/posts/{cls.post.id}/',
+        ]
+        cls.private_urls = ['/create/', f'/posts/{cls.post.id}/edit/']
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_urls_within_budget(self):
+        for address in self.public_urls + self.private_urls:
+            for client in (self.client, self.authorized_client):
+                with self.subTest(address=address, client=client):
+                    cache.clear()
+                    self.assertQueryBudget(address, client)
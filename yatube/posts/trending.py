@@ -0,0 +1,69 @@
+import math
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import sharding
+from .models import Post, PostScore
+from .paginator import invalidate_feeds
+
+
+def event_score(weight, when=None):
+    """log2 вклада события: вес, растущий вдвое каждый период полураспада."""
+    when = when or timezone.now()
+    age = (when - settings.TRENDING_EPOCH).total_seconds()
+    return math.log2(weight) + age / settings.TRENDING_HALF_LIFE
+
+
+def log2_add(a, b):
+    """log2(2 ** a + 2 ** b) без переполнения."""
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def bump(post_id, weight, when=None):
+    """Добавляет событие к рейтингу поста: одно обновление по индексу."""
+    delta = event_score(weight, when)
+    # Рейтинг лежит рядом с постом, в его шарде.
+    alias = sharding.shard_for_post(post_id)
+    with transaction.atomic(using=alias):
+        score = (
+            PostScore.objects.using(alias).select_for_update()
+            .filter(post_id=post_id).first()
+        )
+        if score is None:
+            PostScore.objects.using(alias).create(
+                post_id=post_id, score=delta
+            )
+            invalidate_feeds('trending')
+            return
+        score.score = log2_add(score.score, delta)
+        score.save(update_fields=('score',))
+
+
+def bump_latest_post(author_id, weight, when=None):
+    """Подписка на автора поднимает его последний пост."""
+    post_id = (
+        sharding.for_author(Post.objects, author_id)
+        .filter(author_id=author_id)
+        .values_list('pk', flat=True).first()
+    )
+    if post_id is not None:
+        bump(post_id, weight, when)
+
+
+def trending_posts():
+    posts = (
+        Post.objects.filter(score__isnull=False)
+        .select_related('author', 'group')
+    )
+    if not sharding.shards():
+        return posts.order_by('-score__score')
+    # Рейтинги шардов сравнимы между собой: сливаются по нему же.
+    return sharding.feed(
+        posts.annotate(rank=F('score__score')),
+        order=('-rank', '-pk'), key=attrgetter('rank', 'pk'),
+    )
@@ -1,14 +1,39 @@
 from django.urls import path
 
-from . import views
+from . import follows, views
 
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('trending/', views.trending, name='trending'),
     path('group/<slug:slug>/', views.group_posts, name='group_posts'),
     # Профайл пользователя
     path('profile/<str:username>/', views.profile, name='profile'),
+    path(
+        'profile/<str:username>/followers/',
+        views.follow_list,
+        {'kind': follows.FOLLOWERS},
+        name='followers',
+    ),
+    path(
+        'profile/<str:username>/following/',
+        views.follow_list,
+        {'kind': follows.FOLLOWING},
+        name='following',
+    ),
+    path(
+        'profile/<str:username>/followers/json/',
+        views.follow_list_json,
+        {'kind': follows.FOLLOWERS},
+        name='followers_json',
+    ),
+    path(
+        'profile/<str:username>/following/json/',
+        views.follow_list_json,
+        {'kind': follows.FOLLOWING},
+        name='following_json',
+    ),
     # Просмотр записи
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
@@ -19,6 +44,11 @@ urlpatterns = [
         name='add_comment',
     ),
     path('follow/', views.follow_index, name='follow_index'),
+    path(
+        'notifications/',
+        views.notification_inbox,
+        name='notifications',
+    ),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
@@ -1,49 +1,229 @@
+import hashlib
+from functools import partial
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.db.models import Count, Max
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
+from django.utils.functional import SimpleLazyObject
+from django.views.decorators.cache import cache_control, cache_page
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
 
+from core.querybudget import query_budget
+from core.streaming import stream_render
 
+from . import comment_buffer, follows, notifications, sharding
+from . import trending as ranking
+from .authors import get_author_or_404
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post, User
+from .groups import get_group_or_404, groups_version
+from .models import Follow, Post, User
+from .paginator import FeedPaginator, feed_version, parse_cursor
+from .recommendations import get_recommendations
 
 
 LENGTH = 10
 
 
-def get_page_context(queryset, request):
-    return Paginator(queryset, LENGTH).get_page(request.GET.get('page'))
+def get_page_context(queryset, request, feed, timeout=None):
+    paginator = FeedPaginator(queryset, LENGTH, feed=feed, timeout=timeout)
+    return paginator.get_page(request.GET.get('page'))
+
+
+def page_cache_context(request, version):
+    """Ключ кэша фрагмента страницы ленты: версия ленты и номер страницы."""
+    page = request.GET.get('page', '')
+    return {
+        'page_cache_timeout': settings.FEED_PAGE_CACHE_TIMEOUT,
+        'feed_version': version,
+        'page_number': page if page.isdigit() else '1',
+    }
+
+
+def render_feed(request, template_name, context, get_page, lazy=False):
+    """Рендер ленты.
 
+    Страница постов выбирается лениво в потоковом режиме и для лент
+    с кэшем фрагмента (lazy): при попадании в кэш запроса к ленте нет.
+    """
+    if settings.FEED_STREAMING or lazy:
+        context['page_obj'] = SimpleLazyObject(get_page)
+    else:
+        context['page_obj'] = get_page()
+    if settings.FEED_STREAMING:
+        return stream_render(request, template_name, context)
+    return render(request, template_name, context)
 
+
+@query_budget(5)
 @cache_page(20 * 15)
 def index(request):
     return render(request, 'posts/index.html', {
-        'page_obj': get_page_context(Post.objects.all(), request),
+        'page_obj': get_page_context(
+            sharding.feed(Post.objects.select_related('author', 'group')),
+            request, 'index',
+        ),
     })
 
 
-def group_posts(request, slug):
-    group: str = get_object_or_404(Group, slug=slug)
-    return render(request, 'posts/group_list.html', {
-        'group': group,
+@query_budget(5)
+@cache_page(settings.TRENDING_CACHE_TIMEOUT)
+def trending(request):
+    return render(request, 'posts/trending.html', {
         'page_obj': get_page_context(
-            group.posts.select_related('author'), request),
+            ranking.trending_posts(), request, 'trending'),
+        'trending': True,
     })
 
 
+@query_budget(6)
+def group_posts(request, slug):
+    group = get_group_or_404(slug)
+    feed = f'group:{group.pk}'
+    return render_feed(request, 'posts/group_list.html', {
+        'group': group,
+        **page_cache_context(request, feed_version(feed)),
+    }, partial(
+        get_page_context,
+        sharding.feed(group.posts.select_related('author')), request, feed,
+    ), lazy=True)
+
+
+@query_budget(6)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    return render(request, 'posts/profile.html', {
+    author, version = get_author_or_404(username)
+    # Кнопка подписки — единственная часть страницы, своя у каждого
+    # зрителя; остальное берётся из общего для всех кэша.
+    following = (
+        request.user.is_authenticated
+        and request.user != author
+        and Follow.objects.filter(user=request.user, author=author).exists()
+    )
+    return render_feed(request, 'posts/profile.html', {
         'author': author,
-        'page_obj': get_page_context(author.posts.all(), request),
+        'following': following,
+        # Посты в кэше показывают названия сообществ.
+        'groups_version': groups_version(),
+        **page_cache_context(request, version),
+    }, partial(
+        get_page_context,
+        author.posts.select_related('group'), request, f'author:{author.pk}',
+    ), lazy=True)
+
+
+def follow_list_context(request, username, kind):
+    author, _ = get_author_or_404(username)
+    users, next_cursor = follows.follow_page(
+        kind, author.pk, parse_cursor(request.GET.get('cursor'))
+    )
+    return {
+        'author': author,
+        'kind': kind,
+        'users': users,
+        'count': follows.follow_count(kind, author.pk),
+        'next_cursor': next_cursor,
+    }
+
+
+@query_budget(6)
+def follow_list(request, username, kind):
+    return render(
+        request, 'posts/follow_list.html',
+        follow_list_context(request, username, kind),
+    )
+
+
+@query_budget(5)
+def follow_list_json(request, username, kind):
+    context = follow_list_context(request, username, kind)
+    next_url = None
+    if context['next_cursor'] is not None:
+        next_url = f"{request.path}?cursor={context['next_cursor']}"
+    return JsonResponse({
+        'count': context['count'],
+        'results': [
+            {
+                'id': user.pk,
+                'username': user.username,
+                'name': user.get_full_name(),
+            }
+            for user in context['users']
+        ],
+        'next': next_url,
     })
 
 
+def post_state(request, post_id):
+    """Всё, от чего зависит страница поста, одним запросом.
+
+    Время последнего комментария и их число берутся из индекса
+    (post, created); результат запоминается на время запроса.
+    """
+    if not hasattr(request, '_post_state'):
+        request._post_state = (
+            sharding.for_post(Post.objects, post_id).filter(pk=post_id)
+            .values_list('updated_at', 'author_id')
+            .annotate(
+                last_comment=Max('comments__created'),
+                comments_count=Count('comments'),
+            )
+            .order_by()
+            .first()
+        )
+    return request._post_state
+
+
+def post_etag(request, post_id):
+    state = post_state(request, post_id)
+    if state is None:
+        return None
+    updated_at, author_id, last_comment, comments_count = state
+    # Страница своя у каждого пользователя: форма комментария, кнопка
+    # редактирования, шапка. Версии ленты автора и сообществ меняются
+    # вместе с числом его постов, его именем и названиями сообществ.
+    parts = (
+        post_id, updated_at, last_comment, comments_count,
+        request.user.pk, feed_version(f'author:{author_id}'),
+        groups_version(), pending_ids(request, post_id),
+    )
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def pending_ids(request, post_id):
+    if not settings.COMMENT_BUFFER or not request.user.is_authenticated:
+        return ()
+    return tuple(
+        comment.pending_id
+        for comment in comment_buffer.pending_comments(request, post_id)
+    )
+
+
+def post_last_modified(request, post_id):
+    state = post_state(request, post_id)
+    if state is None:
+        return None
+    updated_at, _, last_comment, _ = state
+    return max(filter(None, (updated_at, last_comment)))
+
+
+@query_budget(8)
+@vary_on_cookie
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=post_etag, last_modified_func=post_last_modified)
 def post_detail(request, post_id):
     form = CommentForm(request.POST or None)
-    related = Post.objects.select_related('author', 'group')
+    related = sharding.for_post(Post.objects, post_id).select_related(
+        'author', 'group'
+    )
     post = get_object_or_404(related, pk=post_id)
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
+    if pending_ids(request, post_id):
+        # Свои комментарии из очереди автор видит до записи в базу.
+        comments = [
+            *comment_buffer.pending_comments(request, post_id), *comments
+        ]
     post_count = post.author.posts.count()
     context = {
         'post': post,
@@ -54,6 +234,7 @@ def post_detail(request, post_id):
     return render(request, 'posts/post_detail.html', context)
 
 
+@query_budget(6)
 @login_required
 def post_create(request):
     form = PostForm(
@@ -68,9 +249,11 @@ def post_create(request):
     return redirect('posts:profile', username=post.author)
 
 
+@query_budget(8)
 @login_required
 def post_edit(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_object_or_404(sharding.for_post(Post.objects, post_id),
+                             id=post_id)
     if request.user != post.author:
         return redirect('posts:post_detail', post_id)
     form = PostForm(
@@ -87,10 +270,19 @@ def post_edit(request, post_id):
     })
 
 
+@query_budget(9)
 @login_required
 def add_comment(request, post_id):
     form = CommentForm(request.POST or None)
-    post = get_object_or_404(Post, id=post_id)
+    if settings.COMMENT_BUFFER:
+        posts = sharding.for_post(Post.objects, post_id)
+        if not posts.filter(pk=post_id).exists():
+            raise Http404('Пост не найден')
+        if form.is_valid():
+            comment_buffer.enqueue(request, post_id, form.cleaned_data['text'])
+        return redirect('posts:post_detail', post_id=post_id)
+    post = get_object_or_404(sharding.for_post(Post.objects, post_id),
+                             id=post_id)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
@@ -99,15 +291,52 @@ def add_comment(request, post_id):
     return redirect('posts:post_detail', post_id=post_id)
 
 
+@query_budget(5)
 @login_required
 def follow_index(request):
-    posts = Post.objects.filter(author__following__user=request.user)
+    if sharding.shards():
+        # Подписки лежат в default: авторы отдельным запросом, посты —
+        # только из их шардов.
+        author_ids = list(
+            Follow.objects.filter(user=request.user)
+            .values_list('author_id', flat=True)
+        )
+        posts = sharding.feed(
+            Post.objects.filter(author_id__in=author_ids)
+            .select_related('author', 'group'),
+            author_ids,
+        )
+    else:
+        posts = Post.objects.filter(
+            author__following__user=request.user
+        ).select_related('author', 'group')
     context = {
-        'page_obj': get_page_context(posts, request),
+        'recommendations': get_recommendations(request.user.pk),
     }
-    return render(request, 'posts/follow.html', context)
+    return render_feed(request, 'posts/follow.html', context, partial(
+        get_page_context, posts, request, f'follow:{request.user.pk}',
+        settings.FOLLOW_FEED_COUNT_TIMEOUT,
+    ))
+
+
+@query_budget(5)
+@login_required
+def notification_inbox(request):
+    """Уведомления пользователя, новые сверху.
+
+    Открытая первая страница отмечает все уведомления прочитанными.
+    """
+    cursor = parse_cursor(request.GET.get('cursor'))
+    items, next_cursor = notifications.inbox_page(request.user.pk, cursor)
+    if cursor is None:
+        notifications.mark_read(request.user.pk)
+    return render(request, 'posts/notifications.html', {
+        'notifications': items,
+        'next_cursor': next_cursor,
+    })
 
 
+@query_budget(14)
 @login_required
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
@@ -116,6 +345,7 @@ def profile_follow(request, username):
     return redirect('posts:follow_index')
 
 
+@query_budget(6)
 @login_required
 def profile_unfollow(request, username):
     author = get_object_or_404(User, username=username)
@@ -0,0 +1,175 @@
+BEGIN TRANSACTION;
+CREATE TABLE "auth_group" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "name" varchar(150) NOT NULL UNIQUE);
+CREATE TABLE "auth_group_permissions" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "group_id" integer NOT NULL REFERENCES "auth_group" ("id") DEFERRABLE INITIALLY DEFERRED, "permission_id" integer NOT NULL REFERENCES "auth_permission" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE TABLE "auth_permission" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "content_type_id" integer NOT NULL REFERENCES "django_content_type" ("id") DEFERRABLE INITIALLY DEFERRED, "codename" varchar(100) NOT NULL, "name" varchar(255) NOT NULL);
+CREATE TABLE "auth_user" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "password" varchar(128) NOT NULL, "last_login" datetime NULL, "is_superuser" bool NOT NULL, "username" varchar(150) NOT NULL UNIQUE, "first_name" varchar(30) NOT NULL, "email" varchar(254) NOT NULL, "is_staff" bool NOT NULL, "is_active" bool NOT NULL, "date_joined" datetime NOT NULL, "last_name" varchar(150) NOT NULL);
+CREATE TABLE "auth_user_groups" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "user_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "group_id" integer NOT NULL REFERENCES "auth_group" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE TABLE "auth_user_user_permissions" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "user_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "permission_id" integer NOT NULL REFERENCES "auth_permission" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE TABLE "django_admin_log" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "action_time" datetime NOT NULL, "object_id" text NULL, "object_repr" varchar(200) NOT NULL, "change_message" text NOT NULL, "content_type_id" integer NULL REFERENCES "django_content_type" ("id") DEFERRABLE INITIALLY DEFERRED, "user_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "action_flag" smallint unsigned NOT NULL CHECK ("action_flag" >= 0));
+CREATE TABLE "django_content_type" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "app_label" varchar(100) NOT NULL, "model" varchar(100) NOT NULL);
+CREATE TABLE "django_migrations" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "app" varchar(255) NOT NULL, "name" varchar(255) NOT NULL, "applied" datetime NOT NULL);
+CREATE TABLE "django_session" ("session_key" varchar(40) NOT NULL PRIMARY KEY, "session_data" text NOT NULL, "expire_date" datetime NOT NULL);
+CREATE TABLE "posts_bulkjob" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "action" varchar(20) NOT NULL, "object_ids" text NOT NULL, "status" varchar(20) NOT NULL, "total" integer unsigned NOT NULL CHECK ("total" >= 0), "processed" integer unsigned NOT NULL CHECK ("processed" >= 0), "result" varchar(255) NOT NULL, "error" text NOT NULL, "created" datetime NOT NULL, "finished" datetime NULL, "content_type_id" integer NOT NULL REFERENCES "django_content_type" ("id") DEFERRABLE INITIALLY DEFERRED, "created_by_id" integer NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "group_id" integer NULL REFERENCES "posts_group" ("id") DEFERRABLE INITIALLY DEFERRED, "database" varchar(100) NOT NULL);
+CREATE TABLE "posts_comment" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "text" text NOT NULL, "created" datetime NOT NULL, "author_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "post_id" integer NOT NULL REFERENCES "posts_post" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE TABLE "posts_follow" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "author_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "user_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED);
+CREATE TABLE "posts_group" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "title" varchar(200) NOT NULL, "slug" varchar(50) NOT NULL UNIQUE, "description" text NOT NULL);
+CREATE TABLE "posts_notification" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "kind" varchar(20) NOT NULL, "count" integer unsigned NOT NULL CHECK ("count" >= 0), "is_read" bool NOT NULL, "created" datetime NOT NULL, "actor_id" integer NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "recipient_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "post_id" integer NULL);
+CREATE TABLE "posts_post" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "text" text NOT NULL, "pub_date" datetime NOT NULL, "author_id" integer NOT NULL REFERENCES "auth_user" ("id") DEFERRABLE INITIALLY DEFERRED, "group_id" integer NULL REFERENCES "posts_group" ("id") DEFERRABLE INITIALLY DEFERRED, "image" varchar(100) NOT NULL, "updated_at" datetime NOT NULL);
+CREATE TABLE "posts_postscore" ("post_id" integer NOT NULL PRIMARY KEY REFERENCES "posts_post" ("id") DEFERRABLE INITIALLY DEFERRED, "score" real NOT NULL);
+CREATE TABLE "posts_shardsequence" ("id" integer NOT NULL PRIMARY KEY AUTOINCREMENT, "value" bigint NOT NULL);
+CREATE TABLE "thumbnail_kvstore" ("key" varchar(200) NOT NULL PRIMARY KEY, "value" text NOT NULL);
+CREATE UNIQUE INDEX "auth_group_permissions_group_id_permission_id_0cd325b0_uniq" ON "auth_group_permissions" ("group_id", "permission_id");
+CREATE INDEX "auth_group_permissions_group_id_b120cbf9" ON "auth_group_permissions" ("group_id");
+CREATE INDEX "auth_group_permissions_permission_id_84c5c92e" ON "auth_group_permissions" ("permission_id");
+CREATE UNIQUE INDEX "auth_user_groups_user_id_group_id_94350c0c_uniq" ON "auth_user_groups" ("user_id", "group_id");
+CREATE INDEX "auth_user_groups_user_id_6a12ed8b" ON "auth_user_groups" ("user_id");
+CREATE INDEX "auth_user_groups_group_id_97559544" ON "auth_user_groups" ("group_id");
+CREATE UNIQUE INDEX "auth_user_user_permissions_user_id_permission_id_14a6b632_uniq" ON "auth_user_user_permissions" ("user_id", "permission_id");
+CREATE INDEX "auth_user_user_permissions_user_id_a95ead1b" ON "auth_user_user_permissions" ("user_id");
+CREATE INDEX "auth_user_user_permissions_permission_id_1fbb5f2c" ON "auth_user_user_permissions" ("permission_id");
+CREATE INDEX "django_admin_log_content_type_id_c4bce8eb" ON "django_admin_log" ("content_type_id");
+CREATE INDEX "django_admin_log_user_id_c564eba6" ON "django_admin_log" ("user_id");
+CREATE UNIQUE INDEX "django_content_type_app_label_model_76bd3d3b_uniq" ON "django_content_type" ("app_label", "model");
+CREATE UNIQUE INDEX "auth_permission_content_type_id_codename_01ab375a_uniq" ON "auth_permission" ("content_type_id", "codename");
+CREATE INDEX "auth_permission_content_type_id_2f476e4b" ON "auth_permission" ("content_type_id");
+CREATE INDEX "posts_comment_author_id_795e4d12" ON "posts_comment" ("author_id");
+CREATE INDEX "posts_comment_post_id_e81436d7" ON "posts_comment" ("post_id");
+CREATE UNIQUE INDEX "posts_follow_user_id_author_id_0fccb1bc_uniq" ON "posts_follow" ("user_id", "author_id");
+CREATE INDEX "posts_follow_author_id_07282e68" ON "posts_follow" ("author_id");
+CREATE INDEX "posts_follow_user_id_0b8e2703" ON "posts_follow" ("user_id");
+CREATE INDEX "posts_postscore_score_f162ad52" ON "posts_postscore" ("score");
+CREATE INDEX "posts_post_author_id_fe5487bf" ON "posts_post" ("author_id");
+CREATE INDEX "posts_post_group_id_c91a8485" ON "posts_post" ("group_id");
+CREATE INDEX "posts_comment_post_created" ON "posts_comment" ("post_id", "created");
+CREATE INDEX "posts_follow_author_id" ON "posts_follow" ("author_id", "id");
+CREATE INDEX "posts_follow_user_id" ON "posts_follow" ("user_id", "id");
+CREATE INDEX "posts_notification_created_ccab64cc" ON "posts_notification" ("created");
+CREATE INDEX "posts_notification_actor_id_78729ad3" ON "posts_notification" ("actor_id");
+CREATE INDEX "posts_notification_recipient_id_42b4d0a0" ON "posts_notification" ("recipient_id");
+CREATE INDEX "posts_notification_post_id_2b48c5d7" ON "posts_notification" ("post_id");
+CREATE INDEX "posts_notification_inbox" ON "posts_notification" ("recipient_id", "id");
+CREATE INDEX "posts_bulkjob_status_ad0f5623" ON "posts_bulkjob" ("status");
+CREATE INDEX "posts_bulkjob_content_type_id_51ebb206" ON "posts_bulkjob" ("content_type_id");
+CREATE INDEX "posts_bulkjob_created_by_id_96a11b18" ON "posts_bulkjob" ("created_by_id");
+CREATE INDEX "posts_bulkjob_group_id_83b26fd8" ON "posts_bulkjob" ("group_id");
+CREATE INDEX "django_session_expire_date_a5c62663" ON "django_session" ("expire_date");
+INSERT INTO "auth_permission" VALUES(1,1,'add_group','Can add Сообщество');
+INSERT INTO "auth_permission" VALUES(2,1,'change_group','Can change Сообщество');
+INSERT INTO "auth_permission" VALUES(3,1,'delete_group','Can delete Сообщество');
+INSERT INTO "auth_permission" VALUES(4,1,'view_group','Can view Сообщество');
+INSERT INTO "auth_permission" VALUES(5,2,'add_post','Can add Запись');
+INSERT INTO "auth_permission" VALUES(6,2,'change_post','Can change Запись');
+INSERT INTO "auth_permission" VALUES(7,2,'delete_post','Can delete Запись');
+INSERT INTO "auth_permission" VALUES(8,2,'view_post','Can view Запись');
+INSERT INTO "auth_permission" VALUES(9,3,'add_comment','Can add Комментарий');
+INSERT INTO "auth_permission" VALUES(10,3,'change_comment','Can change Комментарий');
+INSERT INTO "auth_permission" VALUES(11,3,'delete_comment','Can delete Комментарий');
+INSERT INTO "auth_permission" VALUES(12,3,'view_comment','Can view Комментарий');
+INSERT INTO "auth_permission" VALUES(13,4,'add_follow','Can add Подписка');
+INSERT INTO "auth_permission" VALUES(14,4,'change_follow','Can change Подписка');
+INSERT INTO "auth_permission" VALUES(15,4,'delete_follow','Can delete Подписка');
+INSERT INTO "auth_permission" VALUES(16,4,'view_follow','Can view Подписка');
+INSERT INTO "auth_permission" VALUES(17,5,'add_postscore','Can add Рейтинг поста');
+INSERT INTO "auth_permission" VALUES(18,5,'change_postscore','Can change Рейтинг поста');
+INSERT INTO "auth_permission" VALUES(19,5,'delete_postscore','Can delete Рейтинг поста');
+INSERT INTO "auth_permission" VALUES(20,5,'view_postscore','Can view Рейтинг поста');
+INSERT INTO "auth_permission" VALUES(21,6,'add_bulkjob','Can add Массовая операция');
+INSERT INTO "auth_permission" VALUES(22,6,'change_bulkjob','Can change Массовая операция');
+INSERT INTO "auth_permission" VALUES(23,6,'delete_bulkjob','Can delete Массовая операция');
+INSERT INTO "auth_permission" VALUES(24,6,'view_bulkjob','Can view Массовая операция');
+INSERT INTO "auth_permission" VALUES(25,7,'add_notification','Can add Уведомление');
+INSERT INTO "auth_permission" VALUES(26,7,'change_notification','Can change Уведомление');
+INSERT INTO "auth_permission" VALUES(27,7,'delete_notification','Can delete Уведомление');
+INSERT INTO "auth_permission" VALUES(28,7,'view_notification','Can view Уведомление');
+INSERT INTO "auth_permission" VALUES(29,8,'add_shardsequence','Can add Счётчик id постов');
+INSERT INTO "auth_permission" VALUES(30,8,'change_shardsequence','Can change Счётчик id постов');
+INSERT INTO "auth_permission" VALUES(31,8,'delete_shardsequence','Can delete Счётчик id постов');
+INSERT INTO "auth_permission" VALUES(32,8,'view_shardsequence','Can view Счётчик id постов');
+INSERT INTO "auth_permission" VALUES(33,9,'add_logentry','Can add log entry');
+INSERT INTO "auth_permission" VALUES(34,9,'change_logentry','Can change log entry');
+INSERT INTO "auth_permission" VALUES(35,9,'delete_logentry','Can delete log entry');
+INSERT INTO "auth_permission" VALUES(36,9,'view_logentry','Can view log entry');
+INSERT INTO "auth_permission" VALUES(37,10,'add_permission','Can add permission');
+INSERT INTO "auth_permission" VALUES(38,10,'change_permission','Can change permission');
+INSERT INTO "auth_permission" VALUES(39,10,'delete_permission','Can delete permission');
+INSERT INTO "auth_permission" VALUES(40,10,'view_permission','Can view permission');
+INSERT INTO "auth_permission" VALUES(41,11,'add_group','Can add group');
+INSERT INTO "auth_permission" VALUES(42,11,'change_group','Can change group');
+INSERT INTO "auth_permission" VALUES(43,11,'delete_group','Can delete group');
+INSERT INTO "auth_permission" VALUES(44,11,'view_group','Can view group');
+INSERT INTO "auth_permission" VALUES(45,12,'add_user','Can add user');
+INSERT INTO "auth_permission" VALUES(46,12,'change_user','Can change user');
+INSERT INTO "auth_permission" VALUES(47,12,'delete_user','Can delete user');
+INSERT INTO "auth_permission" VALUES(48,12,'view_user','Can view user');
+INSERT INTO "auth_permission" VALUES(49,13,'add_contenttype','Can add content type');
+INSERT INTO "auth_permission" VALUES(50,13,'change_contenttype','Can change content type');
+INSERT INTO "auth_permission" VALUES(51,13,'delete_contenttype','Can delete content type');
+INSERT INTO "auth_permission" VALUES(52,13,'view_contenttype','Can view content type');
+INSERT INTO "auth_permission" VALUES(53,14,'add_session','Can add session');
+INSERT INTO "auth_permission" VALUES(54,14,'change_session','Can change session');
+INSERT INTO "auth_permission" VALUES(55,14,'delete_session','Can delete session');
+INSERT INTO "auth_permission" VALUES(56,14,'view_session','Can view session');
+INSERT INTO "auth_permission" VALUES(57,15,'add_kvstore','Can add kv store');
+INSERT INTO "auth_permission" VALUES(58,15,'change_kvstore','Can change kv store');
+INSERT INTO "auth_permission" VALUES(59,15,'delete_kvstore','Can delete kv store');
+INSERT INTO "auth_permission" VALUES(60,15,'view_kvstore','Can view kv store');
+INSERT INTO "django_content_type" VALUES(1,'posts','group');
+INSERT INTO "django_content_type" VALUES(2,'posts','post');
+INSERT INTO "django_content_type" VALUES(3,'posts','comment');
+INSERT INTO "django_content_type" VALUES(4,'posts','follow');
+INSERT INTO "django_content_type" VALUES(5,'posts','postscore');
+INSERT INTO "django_content_type" VALUES(6,'posts','bulkjob');
+INSERT INTO "django_content_type" VALUES(7,'posts','notification');
+INSERT INTO "django_content_type" VALUES(8,'posts','shardsequence');
+INSERT INTO "django_content_type" VALUES(9,'admin','logentry');
+INSERT INTO "django_content_type" VALUES(10,'auth','permission');
+INSERT INTO "django_content_type" VALUES(11,'auth','group');
+INSERT INTO "django_content_type" VALUES(12,'auth','user');
+INSERT INTO "django_content_type" VALUES(13,'contenttypes','contenttype');
+INSERT INTO "django_content_type" VALUES(14,'sessions','session');
+INSERT INTO "django_content_type" VALUES(15,'thumbnail','kvstore');
+INSERT INTO "django_migrations" VALUES(1,'contenttypes','0001_initial','2026-10-19 09:06:02.394476');
+INSERT INTO "django_migrations" VALUES(2,'auth','0001_initial','2026-10-19 09:06:02.411063');
+INSERT INTO "django_migrations" VALUES(3,'admin','0001_initial','2026-10-19 09:06:02.421596');
+INSERT INTO "django_migrations" VALUES(4,'admin','0002_logentry_remove_auto_add','2026-10-19 09:06:02.433771');
+INSERT INTO "django_migrations" VALUES(5,'admin','0003_logentry_add_action_flag_choices','2026-10-19 09:06:02.445800');
+INSERT INTO "django_migrations" VALUES(6,'contenttypes','0002_remove_content_type_name','2026-10-19 09:06:02.469254');
+INSERT INTO "django_migrations" VALUES(7,'auth','0002_alter_permission_name_max_length','2026-10-19 09:06:02.476997');
+INSERT INTO "django_migrations" VALUES(8,'auth','0003_alter_user_email_max_length','2026-10-19 09:06:02.487883');
+INSERT INTO "django_migrations" VALUES(9,'auth','0004_alter_user_username_opts','2026-10-19 09:06:02.498933');
+INSERT INTO "django_migrations" VALUES(10,'auth','0005_alter_user_last_login_null','2026-10-19 09:06:02.510737');
+INSERT INTO "django_migrations" VALUES(11,'auth','0006_require_contenttypes_0002','2026-10-19 09:06:02.512412');
+INSERT INTO "django_migrations" VALUES(12,'auth','0007_alter_validators_add_error_messages','2026-10-19 09:06:02.523031');
+INSERT INTO "django_migrations" VALUES(13,'auth','0008_alter_user_username_max_length','2026-10-19 09:06:02.533706');
+INSERT INTO "django_migrations" VALUES(14,'auth','0009_alter_user_last_name_max_length','2026-10-19 09:06:02.544027');
+INSERT INTO "django_migrations" VALUES(15,'auth','0010_alter_group_name_max_length','2026-10-19 09:06:02.549890');
+INSERT INTO "django_migrations" VALUES(16,'auth','0011_update_proxy_permissions','2026-10-19 09:06:02.554959');
+INSERT INTO "django_migrations" VALUES(17,'posts','0001_initial','2026-10-19 09:06:02.579434');
+INSERT INTO "django_migrations" VALUES(18,'posts','0002_auto_20220914_1455','2026-10-19 09:06:02.579794');
+INSERT INTO "django_migrations" VALUES(19,'posts','0003_auto_20220916_0028','2026-10-19 09:06:02.579988');
+INSERT INTO "django_migrations" VALUES(20,'posts','0004_auto_20221008_2331','2026-10-19 09:06:02.580161');
+INSERT INTO "django_migrations" VALUES(21,'posts','0005_auto_20221009_0033','2026-10-19 09:06:02.580330');
+INSERT INTO "django_migrations" VALUES(22,'posts','0006_auto_20221009_0035','2026-10-19 09:06:02.580488');
+INSERT INTO "django_migrations" VALUES(23,'posts','0007_auto_20221009_0038','2026-10-19 09:06:02.580651');
+INSERT INTO "django_migrations" VALUES(24,'posts','0008_auto_20221009_0040','2026-10-19 09:06:02.580806');
+INSERT INTO "django_migrations" VALUES(25,'posts','0009_auto_20221009_0042','2026-10-19 09:06:02.580986');
+INSERT INTO "django_migrations" VALUES(26,'posts','0010_auto_20221009_0046','2026-10-19 09:06:02.581196');
+INSERT INTO "django_migrations" VALUES(27,'posts','0011_auto_20221009_0148','2026-10-19 09:06:02.581365');
+INSERT INTO "django_migrations" VALUES(28,'posts','0012_auto_20221009_1848','2026-10-19 09:06:02.581517');
+INSERT INTO "django_migrations" VALUES(29,'posts','0013_auto_20221010_2022','2026-10-19 09:06:02.581664');
+INSERT INTO "django_migrations" VALUES(30,'posts','0014_auto_20221010_2228','2026-10-19 09:06:02.581813');
+INSERT INTO "django_migrations" VALUES(31,'posts','0015_auto_20221011_1112','2026-10-19 09:06:02.581962');
+INSERT INTO "django_migrations" VALUES(32,'posts','0016_post_image','2026-10-19 09:06:02.582131');
+INSERT INTO "django_migrations" VALUES(33,'posts','0017_comment','2026-10-19 09:06:02.582282');
+INSERT INTO "django_migrations" VALUES(34,'posts','0018_follow','2026-10-19 09:06:02.582428');
+INSERT INTO "django_migrations" VALUES(35,'posts','0019_postscore','2026-10-19 09:06:02.582581');
+INSERT INTO "django_migrations" VALUES(36,'posts','0020_bulkjob','2026-10-19 09:06:02.600533');
+INSERT INTO "django_migrations" VALUES(37,'posts','0021_post_updated_at','2026-10-19 09:06:02.618591');
+INSERT INTO "django_migrations" VALUES(38,'posts','0022_follow_keyset_indexes','2026-10-19 09:06:02.631748');
+INSERT INTO "django_migrations" VALUES(39,'posts','0023_notification','2026-10-19 09:06:02.649823');
+INSERT INTO "django_migrations" VALUES(40,'posts','0024_shard_sequence','2026-10-19 09:06:02.666866');
+INSERT INTO "django_migrations" VALUES(41,'posts','0025_bulkjob_database','2026-10-19 09:06:02.680214');
+INSERT INTO "django_migrations" VALUES(42,'sessions','0001_initial','2026-10-19 09:06:02.683032');
+INSERT INTO "django_migrations" VALUES(43,'thumbnail','0001_initial','2026-10-19 09:06:02.685580');
+INSERT INTO "django_migrations" VALUES(44,'posts','0001_squashed_0019_postscore','2026-10-19 09:06:02.687118');
+COMMIT;
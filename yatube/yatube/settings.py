@@ -1,3 +1,4 @@
+import datetime
 import os
 
 LOGIN_URL = 'users:login'
@@ -15,8 +16,116 @@ DEBUG = True
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+    },
+    # Общий для всех процессов: рекомендации пишет отдельная команда.
+    'recommendations': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'recommendations_cache'),
+    },
+}
+
+# Бюджет запросов к базе на запрос к view (core.querybudget): декоратор
+# query_budget у view или QUERY_BUDGETS по имени маршрута. 'log' пишет
+# превышение в лог, 'raise' бросает исключение (так в тестах).
+QUERY_BUDGET_MODE = 'log' if DEBUG else None
+QUERY_BUDGETS = {
+    'users:login': 8,
+    'users:signup': 6,
+}
+# Не считаются (префиксы модуль.функция): хранилище миниатюр
+# sorl-thumbnail читает базу только при промахе своего кэша, когда
+# миниатюра создаётся впервые; EXPLAIN журнала медленных запросов.
+QUERY_BUDGET_IGNORE = ('sorl.thumbnail', 'core.slowqueries.explain')
+
+# Журнал медленных запросов (core.slowqueries): время всех запросов
+# копится по отпечаткам в SLOW_QUERY_STATS_PATH, запросы дольше
+# SLOW_QUERY_THRESHOLD мс попадают с планом в SLOW_QUERY_LOG.
+# Сводка — manage.py slowqueries. Замер и запись статистики идут в потоке
+# запроса, поэтому без DEBUG журнал выключен; включённый в продакшене,
+# он замеряет только долю SLOW_QUERY_SAMPLE_RATE запросов к сайту.
+SLOW_QUERIES = DEBUG
+SLOW_QUERY_SAMPLE_RATE = 1 if DEBUG else 0.01
+SLOW_QUERY_THRESHOLD = 100
+SLOW_QUERY_FLUSH_INTERVAL = 10
+SLOW_QUERY_STATS_PATH = os.path.join(BASE_DIR, 'slow_queries.sqlite3')
+SLOW_QUERY_LOG = os.path.join(BASE_DIR, 'slow_queries.log')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'core.slowqueries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
+# Профилирование отдельных запросов (core.profiling): по подписанному
+# заголовку X-Profile (значение — на странице /admin/profiles/) или для
+# доли PROFILING_SAMPLE_RATE случайных запросов. 'cprofile' — точный
+# профиль для разработки, 'sample' — выборка стеков раз в
+# PROFILING_INTERVAL секунд. На каждый view хранится PROFILING_KEEP
+# последних профилей.
+PROFILING_MODE = 'cprofile' if DEBUG else 'sample'
+PROFILING_SAMPLE_RATE = 0
+PROFILING_INTERVAL = 0.005
+PROFILING_ROOT = os.path.join(BASE_DIR, 'profiles')
+PROFILING_KEEP = 20
+PROFILING_TOKEN_MAX_AGE = 24 * 60 * 60
+
+# Прогрев кэша (core.warmup): manage.py warm_cache и, если включён
+# WARMUP_ON_BOOT, фоновый прогрев при запуске воркера (yatube/wsgi.py).
+# Горячие ленты — самые посещаемые адреса WARMUP_VIEWS за последние
+# WARMUP_WINDOW часов; у каждой рендерятся первые WARMUP_PAGES страниц
+# вместе с миниатюрами, не дольше WARMUP_TIME_BUDGET секунд.
+WARMUP_ON_BOOT = False
+WARMUP_VIEWS = ('posts:index', 'posts:group_posts', 'posts:profile')
+WARMUP_FEEDS = 20
+WARMUP_PAGES = 3
+WARMUP_CONCURRENCY = 4
+WARMUP_TIME_BUDGET = 30
+WARMUP_WINDOW = 24
+WARMUP_FLUSH_INTERVAL = 10
+WARMUP_STATS_PATH = os.path.join(BASE_DIR, 'access_stats.sqlite3')
+# Хост, под которым сайт открывают посетители: от него зависят ключи
+# кэша страниц.
+WARMUP_HOST = 'localhost'
+
+# Лимиты записи по имени маршрута: 'число/период' (s, m, h, d).
+# Считаются отдельно для IP клиента и для вошедшего пользователя.
+RATELIMITS = {
+    'posts:add_comment': '20/m',
+    'posts:post_create': '10/m',
 }
+RATELIMIT_CACHE = 'default'
+RATELIMIT_IP_META_KEY = 'REMOTE_ADDR'
+
+# Сессии читаются из кэша и только при промахе из базы.
+# Без серверного хранилища: 'django.contrib.sessions.backends.signed_cookies'.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+
+# Кэш пользователя сессии, сбрасывается при сохранении User.
+AUTH_USER_CACHE = 'default'
+AUTH_USER_CACHE_TIMEOUT = 5 * 60
+
+# Сжатые тела закэшированных страниц хранятся рядом с ними.
+COMPRESSION_CACHE = 'default'
+
+# Потоковая отдача лент: <head> уходит клиенту до запроса постов.
+FEED_STREAMING = False
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
@@ -32,7 +141,7 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'posts.apps.PostsConfig',
     'about.apps.AboutConfig',
-    'django.contrib.admin',
+    'core.apps.LazyAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -44,11 +153,17 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.querybudget.QueryBudgetMiddleware',
+    'core.slowqueries.SlowQueryMiddleware',
+    'core.profiling.ProfilingMiddleware',
+    'core.warmup.AccessStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.ratelimit.RateLimitMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.auth.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -67,6 +182,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.notifications.unread_notifications',
             ],
         },
     },
@@ -81,6 +197,17 @@ DATABASES = {
     }
 }
 
+# Шардирование постов и комментариев по автору (posts.sharding):
+# псевдонимы баз из DATABASES. Пусто — всё лежит в default.
+# Число шардов зашито в id постов (id % N — номер шарда), поэтому
+# его смена требует переноса данных.
+POST_SHARDS = []
+
+DATABASE_ROUTERS = ['posts.sharding.ShardRouter']
+
+# SQL-снимок схемы для manage.py bootstrap_schema.
+SCHEMA_SNAPSHOT = os.path.join(BASE_DIR, 'schema.sql')
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.'
@@ -112,14 +239,88 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+# collectstatic собирает статику с хэшами в именах и сжатыми .gz/.br
+# копиями. STATIC_SERVE включает отдачу из STATIC_ROOT самим приложением.
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+STATICFILES_STORAGE = 'core.staticfiles.CompressedManifestStaticFilesStorage'
+STATIC_SERVE = False
+STATIC_CACHE_MAX_AGE = 60 * 60
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 POSTS_PER_PAGE = 10
 
+# Кэш числа записей в лентах. Ленту подписок не сбрасывают новые посты
+# авторов, поэтому её счётчик живёт недолго.
+FEED_COUNT_TIMEOUT = 24 * 60 * 60
+FOLLOW_FEED_COUNT_TIMEOUT = 60
+# Фрагменты страниц лент с версией ленты в ключе: новая версия
+# появляется при любом изменении постов ленты, а таймаут ограничивает
+# устаревание имён авторов.
+FEED_PAGE_CACHE_TIMEOUT = 60 * 60
+# Списки подписчиков и подписок листаются по ключу (id подписки).
+FOLLOW_LIST_PER_PAGE = 50
+
+# Лента популярного: вес события удваивается каждые TRENDING_HALF_LIFE
+# секунд, то есть событие суточной давности весит вдвое меньше нового.
+TRENDING_EPOCH = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)
+TRENDING_HALF_LIFE = 24 * 60 * 60
+TRENDING_COMMENT_WEIGHT = 1
+TRENDING_FOLLOW_WEIGHT = 3
+TRENDING_CACHE_TIMEOUT = 60
+
+# Рекомендации «кого почитать» считает manage.py compute_recommendations:
+# оценка кандидата — сумма весов путей через подписки (друзья друзей)
+# и общих сообществ. В кэше хранятся RECOMMENDATIONS_COUNT лучших.
+# Кэш RECOMMENDATIONS_CACHE читают веб-воркеры, поэтому он не должен
+# быть LocMem: команда записала бы результат только в свой процесс.
+RECOMMENDATIONS_CACHE = 'recommendations'
+RECOMMENDATIONS_COUNT = 10
+RECOMMENDATIONS_FOF_WEIGHT = 1
+RECOMMENDATIONS_GROUP_WEIGHT = 0.5
+RECOMMENDATIONS_TIMEOUT = 2 * 24 * 60 * 60
+RECOMMENDATIONS_BATCH_SIZE = 1000
+
+# Массовые операции админки выполняет manage.py run_bulk_jobs пачками
+# по BULK_JOB_CHUNK_SIZE объектов, каждая пачка в своей транзакции.
+# BULK_JOBS_THREAD запускает задачу в потоке веб-процесса (без воркера).
+BULK_JOB_CHUNK_SIZE = 500
+BULK_JOBS_THREAD = False
+BULK_JOBS_POLL_INTERVAL = 2
+BULK_EXPORT_ROOT = os.path.join(BASE_DIR, 'exports')
+
+# Отложенная запись комментариев (posts.comment_buffer): комментарии
+# копятся в локальной очереди и вставляются пачками раз в
+# COMMENT_BUFFER_FLUSH_INTERVAL секунд. None — без фонового потока,
+# очередь разбирает manage.py flush_comments.
+COMMENT_BUFFER = False
+COMMENT_BUFFER_PATH = os.path.join(BASE_DIR, 'comment_queue.sqlite3')
+COMMENT_BUFFER_FLUSH_INTERVAL = 0.2
+COMMENT_BUFFER_BATCH_SIZE = 500
+COMMENT_BUFFER_OVERLAY_TIMEOUT = 10 * 60
+
+# Уведомления: события копятся в локальной очереди, фоновый поток
+# записывает их пачками и склеивает с непрочитанными. Уведомления
+# старше NOTIFICATIONS_TTL секунд удаляет manage.py flush_notifications.
+NOTIFICATIONS_QUEUE_PATH = os.path.join(BASE_DIR, 'notification_queue.sqlite3')
+NOTIFICATIONS_FLUSH_INTERVAL = 1
+NOTIFICATIONS_BATCH_SIZE = 1000
+NOTIFICATIONS_COUNT_TIMEOUT = 24 * 60 * 60
+NOTIFICATIONS_PER_PAGE = 20
+NOTIFICATIONS_TTL = 30 * 24 * 60 * 60
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/2.2/howto/static-files/
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Отдача медиа: None — файл отдаёт Django (FileResponse),
+# 'x-sendfile' (Apache, lighttpd) или 'x-accel-redirect' (nginx).
+MEDIA_SENDFILE = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60
+
+THUMBNAIL_PREFIX = 'cache/'
@@ -0,0 +1,74 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+
+
+class DisableMigrations:
+    """Схема тестовой базы строится сразу по моделям, без миграций."""
+
+    def __contains__(self, item):
+        return True
+
+    def __getitem__(self, item):
+        return None
+
+
+# pytest-xdist запускает воркеры отдельными процессами: gw0, gw1, ...
+WORKER = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+    # Шарды постов для тестов posts.sharding (POST_SHARDS там включается
+    # через override_settings).
+    **{
+        f'shard_{number}': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+        for number in range(3)
+    },
+}
+
+MIGRATION_MODULES = DisableMigrations()
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': f'yatube-tests-{WORKER}',
+    },
+    'recommendations': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': f'yatube-recommendations-{WORKER}',
+    },
+}
+
+MEDIA_ROOT = tempfile.mkdtemp(prefix=f'yatube-media-{WORKER}-')
+atexit.register(shutil.rmtree, MEDIA_ROOT, ignore_errors=True)
+BULK_EXPORT_ROOT = os.path.join(MEDIA_ROOT, 'exports')
+# Очередь уведомлений тесты разбирают сами, без фонового потока.
+NOTIFICATIONS_QUEUE_PATH = os.path.join(MEDIA_ROOT, 'notifications.sqlite3')
+NOTIFICATIONS_FLUSH_INTERVAL = None
+
+PROFILING_ROOT = os.path.join(MEDIA_ROOT, 'profiles')
+WARMUP_STATS_PATH = os.path.join(MEDIA_ROOT, 'access_stats.sqlite3')
+
+SLOW_QUERIES = False
+SLOW_QUERY_STATS_PATH = os.path.join(MEDIA_ROOT, 'slow_queries.sqlite3')
+LOGGING['handlers']['slow_queries']['filename'] = os.path.join(  # noqa: F405
+    MEDIA_ROOT, 'slow_queries.log'
+)
+
+# Превышение бюджета запросов view в тестах — ошибка.
+QUERY_BUDGET_MODE = 'raise'
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+TEST_RUNNER = 'core.testing.TestRunner'
@@ -1,7 +1,12 @@
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from core import media, staticfiles, views
+
+# Админка подключена через core.apps.LazyAdminConfig: регистрации
+# моделей загружаются здесь, а не при запуске каждого процесса.
+admin.autodiscover()
 
 handler403 = 'core.views.csrf_failure'
 handler404 = 'core.views.page_not_found'
@@ -10,12 +15,27 @@ handler500 = 'core.views.internal_server_error'
 urlpatterns = [
     path('', include('posts.urls', namespace='posts')),
     path('about/', include('about.urls', namespace='about')),
+    path('admin/profiles/', views.profiles, name='admin_profiles'),
+    path(
+        'admin/profiles/<str:view>/<str:name>',
+        views.profile_file,
+        name='admin_profile_file',
+    ),
     path('admin/', admin.site.urls),
     path('auth/', include('users.urls')),
     path('auth/', include('django.contrib.auth.urls')),
+    re_path(
+        r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'),
+        media.serve,
+        name='media',
+    ),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-    )
+if settings.STATIC_SERVE:
+    urlpatterns += [
+        re_path(
+            r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'),
+            staticfiles.serve,
+            name='static',
+        ),
+    ]